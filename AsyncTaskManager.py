@@ -0,0 +1,205 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+from Task import Task
+from Storage import Change, TaskStorage
+from TaskManager import TaskManager
+from Batch import TaskBatch
+
+
+class AsyncTaskManager:
+    """
+    Асинхронная обертка над резидентным TaskManager для работы внутри цикла событий.
+    Чтения выполняются сразу по задачам в памяти и не ждут записи на диск.
+    Изменения ставятся в очередь и применяются единственной задачей-писателем:
+    все изменения, накопившиеся в очереди, записываются на диск одной операцией
+    в отдельном потоке (групповая фиксация), после чего вызывающие получают результат.
+    Чтения видят изменение сразу после его применения в памяти, не дожидаясь записи.
+    Предполагается, что файлом задач владеет один процесс: пока идет запись,
+    изменения файла извне не отслеживаются.
+    """
+
+    def __init__(self, file_path: str, storage: Optional[TaskStorage] = None, commit_delay: float = 0.0) -> None:
+        """
+        :param file_path: путь к файлу задач.
+        :param storage: хранилище задач; по умолчанию JSON-файл file_path.
+        :param commit_delay: сколько секунд писатель ждет перед фиксацией, чтобы собрать больше изменений.
+        """
+        self.manager = TaskManager(file_path, storage=storage, resident=True, flush_interval=None)
+        self.commit_delay = commit_delay
+        self.commits = 0
+        self._store = self.manager._store
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Загружает задачи в отдельном потоке и запускает задачу-писателя.
+        Вызывается автоматически при первом изменении и в async with.
+        """
+        if self._writer is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._run_writer())
+            await asyncio.to_thread(self._store.tasks)
+
+    async def close(self) -> None:
+        """
+        Дожидается записи всех изменений из очереди, останавливает писателя и закрывает хранилище.
+        """
+        if self._writer is not None:
+            self._queue.put_nowait(None)
+            await self._writer
+            self._writer = None
+        await asyncio.to_thread(self.manager.close)
+
+    async def __aenter__(self) -> "AsyncTaskManager":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def flush(self) -> None:
+        """
+        Дожидается записи всех изменений, поставленных в очередь до вызова.
+        """
+        await self._submit(lambda manager: None)
+
+    # Чтение: по задачам в памяти, без ожидания писателя
+
+    async def load_tasks(self) -> List[Task]:
+        return self.manager.load_tasks()
+
+    async def find_task_by_id(self, task_id: int) -> Optional[Task]:
+        return self.manager.find_task_by_id(task_id)
+
+    async def search_tasks(self, keyword: Optional[str] = None,
+                           category: Optional[str] = None, status: Optional[str] = None) -> List[Task]:
+        return self.manager.search_tasks(keyword=keyword, category=category, status=status)
+
+    async def search_ranked(self, query: str, prefix: bool = False, limit: Optional[int] = None) -> List[Task]:
+        return self.manager.search_ranked(query, prefix=prefix, limit=limit)
+
+    async def view_tasks(self, category: Optional[str] = None) -> List[Task]:
+        return self.manager.view_tasks(category)
+
+    async def iter_tasks(self) -> AsyncIterator[Task]:
+        for task in self.manager.load_tasks():
+            yield task
+
+    async def iter_search(self, keyword: Optional[str] = None,
+                          category: Optional[str] = None, status: Optional[str] = None) -> AsyncIterator[Task]:
+        for task in self.manager.search_tasks(keyword=keyword, category=category, status=status):
+            yield task
+
+    # Изменения: через очередь писателя
+
+    async def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> None:
+        await self._submit(lambda manager: manager.add_task(title, description, category, due_date, priority))
+
+    async def delete_task(self, task_id: int) -> None:
+        await self._submit(lambda manager: manager.delete_task(task_id))
+
+    async def edit_task(self, task_id: int, **kwargs: Any) -> None:
+        await self._submit(lambda manager: manager.edit_task(task_id, **kwargs))
+
+    async def mark_task_as_completed(self, task_id: int) -> None:
+        await self._submit(lambda manager: manager.mark_task_as_completed(task_id))
+
+    async def save_tasks(self, tasks: List[Task]) -> None:
+        await self._submit(lambda manager: manager.save_tasks(tasks))
+
+    async def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        tasks = list(tasks)
+        return await self._submit(lambda manager: manager.add_tasks(tasks))
+
+    async def edit_tasks(self, updates: Dict[int, Dict[str, Any]]) -> None:
+        await self._submit(lambda manager: manager.edit_tasks(updates))
+
+    async def delete_tasks(self, task_ids: Iterable[int]) -> None:
+        task_ids = list(task_ids)
+        await self._submit(lambda manager: manager.delete_tasks(task_ids))
+
+    async def transaction(self, apply: Callable[[TaskBatch], Any]) -> Any:
+        """
+        Выполняет функцию над TaskBatch как одну транзакцию в задаче-писателе.
+        :param apply: функция, вызываемая с объектом TaskBatch.
+        :return: результат apply.
+        :raises ValueError: при ошибке проверки данных; тогда не применяется ни одно изменение.
+        """
+        def run(manager: TaskManager) -> Any:
+            with manager.transaction() as batch:
+                return apply(batch)
+        return await self._submit(run)
+
+    async def _submit(self, operation: Callable[[TaskManager], Any]) -> Any:
+        """
+        Ставит изменение в очередь писателя.
+        :param operation: функция, применяющая изменение к TaskManager.
+        :return: результат функции после того, как изменение записано на диск.
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def _run_writer(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            group = [item]
+            if self.commit_delay:
+                await asyncio.sleep(self.commit_delay)
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+            await self._commit(group)
+
+    async def _commit(self, group: List[tuple]) -> None:
+        """
+        Применяет группу изменений в памяти и записывает их на диск одной операцией.
+        Ошибка отдельного изменения возвращается только его автору; ошибка записи — всем в группе,
+        и тогда изменения группы отменяются: задачи перечитываются из хранилища.
+        """
+        outcomes = []
+        for operation, future in group:
+            try:
+                outcomes.append((future, operation(self.manager), None))
+            except Exception as error:
+                outcomes.append((future, None, error))
+
+        failure = None
+        if self._store.dirty:
+            try:
+                records, changes = self._store.detach_pending()
+            except Exception as error:
+                failure = error
+            else:
+                try:
+                    await asyncio.to_thread(self._save, records, changes)
+                except Exception as error:
+                    failure = error
+                self._store.finish_write(failure is None)
+            if failure is not None:
+                # Вызывающим сообщено, что изменения не выполнены: они не должны остаться в памяти
+                # и попасть на диск со следующей группой
+                self._store.discard_pending()
+                self.manager._publish([Change("reset", None, None)])
+            self.commits += 1
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            error = error or failure
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _save(self, records: List[dict], changes: Optional[list]) -> None:
+        with self.manager.storage.locked():
+            self.manager.storage.save(records, changes)
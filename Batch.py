@@ -0,0 +1,120 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from Task import Task
+from TaskFields import parse_status, validate_changes
+
+
+class TaskBatch:
+    """
+    Набор изменений, применяемых к задачам одной транзакцией (см. TaskManager.transaction).
+    Изменения копятся поверх неизменяемого исходного состояния и ничего не трогают
+    до фиксации; ошибки проверки выбрасываются как ValueError, что отменяет всю транзакцию.
+    """
+
+    def __init__(self, base: Mapping[int, Any], title_count: Callable[[str], int], next_id: int) -> None:
+        """
+        :param base: исходные задачи по ID (объекты Task или словари задач).
+        :param title_count: число исходных задач с данным заголовком.
+        :param next_id: ID, который получит первая добавленная задача.
+        """
+        self._base = base
+        self._title_count = title_count
+        self._next_id = next_id
+        self._overlay: Dict[int, Optional[Task]] = {}
+        self._title_delta: Counter = Counter()
+        self.changes: List[Tuple[str, int, Optional[Task]]] = []
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Возвращает задачу с учетом изменений транзакции.
+        :param task_id: ID задачи.
+        :return: задача или None.
+        """
+        if task_id in self._overlay:
+            return self._overlay[task_id]
+        value = self._base.get(task_id)
+        if value is None or isinstance(value, Task):
+            return value
+        return Task(**value)
+
+    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str,
+                 status: str = "Не выполнена") -> int:
+        """
+        Добавляет новую задачу.
+        :param status: начальный статус задачи.
+        :return: ID новой задачи.
+        :raises ValueError: если не все поля заполнены, заголовок занят, дата или статус неверны.
+        """
+        if not all([title, description, category, due_date, priority]):
+            raise ValueError("Ошибка: все поля задачи должны быть заполнены.")
+        if self._title_taken(title):
+            raise ValueError("Ошибка: задача с таким заголовком уже существует.")
+        parse_status(status)
+
+        task = Task(id=self._next_id, title=title, description=description, category=category, due_date=due_date,
+                    priority=priority, status=status)
+        self._next_id += 1
+        self._set(task.id, None, task, "add")
+        return task.id
+
+    def insert(self, task: Task) -> None:
+        """
+        Добавляет готовую задачу с уже назначенным ID (например, перенесенную из другого хранилища).
+        :raises ValueError: если задача с таким ID или заголовком уже существует.
+        """
+        if self.get(task.id) is not None:
+            raise ValueError(f"Задача с ID {task.id} уже существует.")
+        if self._title_taken(task.title):
+            raise ValueError("Ошибка: задача с таким заголовком уже существует.")
+        self._next_id = max(self._next_id, task.id + 1)
+        self._set(task.id, None, task, "add")
+
+    def edit_task(self, task_id: int, **kwargs: Any) -> None:
+        """
+        Редактирует задачу.
+        :raises ValueError: если задача не найдена или новые значения неверны.
+        """
+        validate_changes(kwargs)
+        old = self._require(task_id)
+        new = Task(**old.to_dict())
+        for key, value in kwargs.items():
+            if hasattr(new, key):
+                setattr(new, key, value)
+        self._set(task_id, old, new, "edit")
+
+    def delete_task(self, task_id: int) -> None:
+        """
+        Удаляет задачу.
+        :raises ValueError: если задача не найдена.
+        """
+        self._set(task_id, self._require(task_id), None, "delete")
+
+    def mark_task_as_completed(self, task_id: int) -> None:
+        """
+        Отмечает задачу как выполненную.
+        :raises ValueError: если задача не найдена.
+        """
+        self.edit_task(task_id, status='Выполнена')
+
+    def overlay(self) -> Dict[int, Optional[Task]]:
+        """
+        :return: итоговые версии измененных задач по ID (None — задача удалена).
+        """
+        return self._overlay
+
+    def _require(self, task_id: int) -> Task:
+        task = self.get(task_id)
+        if task is None:
+            raise ValueError(f"Задача с ID {task_id} не найдена.")
+        return task
+
+    def _title_taken(self, title: str) -> bool:
+        return self._title_count(title) + self._title_delta[title] > 0
+
+    def _set(self, task_id: int, old: Optional[Task], new: Optional[Task], op: str) -> None:
+        if old is not None:
+            self._title_delta[old.title] -= 1
+        if new is not None:
+            self._title_delta[new.title] += 1
+        self._overlay[task_id] = new
+        self.changes.append((op, task_id, new))
@@ -0,0 +1,254 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from TaskManager import TaskManager
+from Storage import JournalStorage
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+OPERATIONS = ("add_task", "find_task_by_id", "search_tasks", "view_tasks", "edit_task", "delete_task")
+MODES = ("json", "resident", "journal")
+
+CATEGORIES = {"Работа": 40, "Дом": 25, "Учеба": 15, "Здоровье": 10, "Покупки": 10}
+STATUSES = {"Не выполнена": 70, "Выполнена": 30}
+PRIORITIES = {"низкий": 30, "средний": 50, "высокий": 20}
+WORDS = (
+    "подготовить отчет квартальный встреча клиент договор проверить оплатить счет купить молоко хлеб "
+    "позвонить маме записаться врач анализы прочитать книгу глава написать письмо руководитель проект "
+    "обновить презентацию сдать курсовую экзамен убрать квартиру вынести мусор починить кран заказать "
+    "билеты отпуск гостиница согласовать бюджет план задачи ёлка подарки праздник тренировка бассейн"
+).split()
+
+
+def generate_tasks(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Генерирует синтетические задачи с русским текстом и реалистичным распределением
+    категорий, статусов и приоритетов.
+    :param count: число задач.
+    :param seed: зерно генератора случайных чисел.
+    :return: список словарей задач в формате tasks.json.
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    categories = rng.choices(list(CATEGORIES), weights=list(CATEGORIES.values()), k=count)
+    statuses = rng.choices(list(STATUSES), weights=list(STATUSES.values()), k=count)
+    priorities = rng.choices(list(PRIORITIES), weights=list(PRIORITIES.values()), k=count)
+    return [
+        {
+            "id": index + 1,
+            "title": f"{' '.join(rng.choices(WORDS, k=3)).capitalize()} №{index + 1}",
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(5, 30))).capitalize() + ".",
+            "category": categories[index],
+            "due_date": (start + timedelta(days=rng.randrange(730))).isoformat(),
+            "priority": priorities[index],
+            "status": statuses[index],
+        }
+        for index in range(count)
+    ]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    :param values: отсортированные значения.
+    :param fraction: доля от 0 до 1.
+    :return: перцентиль с линейной интерполяцией.
+    """
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _bytes_written() -> Optional[int]:
+    """
+    :return: число байт, записанных процессом (Linux, /proc/self/io), или None.
+    """
+    try:
+        with open("/proc/self/io", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _make_manager(file_path: str, mode: str) -> TaskManager:
+    if mode == "resident":
+        return TaskManager(file_path, resident=True)
+    if mode == "journal":
+        return TaskManager(file_path, storage=JournalStorage(file_path, fsync=False))
+    return TaskManager(file_path)
+
+
+def _measure(call: Callable[[int], Any], repeat: int) -> Dict[str, Any]:
+    latencies = []
+    written_before = _bytes_written()
+    started = time.perf_counter()
+    for iteration in range(repeat):
+        begin = time.perf_counter()
+        call(iteration)
+        latencies.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - started
+    written_after = _bytes_written()
+    latencies.sort()
+    return {
+        "count": repeat,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "ops_per_sec": repeat / elapsed if elapsed else 0.0,
+        "bytes_written_per_op": (written_after - written_before) / repeat
+        if written_before is not None and written_after is not None else None,
+    }
+
+
+def benchmark_size(size: int, mode: str = "json", repeat: int = 20, seed: int = 0,
+                   operations: tuple = OPERATIONS) -> Dict[str, Any]:
+    """
+    Измеряет операции TaskManager на файле из size синтетических задач.
+    :param size: число задач в файле.
+    :param mode: режим TaskManager: "json", "resident" или "journal".
+    :param repeat: число повторов каждой операции.
+    :param seed: зерно генератора.
+    :param operations: измеряемые операции.
+    :return: результаты по операциям и пиковая память процесса (за все время его работы,
+             поэтому для сравнения случаев их запускает run_benchmarks, каждый в своем процессе).
+    """
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix="task-bench-")
+    try:
+        file_path = os.path.join(workdir, "tasks.json")
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(generate_tasks(size, seed), file, indent=4, ensure_ascii=False)
+        manager = _make_manager(file_path, mode)
+        manager.view_tasks()  # прогрев: резидентный режим загружает файл здесь
+        categories = list(CATEGORIES)
+        new_tasks = generate_tasks(repeat, seed + 1)
+        # Для удаления берем ID с конца, для правок и поиска — с начала, чтобы операции не пересекались
+        delete_ids = list(range(size, max(size - repeat, 0), -1))
+
+        calls = {
+            "add_task": lambda i: manager.add_task(f"Новая задача {i}", new_tasks[i]["description"],
+                                                   new_tasks[i]["category"], new_tasks[i]["due_date"],
+                                                   new_tasks[i]["priority"]),
+            "find_task_by_id": lambda i: manager.find_task_by_id(rng.randint(1, size)),
+            "search_tasks": lambda i: manager.search_tasks(keyword=rng.choice(WORDS)),
+            "view_tasks": lambda i: manager.view_tasks(rng.choice(categories)),
+            "edit_task": lambda i: manager.edit_task(rng.randint(1, max(size - repeat, 1)), status="Выполнена"),
+            "delete_task": lambda i: manager.delete_task(delete_ids[i]) if i < len(delete_ids) else None,
+        }
+        results = {operation: _measure(calls[operation], repeat) for operation in operations}
+        manager.close()
+        return {"size": size, "mode": mode, "operations": results, "peak_rss_kb": _peak_rss_kb()}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmarks(sizes: List[int], modes: List[str], repeat: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Каждое сочетание замеряется в новом процессе: ru_maxrss — пик за всю жизнь процесса,
+    и в общем процессе все случаи после самого большого показали бы его пиковую память.
+    :return: результаты benchmark_size для всех сочетаний размеров и режимов.
+    """
+    context = multiprocessing.get_context("spawn")  # fork унаследовал бы память родителя
+    results = []
+    for size in sizes:
+        for mode in modes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results.append(executor.submit(benchmark_size, size, mode, repeat, seed).result())
+    return results
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        tolerance: float = 0.25, metric: str = "p50_ms") -> List[str]:
+    """
+    Сравнивает результаты с сохраненным эталоном.
+    :param results: текущие результаты.
+    :param baseline: эталонные результаты.
+    :param tolerance: допустимое относительное ухудшение (0.25 — на 25%).
+    :param metric: сравниваемая метрика.
+    :return: описания регрессий; пустой список, если их нет.
+    """
+    reference = {(run["size"], run["mode"]): run["operations"] for run in baseline}
+    regressions = []
+    for run in results:
+        previous = reference.get((run["size"], run["mode"]))
+        if previous is None:
+            continue
+        for operation, measured in run["operations"].items():
+            if operation not in previous:
+                continue
+            old, new = previous[operation][metric], measured[metric]
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append(f"{operation} [{run['mode']}, {run['size']}]: "
+                                   f"{metric} {old:.3f} → {new:.3f} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """
+    :return: результаты в виде текстовой таблицы.
+    """
+    lines = [f"{'режим':<9}{'задач':>9}  {'операция':<16}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}"
+             f"{'оп/с':>10}{'байт/оп':>12}"]
+    for run in results:
+        for operation, measured in run["operations"].items():
+            written = measured["bytes_written_per_op"]
+            lines.append(f"{run['mode']:<9}{run['size']:>9}  {operation:<16}{measured['p50_ms']:>10.3f}"
+                         f"{measured['p95_ms']:>10.3f}{measured['p99_ms']:>10.3f}{measured['ops_per_sec']:>10.1f}"
+                         f"{'—' if written is None else f'{written:.0f}':>12}")
+        lines.append(f"{run['mode']:<9}{run['size']:>9}  пиковая память: {run['peak_rss_kb']} КБ")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности TaskManager.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="размеры файла задач")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["json"], help="режимы TaskManager")
+    parser.add_argument("--repeat", type=int, default=20, help="повторов каждой операции")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора данных")
+    parser.add_argument("--output", help="сохранить результаты в JSON-файл")
+    parser.add_argument("--baseline", help="сравнить с эталонными результатами из JSON-файла")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое ухудшение относительно эталона")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.modes, args.repeat, args.seed)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare_to_baseline(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Регрессия: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from Storage import Change, StorageError, TaskStorage, _stat_signature, atomic_write
+from Metrics import increment
+
+
+MAGIC = b"TASKBIN1"
+FIELDS = ("title", "description", "category", "due_date", "priority", "status")
+
+# Заголовок записи: длина полезной нагрузки, признак (1 — задача, 0 — надгробие), ID задачи
+_RECORD = struct.Struct("<IBq")
+_LENGTH = struct.Struct("<I")
+# Запись индекса на каждую запись данных: ID задачи и смещение записи;
+# для надгробия хранится -(смещение + 1)
+_INDEX_ENTRY = struct.Struct("<qq")
+_MISSING = 0xFFFFFFFF
+
+_TASK = 1
+_TOMBSTONE = 0
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """
+    Кодирует задачу в запись с префиксом длины: строки полей идут подряд,
+    каждая с префиксом длины; отсутствующее поле кодируется длиной 0xFFFFFFFF.
+    :param record: словарь задачи.
+    :return: байты записи вместе с заголовком.
+    :raises ValueError: если в словаре есть поля, которых нет в формате.
+    """
+    unknown = set(record) - set(FIELDS) - {"id"}
+    if unknown:
+        raise ValueError(f"Неизвестные поля задачи: {', '.join(sorted(unknown))}")
+    parts = []
+    for field in FIELDS:
+        value = record.get(field)
+        if value is None:
+            parts.append(_LENGTH.pack(_MISSING))
+        else:
+            encoded = value.encode("utf-8")
+            parts.append(_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+    payload = b"".join(parts)
+    return _RECORD.pack(len(payload), _TASK, record["id"]) + payload
+
+
+def encode_tombstone(task_id: int) -> bytes:
+    """
+    :param task_id: ID удаленной задачи.
+    :return: байты записи-надгробия.
+    """
+    return _RECORD.pack(0, _TOMBSTONE, task_id)
+
+
+def decode_payload(task_id: int, buffer, offset: int) -> Dict[str, Any]:
+    """
+    Декодирует полезную нагрузку записи задачи.
+    :param task_id: ID задачи из заголовка записи.
+    :param buffer: байты или mmap файла данных.
+    :param offset: смещение начала полезной нагрузки.
+    :return: словарь задачи.
+    """
+    record: Dict[str, Any] = {"id": task_id}
+    for field in FIELDS:
+        (length,) = _LENGTH.unpack_from(buffer, offset)
+        offset += _LENGTH.size
+        if length == _MISSING:
+            continue
+        record[field] = bytes(buffer[offset:offset + length]).decode("utf-8")
+        offset += length
+    return record
+
+
+def _entry_offset(position: int) -> int:
+    """
+    :return: смещение записи данных по значению из индекса (с учетом кодировки надгробий).
+    """
+    return position if position >= 0 else -position - 1
+
+
+def iter_data_records(buffer, start: int = len(MAGIC)) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Перебирает записи файла данных.
+    :param buffer: содержимое файла данных.
+    :param start: смещение первой записи.
+    :return: итератор (смещение, признак, ID задачи, смещение конца записи);
+             перебор останавливается на первой недописанной записи.
+    """
+    offset = start
+    size = len(buffer)
+    while offset + _RECORD.size <= size:
+        length, kind, task_id = _RECORD.unpack_from(buffer, offset)
+        end = offset + _RECORD.size + length
+        if end > size:
+            return
+        yield offset, kind, task_id, end
+        offset = end
+
+
+class BinaryStorage(TaskStorage):
+    """
+    Компактное двоичное хранилище: записи задач с префиксом длины в файле данных
+    и индекс ID → смещение в file_path + ".idx". Изменения дописываются в конец
+    (правка — новая версия записи, удаление — надгробие), поэтому запись стоит O(1);
+    поиск по ID читает одну запись через mmap. Когда мертвых записей становится
+    больше живых, файл уплотняется.
+
+    Записанные байты никогда не меняются: get() читает mmap без блокировки, и запись
+    другого процесса не может разорвать читаемую запись, а сбой во время записи оставляет
+    лишь недописанный хвост, который отбрасывается при восстановлении.
+    """
+
+    incremental = True
+
+    def __init__(self, file_path: str, fsync: bool = True, lock_timeout: float = 10.0) -> None:
+        """
+        :param file_path: путь к файлу данных.
+        :param fsync: сбрасывать ли данные на диск после каждой записи.
+        :param lock_timeout: максимальное время ожидания блокировки в секундах.
+        """
+        super().__init__(file_path, lock_timeout)
+        self.index_path = file_path + ".idx"
+        self.fsync = fsync
+        self._offsets: Optional[Dict[int, int]] = None
+        self._dead = 0
+        self._signature = None
+        self._map: Optional[mmap.mmap] = None
+        self._map_file = None
+
+    def ensure_exists(self) -> None:
+        if not os.path.exists(self.file_path):
+            with self.lock.exclusive():
+                self._rewrite([])
+
+    def signature(self) -> Optional[Tuple[int, ...]]:
+        # Индекс дописывается последним: его отпечаток меняется, когда запись завершена
+        data = _stat_signature(self.file_path)
+        return data and data + (_stat_signature(self.index_path) or ())
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self.lock.shared():
+            with open(self.file_path, "rb") as file:
+                data = file.read()
+        self._check_magic(data)
+        increment("taskmanager_bytes_read_total", len(data))
+        records: Dict[int, Dict[str, Any]] = {}
+        for offset, kind, task_id, end in iter_data_records(data):
+            if kind == _TOMBSTONE:
+                records.pop(task_id, None)
+            else:
+                records[task_id] = decode_payload(task_id, data, offset + _RECORD.size)
+        return list(records.values())
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Читает одну задачу по ID через индекс и mmap.
+        :param task_id: ID задачи.
+        :return: словарь задачи или None.
+        """
+        self._refresh()
+        offset = self._offsets.get(task_id)
+        if offset is None:
+            return None
+        buffer = self._mapped()
+        _, kind, stored_id = _RECORD.unpack_from(buffer, offset)
+        if kind != _TASK or stored_id != task_id:
+            raise StorageError(f"Индекс {self.index_path} не соответствует файлу данных")
+        return decode_payload(task_id, buffer, offset + _RECORD.size)
+
+    def save(self, records: List[Dict[str, Any]], changes: Optional[Iterable[Change]] = None,
+             expected_version: Optional[Any] = None) -> None:
+        with self.lock.exclusive():
+            self._check_version(expected_version)
+            if changes is None:
+                self._rewrite(records)
+                return
+            self._refresh()
+            if self._dead > max(len(records), 64):
+                self._rewrite(records)
+                return
+            self._append(changes)
+
+    def close(self) -> None:
+        self._unmap()
+        super().close()
+
+    def _check_magic(self, data) -> None:
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise StorageError(f"Файл {self.file_path} не является двоичным файлом задач")
+
+    def _append(self, changes: Iterable[Change]) -> None:
+        offset = os.path.getsize(self.file_path)
+        chunks, entries = [], []
+        for change in changes:
+            if change.task_id in self._offsets:
+                self._dead += 1
+            if change.op == "delete":
+                chunk = encode_tombstone(change.task_id)
+                entries.append(_INDEX_ENTRY.pack(change.task_id, -offset - 1))
+                self._offsets.pop(change.task_id, None)
+                self._dead += 1
+            else:
+                chunk = encode_record(change.record)
+                entries.append(_INDEX_ENTRY.pack(change.task_id, offset))
+                self._offsets[change.task_id] = offset
+            chunks.append(chunk)
+            offset += len(chunk)
+        # Сначала данные, потом индекс: после сбоя между ними индекс будет восстановлен по данным
+        if chunks:
+            self._write(self.file_path, "ab", [(None, b"".join(chunks))])
+        self._write(self.index_path, "ab", [(None, b"".join(entries))])
+        self._signature = self.signature()
+
+    def _write(self, path: str, mode: str, parts: List[Tuple[Optional[int], bytes]]) -> None:
+        """
+        :param parts: пары (смещение, байты); None — дописать в конец.
+        """
+        with open(path, mode) as file:
+            for offset, data in parts:
+                if offset is not None:
+                    file.seek(offset)
+                file.write(data)
+                increment("taskmanager_bytes_written_total", len(data))
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+
+    def _rewrite(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Переписывает файл данных и индекс без мертвых записей.
+        """
+        chunks = [MAGIC]
+        offsets: Dict[int, int] = {}
+        position = len(MAGIC)
+        for record in records:
+            chunk = encode_record(record)
+            offsets[record["id"]] = position
+            chunks.append(chunk)
+            position += len(chunk)
+        data = b"".join(chunks)
+        index = b"".join(_INDEX_ENTRY.pack(task_id, offset) for task_id, offset in offsets.items())
+        self._unmap()
+        atomic_write(self.file_path, lambda file: file.write(data), self.fsync, binary=True)
+        atomic_write(self.index_path, lambda file: file.write(index), self.fsync, binary=True)
+        self._offsets = offsets
+        self._dead = 0
+        self._signature = self.signature()
+
+    def _refresh(self) -> None:
+        """
+        Загружает индекс, если файл данных изменился. Индекс проверяется по последней
+        записи: она должна заканчиваться ровно в конце файла данных. Иначе (сбой между
+        записью данных и индекса или недописанная запись) файлы восстанавливаются по данным.
+        """
+        if self._offsets is not None and self.signature() == self._signature:
+            return
+        self._unmap()
+        with self.lock.shared():
+            signature = self.signature()
+            try:
+                with open(self.index_path, "rb") as file:
+                    index = file.read()
+            except FileNotFoundError:
+                index = b""
+            buffer = self._mapped()
+        self._check_magic(buffer)
+
+        offsets: Dict[int, int] = {}
+        # Файлы прежних версий содержат записи на месте, которые ссылаются назад, поэтому
+        # проверяется самая дальняя запись, а не последняя; мертвыми считаются только
+        # записи данных, которые действительно заменены (у записей на месте смещение общее)
+        furthest = None
+        positions = set()
+        entries = len(index) // _INDEX_ENTRY.size
+        for task_id, position in _INDEX_ENTRY.iter_unpack(index[:entries * _INDEX_ENTRY.size]):
+            if position < 0:
+                offsets.pop(task_id, None)
+            else:
+                offsets[task_id] = position
+            positions.add(position)
+            if furthest is None or _entry_offset(position) > _entry_offset(furthest):
+                furthest = position
+        records = len(positions)
+        if len(index) % _INDEX_ENTRY.size or not self._ends_at(buffer, furthest):
+            with self.lock.exclusive():
+                signature, offsets, records = self._repair()
+        self._offsets = offsets
+        self._dead = records - len(offsets)
+        self._signature = signature
+
+    @staticmethod
+    def _ends_at(buffer, position: Optional[int]) -> bool:
+        if position is None:
+            return len(buffer) == len(MAGIC)
+        offset = _entry_offset(position)
+        if offset + _RECORD.size > len(buffer):
+            return False
+        length, _, _ = _RECORD.unpack_from(buffer, offset)
+        return offset + _RECORD.size + length == len(buffer)
+
+    def _repair(self) -> Tuple[Any, Dict[int, int], int]:
+        """
+        Обрезает недописанную запись в конце файла данных и строит индекс заново.
+        :return: отпечаток файла, смещения живых задач и число записей индекса.
+        """
+        self._unmap()
+        with open(self.file_path, "rb") as file:
+            data = file.read()
+        self._check_magic(data)
+        offsets: Dict[int, int] = {}
+        entries = []
+        end = len(MAGIC)
+        for offset, kind, task_id, end in iter_data_records(data):
+            if kind == _TOMBSTONE:
+                offsets.pop(task_id, None)
+                entries.append(_INDEX_ENTRY.pack(task_id, -offset - 1))
+            else:
+                offsets[task_id] = offset
+                entries.append(_INDEX_ENTRY.pack(task_id, offset))
+        if end < len(data):
+            with open(self.file_path, "r+b") as file:
+                file.truncate(end)
+        atomic_write(self.index_path, lambda file: file.write(b"".join(entries)), self.fsync, binary=True)
+        return self.signature(), offsets, len(entries)
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            self._map_file = open(self.file_path, "rb")
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        elif len(self._map) != os.fstat(self._map_file.fileno()).st_size:
+            self._unmap()
+            return self._mapped()
+        return self._map
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map_file.close()
+            self._map = None
+            self._map_file = None
+
+
+def json_to_binary(json_path: str, binary_path: str) -> int:
+    """
+    Переводит файл tasks.json в двоичный формат.
+    :param json_path: путь к JSON-файлу задач.
+    :param binary_path: путь к создаваемому двоичному файлу.
+    :return: число перенесенных задач.
+    """
+    with open(json_path, "r", encoding="utf-8") as file:
+        records = json.load(file)
+    storage = BinaryStorage(binary_path)
+    storage.save(records)
+    storage.close()
+    return len(records)
+
+
+def binary_to_json(binary_path: str, json_path: str) -> int:
+    """
+    Переводит двоичный файл задач обратно в формат tasks.json.
+    :param binary_path: путь к двоичному файлу задач.
+    :param json_path: путь к создаваемому JSON-файлу.
+    :return: число перенесенных задач.
+    """
+    storage = BinaryStorage(binary_path)
+    records = storage.load()
+    storage.close()
+    atomic_write(json_path, lambda file: json.dump(records, file, indent=4, ensure_ascii=False))
+    return len(records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Преобразование между tasks.json и двоичным форматом задач.")
+    parser.add_argument("direction", choices=["to-binary", "to-json"], help="направление преобразования")
+    parser.add_argument("source", help="исходный файл")
+    parser.add_argument("target", help="создаваемый файл")
+    args = parser.parse_args()
+    convert = json_to_binary if args.direction == "to-binary" else binary_to_json
+    print(f"Перенесено задач: {convert(args.source, args.target)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import json
+import os
+from collections import deque, namedtuple
+from typing import Deque, Iterable, List, Optional
+from Storage import Change, StorageError, _stat_signature, atomic_write
+from FileLock import FileLock
+
+
+FeedEntry = namedtuple("FeedEntry", ["seq", "op", "task_id", "record"])
+FeedEntry.__doc__ = """
+Запись ленты изменений: seq — порядковый номер (строго возрастает), op — "add", "edit",
+"delete" или "reset" (все задачи заменены целиком, нужна полная перезагрузка);
+record — полный словарь задачи (None для удаления и reset).
+"""
+
+
+class ChangeFeedGap(StorageError):
+    """
+    Запрошенные изменения уже вытеснены из ленты: потребителю нужна полная перезагрузка.
+    """
+
+
+class ChangeFeed:
+    """
+    Лента изменений с последовательными номерами. Хранит последние capacity записей:
+    в памяти процесса или, если задан path, в JSONL-файле, общем для всех процессов,
+    работающих с одним файлом задач. Файл дописывается под блокировкой и время от времени
+    переписывается атомарно, оставляя только последние capacity записей.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 1000, fsync: bool = False) -> None:
+        """
+        :param path: путь к файлу ленты; None — лента только в памяти.
+        :param capacity: сколько последних записей хранить.
+        :param fsync: сбрасывать ли файл ленты на диск после каждой записи.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.fsync = fsync
+        self._entries: Deque[FeedEntry] = deque(maxlen=capacity)
+        self._last_seq = 0
+        self._offset = 0
+        self._lines = 0
+        self._inode = None
+        self.lock = FileLock(path + ".lock") if path is not None else None
+
+    @property
+    def last_seq(self) -> int:
+        """
+        Номер последней записи (0, если записей еще не было).
+        """
+        if self.path is not None:
+            with self.lock.shared():
+                self._catch_up()
+        return self._last_seq
+
+    def append(self, changes: Iterable[Change]) -> int:
+        """
+        Добавляет изменения в ленту.
+        :param changes: изменения в порядке применения.
+        :return: номер последней добавленной записи.
+        """
+        if self.path is None:
+            for change in changes:
+                self._last_seq += 1
+                self._entries.append(FeedEntry(self._last_seq, *change))
+            return self._last_seq
+
+        with self.lock.exclusive():
+            self._catch_up(repair=True)
+            lines = []
+            for change in changes:
+                self._last_seq += 1
+                entry = FeedEntry(self._last_seq, *change)
+                self._entries.append(entry)
+                lines.append(json.dumps(entry._asdict(), ensure_ascii=False, separators=(',', ':')) + "\n")
+            data = "".join(lines).encode('utf-8')
+            with open(self.path, 'ab') as file:
+                file.write(data)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            self._offset += len(data)
+            self._lines += len(lines)
+            if self._lines > 2 * self.capacity:
+                self._rotate()
+            return self._last_seq
+
+    def changes_since(self, seq: int) -> List[FeedEntry]:
+        """
+        Возвращает изменения, сделанные после записи с номером seq.
+        :param seq: номер последней обработанной записи (0 — с самого начала).
+        :return: записи с номерами больше seq по возрастанию.
+        :raises ChangeFeedGap: если часть этих записей уже вытеснена из ленты.
+        """
+        if self.path is not None:
+            with self.lock.shared():
+                self._catch_up()
+        first = self._entries[0].seq if self._entries else self._last_seq + 1
+        if seq < first - 1:
+            raise ChangeFeedGap(f"Изменения после {seq} уже недоступны: лента начинается с {first}")
+        return [entry for entry in self._entries if entry.seq > seq]
+
+    def _catch_up(self, repair: bool = False) -> None:
+        """
+        Дочитывает записи, добавленные в файл другими процессами.
+        :param repair: обрезать ли недописанную последнюю строку (только под исключительной блокировкой).
+        """
+        signature = _stat_signature(self.path)
+        if signature is None:
+            return
+        if signature[2] != self._inode or signature[1] < self._offset:
+            # Файл переписан при ротации: читаем его заново
+            self._entries.clear()
+            self._offset = 0
+            self._lines = 0
+            self._inode = signature[2]
+        if signature[1] == self._offset:
+            return
+        with open(self.path, 'rb') as file:
+            file.seek(self._offset)
+            data = file.read()
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            entry = FeedEntry(**json.loads(line))
+            self._entries.append(entry)
+            self._last_seq = entry.seq
+            self._lines += 1
+        self._offset += complete
+        if repair and complete < len(data):
+            with open(self.path, 'r+b') as file:
+                file.truncate(self._offset)
+
+    def _rotate(self) -> None:
+        entries = list(self._entries)
+        text = "".join(json.dumps(entry._asdict(), ensure_ascii=False, separators=(',', ':')) + "\n"
+                       for entry in entries)
+        atomic_write(self.path, lambda file: file.write(text), self.fsync)
+        signature = _stat_signature(self.path)
+        self._inode = signature[2]
+        self._offset = signature[1]
+        self._lines = len(entries)
+
+    def close(self) -> None:
+        if self.lock is not None:
+            self.lock.close()
@@ -0,0 +1,147 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки между процессами недоступны
+    fcntl = None
+
+
+class LockTimeout(TimeoutError):
+    """
+    Блокировку не удалось получить за отведенное время.
+    """
+
+
+class LockStats:
+    """
+    Статистика ожидания блокировки: сколько раз ее брали, сколько раз ждали и как долго.
+    """
+
+    def __init__(self) -> None:
+        self.acquisitions = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, contended: bool) -> None:
+        self.acquisitions += 1
+        if contended:
+            self.contended += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        :return: статистика в виде словаря.
+        """
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "timeouts": self.timeouts,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+        }
+
+
+class FileLock:
+    """
+    Разделяемая/исключительная блокировка между процессами на отдельном файле (flock).
+    Блокировка повторно входима в пределах объекта: вложенные захваты внутри
+    исключительного захвата ничего не делают. Без fcntl (Windows) работает только
+    блокировка между потоками одного процесса.
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0, poll_interval: float = 0.005) -> None:
+        """
+        :param path: путь к файлу блокировки.
+        :param timeout: максимальное время ожидания в секундах.
+        :param poll_interval: начальный интервал повторных попыток в секундах.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stats = LockStats()
+        self._file = None
+        self._depth = 0
+        self._exclusive = False
+        self._thread_lock = threading.RLock()
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """
+        Захватывает блокировку для чтения.
+        :raises LockTimeout: если блокировку не удалось получить за timeout секунд.
+        """
+        with self._held(exclusive=False):
+            yield
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """
+        Захватывает блокировку для записи.
+        :raises LockTimeout: если блокировку не удалось получить за timeout секунд.
+        """
+        with self._held(exclusive=True):
+            yield
+
+    @contextmanager
+    def _held(self, exclusive: bool) -> Iterator[None]:
+        with self._thread_lock:
+            if self._depth:
+                if exclusive and not self._exclusive:
+                    raise RuntimeError("Нельзя повысить разделяемую блокировку до исключительной")
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            self._acquire(exclusive)
+            self._depth = 1
+            self._exclusive = exclusive
+            try:
+                yield
+            finally:
+                self._depth = 0
+                self._release()
+
+    def _acquire(self, exclusive: bool) -> None:
+        if fcntl is None:
+            self.stats.record(0.0, False)
+            return
+        if self._file is None:
+            self._file = open(self.path, 'a')
+        operation = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        start = time.monotonic()
+        delay = self.poll_interval
+        contended = False
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), operation)
+                break
+            except BlockingIOError:
+                contended = True
+                waited = time.monotonic() - start
+                if waited >= self.timeout:
+                    self.stats.timeouts += 1
+                    raise LockTimeout(f"Не удалось заблокировать {self.path} за {self.timeout} с")
+                time.sleep(min(delay, self.timeout - waited))
+                delay = min(delay * 2, 0.1)
+        self.stats.record(time.monotonic() - start, contended)
+
+    def _release(self) -> None:
+        if fcntl is not None and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """
+        Закрывает файл блокировки.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
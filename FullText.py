@@ -0,0 +1,154 @@
+import bisect
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from Task import Task
+
+
+_TOKEN_RE = re.compile(r"\w+")
+TITLE_WEIGHT = 2
+
+
+def fold(text: str) -> str:
+    """
+    Приводит текст к форме для сравнения без учета регистра; «ё» считается равной «е».
+    :param text: исходный текст.
+    :return: нормализованный текст.
+    """
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает текст на нормализованные слова (кириллица, латиница, цифры).
+    :param text: исходный текст.
+    :return: список слов.
+    """
+    return _TOKEN_RE.findall(fold(text))
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    :param text: нормализованный текст.
+    :return: множество триграмм текста.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс по заголовку и описанию задач.
+    Слова используются для ранжированного поиска (TF-IDF, слова заголовка весят больше),
+    триграммы — для быстрого отбора кандидатов при поиске подстроки.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._trigram_postings: Dict[str, Set[int]] = {}
+        self._documents: Dict[int, Tuple[Counter, Set[str]]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self._postings = {}
+        self._trigram_postings = {}
+        self._documents = {}
+        self._sorted_terms = None
+        for task in tasks:
+            self._add(task)
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        if old is not None and new is not None and old.title == new.title and old.description == new.description:
+            return
+        if old is not None:
+            self._remove(old.id)
+        if new is not None:
+            self._add(new)
+
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """
+        Отбирает задачи, которые могут содержать keyword как подстроку заголовка или описания.
+        Результат — надмножество точного ответа, его нужно проверить сравнением строк.
+        :param keyword: искомая подстрока.
+        :return: множество ID или None, если подстрока короче триграммы и индекс не помогает.
+        """
+        grams = trigrams(fold(keyword.lower()))
+        if not grams:
+            return None
+        postings = sorted((self._trigram_postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def search(self, query: str, prefix: bool = False, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Ранжированный поиск задач, содержащих все слова запроса.
+        :param query: строка запроса.
+        :param prefix: считать ли слова запроса префиксами.
+        :param limit: максимальное число результатов.
+        :return: пары (ID задачи, оценка) по убыванию оценки.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        total = len(self._documents)
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for matched in (self._expand(term) if prefix else (term,)):
+                posting = self._postings.get(matched)
+                if not posting:
+                    continue
+                idf = math.log(1 + total / len(posting))
+                for task_id, frequency in posting.items():
+                    term_scores[task_id] = term_scores.get(task_id, 0.0) + frequency * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: score + term_scores[task_id] for task_id, score in scores.items() if task_id in term_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit is not None else ranked
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + "\U0010ffff")
+        return self._sorted_terms[start:end]
+
+    def _add(self, task: Task) -> None:
+        frequencies = Counter(tokenize(task.description))
+        for term in tokenize(task.title):
+            frequencies[term] += TITLE_WEIGHT
+        grams = trigrams(fold(task.title.lower())) | trigrams(fold(task.description.lower()))
+        for term, frequency in frequencies.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._sorted_terms = None
+            posting[task.id] = frequency
+        for gram in grams:
+            self._trigram_postings.setdefault(gram, set()).add(task.id)
+        self._documents[task.id] = (frequencies, grams)
+
+    def _remove(self, task_id: int) -> None:
+        document = self._documents.pop(task_id, None)
+        if document is None:
+            return
+        frequencies, grams = document
+        for term in frequencies:
+            posting = self._postings[term]
+            posting.pop(task_id, None)
+            if not posting:
+                del self._postings[term]
+                self._sorted_terms = None
+        for gram in grams:
+            posting = self._trigram_postings[gram]
+            posting.discard(task_id)
+            if not posting:
+                del self._trigram_postings[gram]
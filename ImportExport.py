@@ -0,0 +1,278 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from Task import Task
+from TaskFields import parse_status
+from Storage import atomic_write
+from TaskManager import TaskManager
+
+
+FORMATS = ("jsonl", "csv")
+FIELDS = ("id", "title", "description", "category", "due_date", "priority", "status")
+REQUIRED = ("title", "description", "category", "due_date", "priority")
+
+# Строка входного файла: номер строки и ее содержимое (словарь CSV или текст строки JSONL)
+Row = Tuple[int, Any]
+
+
+class ImportStats:
+    """
+    Ход импорта: сколько строк прочитано, импортировано, пропущено как дубликаты и отклонено.
+    """
+
+    def __init__(self, max_errors: int = 100) -> None:
+        """
+        :param max_errors: сколько сообщений об ошибках сохранять (считаются все).
+        """
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.max_errors = max_errors
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed else 0.0
+
+    def record_error(self, line: int, message: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, message))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        :return: статистика в виде словаря.
+        """
+        return {
+            "read": self.read,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "elapsed": self.elapsed,
+            "rows_per_sec": self.rows_per_sec,
+        }
+
+
+def detect_format(file_path: str, fmt: Optional[str] = None) -> str:
+    """
+    :param file_path: путь к файлу.
+    :param fmt: явно заданный формат или None, чтобы определить его по расширению.
+    :return: "jsonl" или "csv".
+    :raises ValueError: если формат неизвестен.
+    """
+    if fmt is None:
+        extension = os.path.splitext(file_path)[1].lower()
+        fmt = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат файла {file_path}: используйте .jsonl или .csv")
+    return fmt
+
+
+def iter_rows(file_path: str, fmt: str) -> Iterator[Row]:
+    """
+    Потоково читает строки входного файла, не разбирая их: разбор и проверка
+    выполняются в validate_chunk, в том числе в других процессах.
+    :param file_path: путь к файлу.
+    :param fmt: "jsonl" или "csv".
+    :return: итератор пар (номер строки, строка).
+    """
+    if fmt == "csv":
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        return
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if line.strip():
+                yield line_number, line
+
+
+def chunked(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    """
+    :return: строки, сгруппированные в списки не длиннее size.
+    """
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_chunk(rows: List[Row]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Разбирает и проверяет группу строк: обязательные поля, их тип, статус и дату. Дата приводится
+    к виду YYYY-MM-DD, поэтому при добавлении она разбирается по быстрому пути.
+    :param rows: пары (номер строки, строка).
+    :return: записи задач без ID в исходном порядке и ошибки (номер строки, сообщение).
+    """
+    records, errors = [], []
+    for line_number, row in rows:
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            if not isinstance(row, dict):
+                raise ValueError("ожидался объект с полями задачи")
+            missing = [field for field in REQUIRED if not row.get(field)]
+            if missing:
+                raise ValueError(f"не заполнены поля: {', '.join(missing)}")
+            # Числа и списки из JSON иначе дошли бы до разбора даты как TypeError и прервали весь импорт
+            not_text = [field for field in REQUIRED + ("status",)
+                        if row.get(field) is not None and not isinstance(row[field], str)]
+            if not_text:
+                raise ValueError(f"поля должны быть строками: {', '.join(not_text)}")
+            status = row.get("status") or "Не выполнена"
+            # Статус проверяется так же, как при добавлении (TaskBatch.add_task), иначе ошибка прервала бы весь импорт
+            parse_status(status)
+            task = Task(id=0, title=row["title"], description=row["description"], category=row["category"],
+                        due_date=row["due_date"], priority=row["priority"], status=status)
+        except ValueError as error:
+            errors.append((line_number, str(error)))
+            continue
+        record = task.to_dict()
+        del record["id"]
+        records.append(record)
+    return records, errors
+
+
+def _validated_chunks(chunks: Iterable[List[Row]], workers: Optional[int]) -> Iterator[tuple]:
+    """
+    Проверяет группы строк в пуле процессов, сохраняя порядок групп.
+    В работе одновременно не больше двух групп на процесс, чтобы файл не читался в память целиком.
+    :param workers: число процессов; None — по числу процессоров, 0 — проверка в текущем процессе.
+    """
+    if workers == 0:
+        yield from map(validate_chunk, chunks)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_tasks(manager: TaskManager, file_path: str, fmt: Optional[str] = None, chunk_size: int = 5000,
+                 workers: Optional[int] = None, progress: Optional[Callable[[ImportStats], None]] = None,
+                 max_errors: int = 100) -> ImportStats:
+    """
+    Импортирует задачи из JSONL- или CSV-файла одной транзакцией.
+    Строки с ошибками пропускаются и попадают в статистику; задачи с уже существующим
+    заголовком (в том числе повторы внутри файла) пропускаются как дубликаты.
+    ID из файла не используются: задачи получают новые ID.
+    :param manager: TaskManager, в который импортируются задачи.
+    :param file_path: путь к входному файлу.
+    :param fmt: "jsonl" или "csv"; по умолчанию определяется по расширению.
+    :param chunk_size: число строк в группе, проверяемой одним процессом.
+    :param workers: число процессов проверки; None — по числу процессоров, 0 — без пула.
+    :param progress: функция, вызываемая со статистикой после каждой группы.
+    :param max_errors: сколько сообщений об ошибках сохранять.
+    :return: статистика импорта.
+    :raises ValueError: если формат файла неизвестен.
+    """
+    fmt = detect_format(file_path, fmt)
+    stats = ImportStats(max_errors)
+    titles = {record["title"] for record in manager.iter_records()}
+    with manager.transaction() as batch:
+        for records, errors in _validated_chunks(chunked(iter_rows(file_path, fmt), chunk_size), workers):
+            stats.read += len(records) + len(errors)
+            for line_number, message in errors:
+                stats.record_error(line_number, message)
+            for record in records:
+                if record["title"] in titles:
+                    stats.duplicates += 1
+                    continue
+                titles.add(record["title"])
+                batch.add_task(**record)
+                stats.imported += 1
+            if progress is not None:
+                progress(stats)
+    return stats
+
+
+def export_tasks(manager: TaskManager, file_path: str, fmt: Optional[str] = None, fsync: bool = True) -> int:
+    """
+    Потоково выгружает задачи в JSONL- или CSV-файл, не создавая объекты Task.
+    Файл заменяется атомарно.
+    :param manager: TaskManager, задачи которого выгружаются.
+    :param file_path: путь к выходному файлу.
+    :param fmt: "jsonl" или "csv"; по умолчанию определяется по расширению.
+    :param fsync: сбрасывать ли файл на диск.
+    :return: число выгруженных задач.
+    :raises ValueError: если формат файла неизвестен.
+    """
+    fmt = detect_format(file_path, fmt)
+    count = 0
+
+    def write(binary_file) -> None:
+        nonlocal count
+        file = io.TextIOWrapper(binary_file, encoding='utf-8', newline='')
+        if fmt == "csv":
+            writer = csv.DictWriter(file, FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            for record in manager.iter_records():
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in manager.iter_records():
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        file.flush()
+        file.detach()
+
+    atomic_write(file_path, write, fsync, binary=True)
+    return count
+
+
+def _print_progress(stats: ImportStats) -> None:
+    print(f"\rПрочитано строк: {stats.read}, импортировано: {stats.imported}, "
+          f"дубликатов: {stats.duplicates}, с ошибками: {stats.invalid} "
+          f"({stats.rows_per_sec:.0f} строк/с)", end="", file=sys.stderr, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Импорт и экспорт задач в форматах JSONL и CSV.")
+    parser.add_argument("direction", choices=["import", "export"], help="направление")
+    parser.add_argument("file", help="файл .jsonl или .csv")
+    parser.add_argument("--tasks", default="tasks.json", help="файл задач")
+    parser.add_argument("--format", choices=FORMATS, help="формат файла, если его нельзя понять по расширению")
+    parser.add_argument("--workers", type=int, help="число процессов проверки (0 — без пула)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="строк в группе")
+    args = parser.parse_args(argv)
+
+    with TaskManager(args.tasks) as manager:
+        if args.direction == "export":
+            started = time.monotonic()
+            count = export_tasks(manager, args.file, args.format)
+            print(f"Выгружено задач: {count} за {time.monotonic() - started:.2f} с")
+            return 0
+        stats = import_tasks(manager, args.file, args.format, args.chunk_size, args.workers, _print_progress)
+    print(file=sys.stderr)
+    for line_number, message in stats.errors:
+        print(f"Строка {line_number}: {message}", file=sys.stderr)
+    print(f"Импортировано задач: {stats.imported}, дубликатов: {stats.duplicates}, "
+          f"с ошибками: {stats.invalid} за {stats.elapsed:.2f} с")
+    return 1 if stats.invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
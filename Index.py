@@ -0,0 +1,180 @@
+import bisect
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+from Task import Task
+from FullText import InvertedIndex
+from TaskFields import priority_key, status_key
+
+
+class HashIndex:
+    """
+    Хеш-индекс: значение поля → ID задач в порядке их попадания в индекс.
+    """
+
+    def __init__(self, key: Callable[[Task], Hashable],
+                 normalize: Optional[Callable[[Any], Hashable]] = None) -> None:
+        """
+        :param key: функция, извлекающая индексируемое значение из задачи.
+        :param normalize: функция, приводящая искомое значение к виду key (например, подпись статуса к Status).
+        """
+        self.key = key
+        self.normalize = normalize
+        self._buckets: Dict[Hashable, Dict[int, None]] = {}
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self._buckets = {}
+        for task in tasks:
+            self._buckets.setdefault(self.key(task), {})[task.id] = None
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        if old is not None and new is not None and self.key(old) == self.key(new):
+            return
+        if old is not None:
+            value = self.key(old)
+            bucket = self._buckets.get(value)
+            if bucket is not None:
+                bucket.pop(old.id, None)
+                if not bucket:
+                    del self._buckets[value]
+        if new is not None:
+            self._buckets.setdefault(self.key(new), {})[new.id] = None
+
+    def get(self, value: Hashable) -> List[int]:
+        """
+        :param value: значение поля.
+        :return: ID задач с этим значением.
+        """
+        if self.normalize is not None:
+            value = self.normalize(value)
+        return list(self._buckets.get(value, ()))
+
+    def count(self, value: Hashable) -> int:
+        """
+        :param value: значение поля.
+        :return: число задач с этим значением.
+        """
+        if self.normalize is not None:
+            value = self.normalize(value)
+        return len(self._buckets.get(value, ()))
+
+    def values(self) -> List[Hashable]:
+        """
+        :return: все проиндексированные значения.
+        """
+        return list(self._buckets)
+
+    def __contains__(self, value: Hashable) -> bool:
+        if self.normalize is not None:
+            value = self.normalize(value)
+        return value in self._buckets
+
+
+class SortedIndex:
+    """
+    Упорядоченный индекс: отсортированный список пар (значение, ID) с поиском делением пополам.
+    """
+
+    def __init__(self, key: Callable[[Task], Any]) -> None:
+        """
+        :param key: функция, извлекающая сравнимое значение из задачи.
+        """
+        self.key = key
+        self._entries: List[Tuple[Any, int]] = []
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self._entries = sorted((self.key(task), task.id) for task in tasks)
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        if old is not None:
+            entry = (self.key(old), old.id)
+            position = bisect.bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+        if new is not None:
+            bisect.insort(self._entries, (self.key(new), new.id))
+
+    def range(self, low: Any = None, high: Any = None) -> Iterator[int]:
+        """
+        Перебирает ID задач со значением в полуинтервале [low, high) в порядке возрастания.
+        :param low: нижняя граница (None — без ограничения).
+        :param high: верхняя граница, не включается (None — без ограничения).
+        :return: итератор ID задач.
+        """
+        start = 0 if low is None else bisect.bisect_left(self._entries, (low,))
+        end = len(self._entries) if high is None else bisect.bisect_left(self._entries, (high,))
+        for position in range(start, end):
+            yield self._entries[position][1]
+
+    def count_range(self, low: Any = None, high: Any = None) -> int:
+        """
+        :return: число задач со значением в полуинтервале [low, high).
+        """
+        start = 0 if low is None else bisect.bisect_left(self._entries, (low,))
+        end = len(self._entries) if high is None else bisect.bisect_left(self._entries, (high,))
+        return max(end - start, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TaskIndexes:
+    """
+    Набор вторичных индексов резидентного хранилища. Индекс по ID — сам словарь задач
+    хранилища; здесь же поддерживается отсортированный список ID для выдачи новых ID.
+
+    Полнотекстовый индекс строится дольше всех остальных вместе взятых, поэтому он
+    создается при первом обращении к text: до этого изменения лишь запоминаются.
+    """
+
+    def __init__(self) -> None:
+        self.title = HashIndex(attrgetter("title"))
+        self.category = HashIndex(attrgetter("category"))
+        # Статус и приоритет индексируются по ключам сравнения (Status, Priority), а не по подписям
+        self.status = HashIndex(attrgetter("_status"), status_key)
+        self.priority = HashIndex(attrgetter("_priority"), priority_key)
+        self.due_date = SortedIndex(attrgetter("due_date"))
+        self._text: Optional[InvertedIndex] = None
+        self._unindexed: Dict[int, Task] = {}
+        self._ids: List[int] = []
+        self._indexes = (self.title, self.category, self.status, self.priority, self.due_date)
+
+    @property
+    def text(self) -> InvertedIndex:
+        """
+        Полнотекстовый индекс; строится при первом обращении.
+        """
+        if self._text is None:
+            self._text = InvertedIndex()
+            self._text.rebuild(self._unindexed.values())
+            self._unindexed = {}
+        return self._text
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        for index in self._indexes:
+            index.rebuild(tasks)
+        self._ids = sorted(task.id for task in tasks)
+        self._text = None
+        self._unindexed = {task.id: task for task in tasks}
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        for index in self._indexes:
+            index.update(old, new)
+        if self._text is not None:
+            self._text.update(old, new)
+        elif new is not None:
+            self._unindexed[new.id] = new
+        elif old is not None:
+            self._unindexed.pop(old.id, None)
+        if old is None and new is not None:
+            bisect.insort(self._ids, new.id)
+        elif new is None and old is not None:
+            position = bisect.bisect_left(self._ids, old.id)
+            if position < len(self._ids) and self._ids[position] == old.id:
+                del self._ids[position]
+
+    def next_id(self) -> int:
+        """
+        :return: ID для новой задачи (максимальный существующий ID + 1).
+        """
+        return self._ids[-1] + 1 if self._ids else 1
@@ -0,0 +1,107 @@
+import json
+from typing import Any, Iterator
+from Metrics import enabled, increment
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(file_path: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Построчно (по элементам) читает JSON-массив из файла, не загружая его целиком:
+    в памяти находится только текущий фрагмент файла и один разобранный элемент.
+    :param file_path: путь к файлу с JSON-массивом.
+    :param chunk_size: размер читаемого за раз фрагмента в символах.
+    :return: итератор элементов массива.
+    :raises FileNotFoundError: если файла нет.
+    :raises json.JSONDecodeError: если файл не является корректным JSON-массивом.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        scanned = 0
+        try:
+            for value in _iter_values(_ChunkReader(file, chunk_size)):
+                scanned += 1
+                yield value
+        finally:
+            if enabled():
+                increment("taskmanager_records_scanned_total", scanned)
+                increment("taskmanager_bytes_read_total", file.buffer.tell())
+
+
+def _iter_values(reader: "_ChunkReader") -> Iterator[Any]:
+    if reader.next_char() != "[":
+        raise json.JSONDecodeError("Ожидался JSON-массив", reader.buffer, reader.pos)
+    reader.pos += 1
+    if reader.next_char() == "]":
+        reader.pos += 1
+        reader.expect_end()
+        return
+    while True:
+        yield reader.decode_value()
+        separator = reader.next_char()
+        reader.pos += 1
+        if separator == "]":
+            reader.expect_end()
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Ожидалась ',' или ']'", reader.buffer, reader.pos - 1)
+
+
+class _ChunkReader:
+    """
+    Буфер над текстовым файлом, который подчитывает данные по мере надобности.
+    """
+
+    def __init__(self, file, chunk_size: int) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self, size: int) -> bool:
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Отбрасываем уже разобранную часть, чтобы буфер не рос вместе с файлом
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """
+        Пропускает пробельные символы и возвращает следующий значащий символ ("" в конце файла).
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more(self.chunk_size):
+                return ""
+
+    def decode_value(self) -> Any:
+        """
+        Разбирает очередное значение, подчитывая файл, пока значение не окажется целиком в буфере.
+        """
+        self.next_char()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # Значение, упирающееся в конец буфера (например, число), может продолжаться дальше
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._read_more(size):
+                continue
+            size *= 2
+
+    def expect_end(self) -> None:
+        if self.next_char() != "":
+            raise json.JSONDecodeError("Лишние данные после массива", self.buffer, self.pos)
@@ -1,5 +1,28 @@
+import argparse
+import json
+import os
+import shlex
 import sys
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from Task import Task
 from TaskManager import TaskManager
+from Storage import JsonFileStorage, StorageError
+
+
+PAGE_SIZE = 10
+TASKS_FILE = "tasks.json"
+# Опции всего запуска: в строке пакета они не действуют и считаются ошибкой
+GLOBAL_OPTIONS = ("--tasks", "--atomic")
+# Поля, которые можно изменить командой edit: имя поля задачи → опция командной строки
+EDIT_FIELDS = {
+    "title": "--title",
+    "description": "--description",
+    "category": "--category",
+    "due_date": "--due-date",
+    "priority": "--priority",
+    "status": "--status",
+}
 
 
 def display_menu() -> None:
@@ -71,13 +94,23 @@ def handle_edit_task(manager: TaskManager) -> None:
 def handle_view_tasks(manager: TaskManager) -> None:
     """Обрабатывает просмотр задач."""
     category = input("Введите категорию (нажмите Enter для всех категорий): ")
-    tasks = manager.view_tasks(category if category else None)
+    print_paged(manager.query().where(category=category if category else None))
 
-    if tasks:
-        for task in tasks:
-            print(f"\n {task}")
-    else:
+
+def print_paged(tasks: Iterable[Task], page_size: int = PAGE_SIZE) -> None:
+    """Выводит задачи постранично, читая их лениво по мере показа."""
+    iterator = iter(tasks)
+    page = list(islice(iterator, page_size))
+    if not page:
         print("Задач не найдено.")
+        return
+
+    while page:
+        for task in page:
+            print(f"\n {task}")
+        page = list(islice(iterator, page_size))
+        if page and input("Enter — следующая страница, q — закончить просмотр: ").lower() == "q":
+            break
 
 
 def handle_search_tasks(manager: TaskManager) -> None:
@@ -108,9 +141,216 @@ def handle_mark_completed(manager: TaskManager) -> None:
         print("Неверный формат ID.")
 
 
-def main():
-    file_path = "tasks.json"  # Укажите путь к файлу с задачами
-    manager = TaskManager(file_path)
+def handle_exit(manager: TaskManager) -> None:
+    """Записывает отложенные изменения и завершает программу."""
+    manager.close()
+    sys.exit(0)
+
+
+def open_manager(file_path: str):
+    """
+    Открывает задачи для интерактивной работы. Если задан TASK_SERVER (путь к сокету или host:port
+    запущенного python TaskServer.py), возвращает клиент сервера. Иначе — резидентный TaskManager:
+    задачи разбираются один раз за сеанс, а при запуске читаются из кэша разобранных записей.
+    """
+    address = os.environ.get("TASK_SERVER")
+    if address:
+        from TaskClient import TaskClient  # сокеты нужны только в режиме клиента
+        return TaskClient.from_address(address)
+    return TaskManager(file_path, storage=JsonFileStorage(file_path, cache=True), resident=True)
+
+
+class CommandParser(argparse.ArgumentParser):
+    """
+    Разбор команд, при котором ошибка не завершает процесс, а выбрасывается как ValueError:
+    неверная строка пакета должна стать ошибкой одной команды, а не всего пакета.
+    Строки пакета разбираются без -h (см. build_parser), иначе справка завершила бы процесс.
+    """
+
+    def error(self, message: str) -> None:
+        raise ValueError(message)
+
+
+def build_parser(batch_line: bool = False) -> argparse.ArgumentParser:
+    """
+    :param batch_line: разбор строки пакета: без справки (-h), общих опций (--tasks, --atomic)
+                       и вложенного batch — в строке пакета они были бы ошибкой.
+    :return: разбор аргументов неинтерактивного режима; команды повторяют пункты меню.
+    """
+    parser = CommandParser(prog="Main.py", description="Менеджер задач. Без команды запускается интерактивное меню; "
+                                                         "результаты команд выводятся в формате JSON.",
+                           add_help=not batch_line)
+    if not batch_line:
+        parser.add_argument("--tasks", default=TASKS_FILE, help="файл задач")
+        parser.add_argument("--atomic", action="store_true",
+                            help="ничего не сохранять, если хотя бы одна команда завершилась ошибкой")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def add_command(name: str, summary: str) -> argparse.ArgumentParser:
+        return commands.add_parser(name, help=summary, add_help=not batch_line)
+
+    add = add_command("add", "добавить задачу")
+    for field in ("title", "description", "category", "due_date", "priority"):
+        add.add_argument(EDIT_FIELDS[field], dest=field, required=True)
+
+    delete = add_command("delete", "удалить задачу")
+    delete.add_argument("task_id", type=int)
+
+    edit = add_command("edit", "изменить поля задачи")
+    edit.add_argument("task_id", type=int)
+    for field, option in EDIT_FIELDS.items():
+        edit.add_argument(option, dest=field)
+
+    view = add_command("view", "показать задачи")
+    view.add_argument("--category")
+
+    search = add_command("search", "найти задачи")
+    search.add_argument("--keyword")
+    search.add_argument("--category")
+    search.add_argument("--status")
+
+    complete = add_command("complete", "отметить задачу как выполненную")
+    complete.add_argument("task_id", type=int)
+
+    if not batch_line:
+        batch = add_command("batch", "выполнить команды из файла (по одной в строке) или из stdin")
+        batch.add_argument("file", nargs="?", default="-", help="файл команд; '-' — стандартный ввод")
+    return parser
+
+
+def run_command(manager: TaskManager, args: argparse.Namespace) -> Any:
+    """
+    Выполняет одну команду неинтерактивного режима.
+    :param manager: TaskManager.
+    :param args: разобранная команда.
+    :return: результат, который можно передать в JSON.
+    :raises ValueError: если задача не найдена или данные команды неверны.
+    """
+    if args.command == "add":
+        return manager.add_tasks([{field: getattr(args, field)
+                                   for field in ("title", "description", "category", "due_date", "priority")}])[0]
+    if args.command == "delete":
+        manager.delete_tasks([args.task_id])
+        return None
+    if args.command == "edit":
+        updates = {field: getattr(args, field) for field in EDIT_FIELDS if getattr(args, field) is not None}
+        if not updates:
+            raise ValueError("Не указаны поля для изменения")
+        manager.edit_tasks({args.task_id: updates})
+        return None
+    if args.command == "view":
+        return [task.to_dict() for task in manager.query().where(category=args.category or None)]
+    if args.command == "search":
+        return [task.to_dict() for task in manager.search_tasks(args.keyword, args.category or None, args.status or None)]
+    if args.command == "complete":
+        manager.mark_task_as_completed(args.task_id)
+        return None
+    raise ValueError(f"Команда {args.command} недоступна в пакете")
+
+
+def read_commands(stream: TextIO) -> Iterator[Tuple[int, Union[List[str], ValueError]]]:
+    """
+    Читает команды пакета: по одной в строке, в синтаксисе командной строки
+    (например, add --title "Отчет" ...); пустые строки и комментарии (#) пропускаются.
+    :return: номер строки и аргументы команды (или ошибка разбора строки).
+    """
+    for number, line in enumerate(stream, 1):
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as error:
+            yield number, error
+            continue
+        if argv:
+            yield number, argv
+
+
+def run_batch(manager: TaskManager, parser: argparse.ArgumentParser, stream: TextIO,
+              output: TextIO) -> int:
+    """
+    Выполняет команды пакета и выводит результат каждой строкой JSON.
+    :param parser: разбор строк пакета (build_parser(batch_line=True)).
+    :return: число команд, завершившихся ошибкой.
+    """
+    failed = 0
+    for number, argv in read_commands(stream):
+        result: Dict[str, Any] = {"line": number}
+        try:
+            if isinstance(argv, Exception):
+                raise argv
+            options = [arg for arg in argv if arg.split("=", 1)[0] in GLOBAL_OPTIONS]
+            if options:
+                raise ValueError(f"Опции {', '.join(options)} задаются для всего пакета, а не для строки")
+            args = parser.parse_args(argv)
+            result["command"] = args.command
+            result["result"] = run_command(manager, args)
+            result["ok"] = True
+        except ValueError as error:
+            result["ok"] = False
+            result["error"] = str(error)
+            failed += 1
+        print(json.dumps(result, ensure_ascii=False), file=output)
+    return failed
+
+
+def run_cli(args: argparse.Namespace, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None) -> int:
+    """
+    Неинтерактивный режим: одна команда или пакет команд (batch) над одним загруженным
+    TaskManager. Задачи читаются один раз, все изменения копятся в памяти и записываются
+    одной операцией в конце, поэтому тысячи команд стоят одной загрузки и одной записи.
+    Последняя строка вывода — итог: число ошибок (или результат одной команды) и saved.
+    :param args: разобранные аргументы командной строки.
+    :return: код завершения: 0 — все команды выполнены, 1 — были ошибки.
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    manager = TaskManager(args.tasks, storage=JsonFileStorage(args.tasks, cache=True), resident=True,
+                          flush_interval=None)
+    if args.command == "batch":
+        parser = build_parser(batch_line=True)
+        if args.file == "-":
+            failed = run_batch(manager, parser, stdin, stdout)
+        else:
+            with open(args.file, encoding="utf-8") as file:
+                failed = run_batch(manager, parser, file, stdout)
+        summary: Dict[str, Any] = {"failed": failed}
+    else:
+        summary = {"command": args.command}
+        try:
+            summary["result"] = run_command(manager, args)
+            failed = 0
+        except ValueError as error:
+            summary["error"] = str(error)
+            failed = 1
+        summary["ok"] = not failed
+
+    saved = not (failed and args.atomic)
+    try:
+        if saved:
+            manager.close()
+        else:
+            # Отложенные изменения не записываются: close() TaskManager сбросил бы их на диск
+            manager.storage.close()
+    except (StorageError, OSError) as error:
+        summary["error"] = f"Не удалось сохранить задачи: {error}"
+        saved = False
+        failed += 1
+    summary["saved"] = saved
+    print(json.dumps(summary, ensure_ascii=False), file=stdout)
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    except ValueError as error:
+        print(json.dumps({"ok": False, "error": str(error)}, ensure_ascii=False))
+        return 2
+    if args.command is not None:
+        return run_cli(args)
+
+    file_path = args.tasks  # Укажите путь к файлу с задачами (--tasks)
+    manager = open_manager(file_path)
 
     actions = {
         "1": handle_add_task,
@@ -119,7 +359,7 @@ def main():
         "4": handle_view_tasks,
         "5": handle_search_tasks,
         "6": handle_mark_completed,
-        "7": lambda _: sys.exit(0),
+        "7": handle_exit,
     }
 
     while True:
@@ -128,10 +368,13 @@ def main():
 
         action = actions.get(choice)
         if action:
-            action(manager)
+            try:
+                action(manager)
+            except StorageError as error:
+                print(f"Ошибка: {error}")
         else:
             print("Неверный выбор. Попробуйте снова.")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
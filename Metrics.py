@@ -0,0 +1,336 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from Task import Task
+
+if TYPE_CHECKING:
+    import logging
+    import pstats
+
+# cProfile, pstats, tracemalloc и logging импортируются при первом использовании:
+# Metrics загружается при каждом запуске, а профилирование и журнал нужны редко.
+
+# Метки метрики: отсортированные пары (имя, значение), чтобы их можно было использовать как ключ словаря
+Labels = Tuple[Tuple[str, str], ...]
+
+_sinks: List[Any] = []
+_NULL_CONTEXT = nullcontext()
+_original_task_methods: Dict[str, Callable] = {}
+
+
+class MetricsRegistry:
+    """
+    Приемник метрик в памяти процесса: счетчики и таймеры (число замеров, сумма, максимум).
+    Любой приемник — объект с методами increment(name, value, labels) и observe(name, seconds, labels).
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.timers: Dict[Tuple[str, Labels], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float, labels: Labels) -> None:
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, labels: Labels) -> None:
+        key = (name, labels)
+        with self._lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                self.timers[key] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """
+        :return: значение счетчика (0, если событий не было).
+        """
+        return self.counters.get((name, _labels(labels)), 0)
+
+    def timer(self, name: str, **labels: Any) -> Dict[str, float]:
+        """
+        :return: число замеров, суммарное и максимальное время таймера в секундах.
+        """
+        count, total, maximum = self.timers.get((name, _labels(labels)), (0, 0.0, 0.0))
+        return {"count": count, "sum": total, "max": maximum}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters = {}
+            self.timers = {}
+
+    def render_prometheus(self) -> str:
+        """
+        :return: метрики в текстовом формате Prometheus; таймеры — как summary (_count, _sum) и gauge _max.
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            timers = sorted(self.timers.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_format_labels(labels)} {value:g}"
+                         for (metric, labels), value in counters if metric == name)
+        for name in sorted({name for (name, _), _ in timers}):
+            lines.append(f"# TYPE {name} summary")
+            for (metric, labels), (count, total, _) in timers:
+                if metric == name:
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {total:.9f}")
+            lines.append(f"# TYPE {name}_max gauge")
+            lines.extend(f"{name}_max{_format_labels(labels)} {maximum:.9f}"
+                         for (metric, labels), (_, _, maximum) in timers if metric == name)
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusFileSink(MetricsRegistry):
+    """
+    Реестр, который сохраняет метрики в файл в текстовом формате Prometheus
+    (например, для textfile-коллектора node_exporter). Файл заменяется атомарно.
+    """
+
+    def __init__(self, path: str, min_interval: Optional[float] = 10.0) -> None:
+        """
+        :param path: путь к файлу .prom.
+        :param min_interval: как часто (в секундах) сохранять файл при поступлении метрик;
+                             None — только по write().
+        """
+        super().__init__()
+        self.path = path
+        self.min_interval = min_interval
+        self._last_write = time.monotonic()
+
+    def increment(self, name: str, value: float, labels: Labels) -> None:
+        super().increment(name, value, labels)
+        self._maybe_write()
+
+    def observe(self, name: str, seconds: float, labels: Labels) -> None:
+        super().observe(name, seconds, labels)
+        self._maybe_write()
+
+    def _maybe_write(self) -> None:
+        if self.min_interval is not None and time.monotonic() - self._last_write >= self.min_interval:
+            self.write()
+
+    def write(self) -> None:
+        """
+        Сохраняет текущие метрики в файл.
+        """
+        from Storage import atomic_write  # Storage сам пишет метрики, поэтому импорт отложен
+        text = self.render_prometheus()
+        self._last_write = time.monotonic()
+        atomic_write(self.path, lambda file: file.write(text), fsync=False)
+
+
+class LoggingSink:
+    """
+    Приемник, который пишет каждое событие в журнал logging.
+    """
+
+    def __init__(self, logger: Optional["logging.Logger"] = None, level: Optional[int] = None) -> None:
+        import logging
+        self.logger = logger or logging.getLogger("taskmanager.metrics")
+        self.level = level if level is not None else logging.DEBUG
+
+    def increment(self, name: str, value: float, labels: Labels) -> None:
+        self.logger.log(self.level, "%s%s +%g", name, _format_labels(labels), value)
+
+    def observe(self, name: str, seconds: float, labels: Labels) -> None:
+        self.logger.log(self.level, "%s%s %.6f s", name, _format_labels(labels), seconds)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def enabled() -> bool:
+    """
+    :return: подключен ли хотя бы один приемник метрик.
+    """
+    return bool(_sinks)
+
+
+def add_sink(sink: Any) -> None:
+    """
+    Подключает приемник метрик. Пока нет ни одного приемника, замеры не выполняются
+    и счетчики Task не установлены.
+    :param sink: объект с методами increment(name, value, labels) и observe(name, seconds, labels).
+    """
+    if not _sinks:
+        _install_task_hooks()
+    _sinks.append(sink)
+
+
+def remove_sink(sink: Any) -> None:
+    """
+    Отключает приемник метрик.
+    """
+    _sinks.remove(sink)
+    if not _sinks:
+        _remove_task_hooks()
+
+
+def increment(name: str, value: float = 1, **labels: Any) -> None:
+    """
+    Увеличивает счетчик во всех приемниках.
+    """
+    if not _sinks:
+        return
+    key = _labels(labels)
+    for sink in _sinks:
+        sink.increment(name, value, key)
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """
+    Передает замер времени всем приемникам.
+    """
+    if not _sinks:
+        return
+    key = _labels(labels)
+    for sink in _sinks:
+        sink.observe(name, seconds, key)
+
+
+@contextmanager
+def _timer(name: str, labels: Dict[str, Any]) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def timed(name: str, **labels: Any):
+    """
+    Контекстный менеджер, замеряющий время блока; без приемников ничего не делает.
+    Пример: with timed("taskmanager_phase_seconds", phase="fsync"): ...
+    """
+    if not _sinks:
+        return _NULL_CONTEXT
+    return _timer(name, labels)
+
+
+def instrumented(operation: str) -> Callable[[Callable], Callable]:
+    """
+    Декоратор операции TaskManager: замеряет ее время как taskmanager_operation_seconds{operation=...}.
+    Без приемников обертка сводится к одной проверке.
+    :param operation: имя операции.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe("taskmanager_operation_seconds", time.perf_counter() - started, operation=operation)
+        return wrapper
+    return decorator
+
+
+def _install_task_hooks() -> None:
+    """
+    Подменяет методы Task версиями со счетчиками. Подмена делается только при включенных
+    метриках, поэтому без них создание задач не замедляется ни на одну проверку.
+    """
+    if _original_task_methods:
+        return
+    original_init = Task.__init__
+    original_parse_ordinal = Task._parse_ordinal
+    original_parse_date = Task._parse_date
+
+    def __init__(self, *args, **kwargs):
+        increment("taskmanager_tasks_built_total")
+        original_init(self, *args, **kwargs)
+
+    def _parse_ordinal(self, date_str):
+        increment("taskmanager_date_parses_total")
+        return original_parse_ordinal(self, date_str)
+
+    def _parse_date(self, date_str):
+        increment("taskmanager_strptime_calls_total")
+        return original_parse_date(self, date_str)
+
+    _original_task_methods.update(__init__=original_init, _parse_ordinal=original_parse_ordinal,
+                                  _parse_date=original_parse_date)
+    Task.__init__ = functools.wraps(original_init)(__init__)
+    Task._parse_ordinal = functools.wraps(original_parse_ordinal)(_parse_ordinal)
+    Task._parse_date = functools.wraps(original_parse_date)(_parse_date)
+
+
+def _remove_task_hooks() -> None:
+    for name, method in _original_task_methods.items():
+        setattr(Task, name, method)
+    _original_task_methods.clear()
+
+
+class ProfileReport:
+    """
+    Результат profile(): статистика cProfile и, при замере памяти, пик и крупнейшие места выделения.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Optional["pstats.Stats"] = None
+        self.text = ""
+        self.peak_memory: Optional[int] = None
+        self.top_allocations: List[str] = []
+
+    def dump(self, path: str) -> None:
+        """
+        Сохраняет статистику cProfile в файл (для snakeviz, pstats и т. п.).
+        """
+        self.stats.dump_stats(path)
+
+
+@contextmanager
+def profile(memory: bool = True, sort: str = "cumulative", limit: int = 20) -> Iterator[ProfileReport]:
+    """
+    Профилирует блок кода cProfile и, по желанию, tracemalloc.
+    Пример: with profile() as report: manager.search_tasks("отчет"); print(report.text)
+    :param memory: замерять ли выделение памяти (заметно замедляет код внутри блока).
+    :param sort: поле сортировки статистики cProfile.
+    :param limit: сколько строк статистики и мест выделения памяти сохранить.
+    :return: ProfileReport, который заполняется при выходе из блока.
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        output = io.StringIO()
+        report.stats = pstats.Stats(profiler, stream=output)
+        report.stats.sort_stats(sort).print_stats(limit)
+        report.text = output.getvalue()
+        if memory:
+            report.peak_memory = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            report.top_allocations = [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,287 @@
+import copy
+import heapq
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from Task import Task
+from Index import HashIndex, TaskIndexes
+from TaskFields import priority_key, priority_rank, status_key
+
+
+FIELDS = ("id", "title", "description", "category", "due_date", "priority", "status")
+_EQUALITY = ("id", "title", "category", "status", "priority")
+_HASH_INDEXED = ("title", "category", "status", "priority")
+# Статус и приоритет сравниваются по ключам (Status, Priority): условие priority="high"
+# находит и «высокий», а status="выполнено" — «Выполнена»
+_KEYS: Dict[str, Callable[[Any], Any]] = {"status": status_key, "priority": priority_key}
+_ATTRIBUTES = {"status": "_status", "priority": "_priority"}
+
+
+class _Descending:
+    """
+    Обертка, обращающая порядок сравнения: нужна для сортировки по убыванию в составном ключе.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def _as_datetime(value: Union[str, date]) -> datetime:
+    """
+    :param value: дата строкой YYYY-MM-DD или объектом date/datetime.
+    :return: полночь этой даты.
+    :raises ValueError: если строка даты имеет неверный формат.
+    """
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Неверный формат даты: {value}. Используйте формат YYYY-MM-DD.") from e
+
+
+def _sort_value(task: Task, name: str) -> Any:
+    # Приоритет упорядочивается по важности (Priority), а не по алфавиту подписей
+    if name == "priority":
+        return priority_rank(task._priority)
+    return getattr(task, name)
+
+
+def _lookup(index: HashIndex, values: Iterable[Any]) -> Iterator[int]:
+    """
+    Перебирает ID задач с любым из значений. Индекс передается параметром: генератор,
+    созданный в цикле по полям, иначе прочитал бы переменную цикла уже после его окончания
+    и искал бы значения в индексе последнего поля.
+    """
+    for value in values:
+        yield from index.get(value)
+
+
+class Query:
+    """
+    Составной запрос к задачам: query().where(...).order_by(...).limit(...).offset(...).
+    Каждый метод возвращает новый запрос, исходный не меняется. Результаты перебираются
+    лениво: без сортировки задачи выдаются по мере нахождения, с limit — отбором top-k
+    через кучу, без полной сортировки.
+
+    В резидентном режиме планировщик выбирает самый избирательный индекс из подходящих
+    (по ID, заголовку, категории, статусу, приоритету, сроку или триграммам ключевого слова),
+    в обычном — потоково читает хранилище. Без order_by порядок задач — порядок хранения
+    или выбранного индекса.
+    """
+
+    def __init__(self, tasks: Optional[Callable[[], Dict[int, Task]]] = None,
+                 indexes: Optional[TaskIndexes] = None,
+                 records: Optional[Callable[[], Iterator[Dict[str, Any]]]] = None) -> None:
+        """
+        :param tasks: функция, возвращающая задачи резидентного хранилища по ID.
+        :param indexes: индексы резидентного хранилища; без них задачи перебираются целиком (снимки).
+        :param records: функция, потоково перебирающая записи хранилища (обычный режим).
+        """
+        self._tasks = tasks
+        self._indexes = indexes
+        self._records = records
+        self._equals: Dict[str, set] = {}
+        self._due_low: Optional[datetime] = None
+        self._due_high: Optional[datetime] = None
+        self._keywords: List[str] = []
+        self._predicates: List[Callable[[Task], bool]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    def _copy(self) -> "Query":
+        query = copy.copy(self)
+        query._equals = dict(self._equals)
+        query._keywords = list(self._keywords)
+        query._predicates = list(self._predicates)
+        query._order = list(self._order)
+        return query
+
+    def where(self, *predicates: Callable[[Task], bool], **conditions: Any) -> "Query":
+        """
+        Добавляет условия; все условия запроса должны выполняться одновременно.
+        :param predicates: произвольные функции task -> bool.
+        :param conditions: id, title, category, status, priority — равенство (список, кортеж
+                           или множество — любое из значений); keyword — подстрока заголовка или
+                           описания без учета регистра; due_before / due_after — срок строго
+                           раньше / позже даты (YYYY-MM-DD или date). Условия со значением None пропускаются.
+        :return: новый запрос.
+        :raises ValueError: при неизвестном условии или неверной дате.
+        """
+        query = self._copy()
+        for name, value in conditions.items():
+            if value is None:
+                continue
+            if name in _EQUALITY:
+                values = set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+                if name in _KEYS:
+                    values = {_KEYS[name](item) for item in values}
+                query._equals[name] = query._equals[name] & values if name in query._equals else values
+            elif name == "keyword":
+                query._keywords.append(value.lower())
+            elif name == "due_before":
+                high = _as_datetime(value)
+                query._due_high = high if query._due_high is None else min(query._due_high, high)
+            elif name == "due_after":
+                low = _as_datetime(value) + timedelta(days=1)
+                query._due_low = low if query._due_low is None else max(query._due_low, low)
+            else:
+                raise ValueError(f"Неизвестное условие запроса: {name}")
+        query._predicates.extend(predicates)
+        return query
+
+    def order_by(self, *fields: str) -> "Query":
+        """
+        Задает сортировку; "-" перед именем поля — по убыванию. Равные задачи упорядочиваются по ID.
+        :param fields: имена полей задачи.
+        :return: новый запрос.
+        :raises ValueError: при неизвестном поле.
+        """
+        for field in fields:
+            if field.lstrip("-") not in FIELDS:
+                raise ValueError(f"Неизвестное поле сортировки: {field}")
+        query = self._copy()
+        query._order = [(field.lstrip("-"), field.startswith("-")) for field in fields]
+        return query
+
+    def limit(self, count: Optional[int]) -> "Query":
+        """
+        :param count: максимальное число результатов (None — без ограничения).
+        :return: новый запрос.
+        """
+        if count is not None and count < 0:
+            raise ValueError("Ограничение числа результатов не может быть отрицательным")
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def offset(self, count: int) -> "Query":
+        """
+        :param count: сколько первых результатов пропустить.
+        :return: новый запрос.
+        """
+        if count < 0:
+            raise ValueError("Смещение не может быть отрицательным")
+        query = self._copy()
+        query._offset = count
+        return query
+
+    def matches(self, task: Task) -> bool:
+        """
+        :return: удовлетворяет ли задача всем условиям запроса.
+        """
+        for name, values in self._equals.items():
+            if getattr(task, _ATTRIBUTES.get(name, name)) not in values:
+                return False
+        if self._due_low is not None or self._due_high is not None:
+            due_date = task.due_date
+            if self._due_low is not None and due_date < self._due_low:
+                return False
+            if self._due_high is not None and due_date >= self._due_high:
+                return False
+        for keyword in self._keywords:
+            if keyword not in task.title.lower() and keyword not in task.description.lower():
+                return False
+        return all(predicate(task) for predicate in self._predicates)
+
+    def explain(self) -> str:
+        """
+        :return: описание выбранного плана: "scan", "stream" или "index:<поле>"; "(ordered)" —
+                 индекс сразу выдает задачи в нужном порядке.
+        """
+        return self._plan()[0]
+
+    def __iter__(self) -> Iterator[Task]:
+        results = self._results()
+        # Задачи резидентного хранилища и снимков общие: наружу выдаются копии, чтобы правка
+        # результата не меняла хранилище (в обычном режиме задачи и так создаются заново)
+        return results if self._tasks is None else map(Task.copy, results)
+
+    def _results(self) -> Iterator[Task]:
+        _, source, ordered = self._plan()
+        tasks = (task for task in source() if self.matches(task))
+        if self._order and not ordered:
+            if self._limit is not None:
+                tasks = iter(heapq.nsmallest(self._offset + self._limit, tasks, key=self._sort_key))
+            else:
+                tasks = iter(sorted(tasks, key=self._sort_key))
+        stop = None if self._limit is None else self._offset + self._limit
+        return islice(tasks, self._offset, stop)
+
+    def all(self) -> List[Task]:
+        """
+        :return: все результаты списком.
+        """
+        return list(self)
+
+    def first(self) -> Optional[Task]:
+        """
+        :return: первый результат или None.
+        """
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """
+        :return: число результатов с учетом limit и offset.
+        """
+        return sum(1 for _ in self._results())
+
+    def _sort_key(self, task: Task) -> tuple:
+        return tuple(_Descending(_sort_value(task, name)) if descending else _sort_value(task, name)
+                     for name, descending in self._order) + (task.id,)
+
+    def _plan(self) -> Tuple[str, Callable[[], Iterable[Task]], bool]:
+        """
+        Выбирает источник задач.
+        :return: описание плана, функция-источник и признак того, что источник уже упорядочен.
+        """
+        if self._tasks is None:
+            return "stream", self._stream, False
+
+        tasks = self._tasks()
+        indexes = self._indexes
+        if indexes is None:
+            return "scan", lambda: list(tasks.values()), False
+
+        def by_ids(ids: Iterable[int]) -> Callable[[], Iterator[Task]]:
+            return lambda: (tasks[task_id] for task_id in ids if task_id in tasks)
+
+        # Кандидаты: (оценка числа задач, описание, источник)
+        plans = [(len(tasks), "scan", lambda: list(tasks.values()))]
+        if "id" in self._equals:
+            plans.append((len(self._equals["id"]), "index:id", by_ids(sorted(self._equals["id"]))))
+        for field in _HASH_INDEXED:
+            if field in self._equals:
+                index = getattr(indexes, field)
+                values = self._equals[field]
+                plans.append((sum(index.count(value) for value in values), f"index:{field}",
+                              by_ids(_lookup(index, values))))
+        has_range = self._due_low is not None or self._due_high is not None
+        if has_range:
+            plans.append((indexes.due_date.count_range(self._due_low, self._due_high), "index:due_date",
+                          by_ids(indexes.due_date.range(self._due_low, self._due_high))))
+        for keyword in self._keywords:
+            candidates = indexes.text.candidates(keyword)
+            if candidates is not None:
+                plans.append((len(candidates), "index:text", by_ids(sorted(candidates))))
+
+        _, description, source = min(plans, key=lambda plan: plan[0])
+        if self._order == [("due_date", False)] and description in ("scan", "index:due_date"):
+            # Индекс по сроку уже упорядочен по (срок, ID): сортировка не нужна, а limit останавливает перебор
+            return ("index:due_date (ordered)",
+                    by_ids(indexes.due_date.range(self._due_low, self._due_high)), True)
+        return description, source, False
+
+    def _stream(self) -> Iterator[Task]:
+        for record in self._records():
+            if all((_KEYS[name](record[name]) if name in _KEYS else record[name]) in values
+                   for name, values in self._equals.items()):
+                yield Task(**record)
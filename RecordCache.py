@@ -0,0 +1,109 @@
+import marshal
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+from Storage import _stat_signature, atomic_write
+from Metrics import increment
+
+
+CACHE_VERSION = 1
+# Файл кэша: длина заголовка, заголовок и записи, каждое в формате marshal
+HEADER_SIZE = struct.Struct(">I")
+
+
+def digest(data: bytes) -> bytes:
+    """
+    :return: хэш содержимого файла задач.
+    """
+    import hashlib  # импорт отложен: хэш нужен только при промахе по отпечатку
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class RecordCache:
+    """
+    Уже разобранные записи файла задач в формате marshal (file_path + ".cache").
+    marshal разбирается примерно вдвое быстрее JSON, поэтому повторный запуск не разбирает файл заново.
+
+    Кэш действителен, пока совпадает отпечаток файла задач (mtime, размер, inode);
+    если отпечаток изменился, но содержимое то же (файл скопирован или «тронут»),
+    это проверяется по хэшу. Заголовок записывается отдельно от записей, поэтому
+    устаревший кэш отбрасывается без чтения записей.
+    """
+
+    def __init__(self, file_path: str, cache_path: Optional[str] = None) -> None:
+        """
+        :param file_path: путь к файлу задач.
+        :param cache_path: путь к файлу кэша; по умолчанию file_path + ".cache".
+        """
+        self.file_path = file_path
+        self.cache_path = cache_path if cache_path is not None else file_path + ".cache"
+
+    def _header(self, signature: Tuple[int, ...], content_digest: bytes) -> tuple:
+        # marshal не переносим между версиями Python, поэтому версия входит в заголовок
+        return (CACHE_VERSION, tuple(sys.version_info[:2]), signature, content_digest)
+
+    def load(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Читает записи из кэша, если он соответствует текущему файлу задач.
+        Вызывается под блокировкой хранилища.
+        :return: список словарей задач или None, если кэша нет или он устарел.
+        """
+        signature = _stat_signature(self.file_path)
+        if signature is None:
+            return None
+        try:
+            with open(self.cache_path, 'rb') as file:
+                (size,) = HEADER_SIZE.unpack(file.read(HEADER_SIZE.size))
+                version, python, cached_signature, content_digest = marshal.loads(file.read(size))
+                if version != CACHE_VERSION or python != tuple(sys.version_info[:2]):
+                    increment("taskmanager_record_cache_total", result="miss")
+                    return None
+                if cached_signature != signature:
+                    if cached_signature[1] != signature[1]:
+                        increment("taskmanager_record_cache_total", result="miss")
+                        return None
+                    with open(self.file_path, 'rb') as tasks_file:
+                        if digest(tasks_file.read()) != content_digest:
+                            increment("taskmanager_record_cache_total", result="miss")
+                            return None
+                    # marshal.loads по прочитанным байтам в разы быстрее marshal.load по файлу
+                    records = marshal.loads(file.read())
+                    self.store(records, signature, content_digest)
+                else:
+                    records = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            return None
+        increment("taskmanager_record_cache_total", result="hit")
+        return records
+
+    def store(self, records: List[Dict[str, Any]], signature: Optional[Tuple[int, ...]],
+              content_digest: bytes) -> None:
+        """
+        Сохраняет записи в кэш. Ошибка записи кэша не считается ошибкой: кэш просто не обновится.
+        :param records: записи файла задач.
+        :param signature: отпечаток файла задач, которому соответствуют записи.
+        :param content_digest: хэш содержимого файла задач (см. digest()).
+        """
+        if signature is None:
+            return
+
+        header = marshal.dumps(self._header(signature, content_digest))
+
+        def write(file) -> None:
+            file.write(HEADER_SIZE.pack(len(header)))
+            file.write(header)
+            file.write(marshal.dumps(records))
+        try:
+            atomic_write(self.cache_path, write, fsync=False, binary=True)
+        except (OSError, ValueError):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Удаляет кэш.
+        """
+        try:
+            os.remove(self.cache_path)
+        except FileNotFoundError:
+            pass
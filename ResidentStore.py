@@ -0,0 +1,305 @@
+import atexit
+import json
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+from Task import Task
+from Storage import Change, ConcurrentModificationError, StorageError, TaskStorage
+from Index import TaskIndexes
+
+
+# Хранилища с отложенной записью: то, что не успел записать следующий вызов, записывается при выходе
+_deferred: "weakref.WeakSet[ResidentStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_deferred() -> None:
+    for store in list(_deferred):
+        if store.dirty:
+            store.flush()
+
+
+class ResidentStore:
+    """
+    Держит разобранные задачи в памяти и откладывает запись изменений.
+    Файл перечитывается только тогда, когда меняется его отпечаток
+    (mtime, размер, inode), то есть когда его изменил кто-то другой.
+    Объекты Task в хранилище не изменяются на месте: правка заменяет задачу новым объектом,
+    а вызывающим (TaskManager, Query) выдаются копии задач.
+    Поэтому снимок (snapshot) — это сам словарь задач: следующее изменение скопирует его,
+    а не изменит.
+
+    Слушатели (например, индексы) получают rebuild(tasks) после каждой загрузки
+    и update(old, new) после каждого изменения; old равен None при добавлении,
+    new — при удалении.
+    """
+
+    def __init__(self, storage: TaskStorage, flush_interval: Optional[float] = 0.0) -> None:
+        """
+        :param storage: хранилище, в которое сбрасываются изменения.
+        :param flush_interval: минимальный интервал между записями в секундах;
+                               0 — запись после каждого изменения, None — только по flush().
+                               При положительном интервале последние изменения записываются
+                               и при завершении процесса.
+        """
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self._tasks: Dict[int, Task] = {}
+        self._signature = None
+        self._loaded = False
+        self._pending: List[Tuple[str, int, Optional[Task]]] = []
+        self._rewrite = False
+        self._writing = False
+        self._shared = False
+        self._last_flush = time.monotonic()
+        self._indexes = TaskIndexes()
+        self._listeners = [self._indexes]
+        if flush_interval:
+            _deferred.add(self)
+
+    def add_listener(self, listener) -> None:
+        """
+        Подписывает слушателя на изменения задач.
+        :param listener: объект с методами rebuild(tasks) и update(old, new).
+        """
+        if self._loaded:
+            listener.rebuild(self._tasks.values())
+        self._listeners.append(listener)
+
+    @property
+    def indexes(self) -> TaskIndexes:
+        """
+        Индексы задач, соответствующие хранилищу: перед выдачей задачи загружаются
+        или перечитываются, если файл изменился извне (см. tasks()). Иначе первый поиск
+        по еще не загруженным задачам или после записи другим процессом нашел бы не то.
+        """
+        self.tasks()
+        return self._indexes
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Есть ли изменения, еще не записанные в хранилище.
+        """
+        return bool(self._pending) or self._rewrite
+
+    def tasks(self) -> Dict[int, Task]:
+        """
+        Возвращает задачи, перечитывая хранилище, если оно изменилось извне.
+        :return: словарь задач по ID в порядке хранения.
+        :raises StorageError: если файл задач поврежден.
+        """
+        if not self._loaded or (not self._rewrite and not self._writing
+                                and self.storage.signature() != self._signature):
+            self._reload()
+        self._maybe_flush()
+        return self._tasks
+
+    def snapshot(self) -> Dict[int, Task]:
+        """
+        Возвращает словарь задач, который больше никогда не изменится.
+        Копирование откладывается до следующего изменения (копирование при записи),
+        поэтому снимок без последующих правок ничего не стоит.
+        :return: словарь задач по ID.
+        """
+        tasks = self.tasks()
+        self._shared = True
+        return tasks
+
+    def _own(self) -> None:
+        """
+        Копирует словарь задач перед изменением, если на него ссылается снимок.
+        """
+        if self._shared:
+            self._tasks = dict(self._tasks)
+            self._shared = False
+
+    def put(self, task: Task, op: str = "edit") -> None:
+        """
+        Добавляет или заменяет задачу.
+        :param task: задача.
+        :param op: вид изменения ("add" или "edit").
+        """
+        self._own()
+        old = self._tasks.get(task.id)
+        self._tasks[task.id] = task
+        self._pending.append((op, task.id, task))
+        self._notify(old, task)
+        self._maybe_flush()
+
+    def remove(self, task_id: int) -> None:
+        """
+        Удаляет задачу по ID.
+        :param task_id: ID задачи.
+        """
+        self._own()
+        old = self._tasks.pop(task_id)
+        self._pending.append(("delete", task_id, None))
+        self._notify(old, None)
+        self._maybe_flush()
+
+    def apply(self, changes: List[Tuple[str, int, Optional[Task]]]) -> None:
+        """
+        Применяет группу изменений; запись в хранилище выполняется не более одного раза.
+        :param changes: тройки (вид изменения, ID, новая задача или None при удалении).
+        """
+        self._own()
+        for op, task_id, task in changes:
+            old = self._tasks.pop(task_id, None) if task is None else self._tasks.get(task_id)
+            if task is not None:
+                self._tasks[task_id] = task
+            self._notify(old, task)
+        self._pending.extend(changes)
+        self._maybe_flush()
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """
+        Заменяет все задачи; при сбросе хранилище будет перезаписано целиком.
+        :param tasks: новый список задач.
+        """
+        self._tasks = {task.id: task for task in tasks}
+        self._shared = False
+        self._loaded = True
+        self._pending = []
+        self._rewrite = True
+        self._rebuild()
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        """
+        Записывает накопленные изменения в хранилище одной операцией.
+        Если файл успел измениться извне, изменения сначала накладываются на его новую версию.
+        :raises StorageError: если файл задач поврежден.
+        """
+        if self.dirty:
+            with self.storage.locked():
+                if not self._rewrite and self.storage.signature() != self._signature:
+                    self._reload()
+                records, changes = self.detach_pending()
+                try:
+                    self.storage.save(records, changes)
+                except BaseException:
+                    self.finish_write(False)
+                    raise
+                self.finish_write(True)
+        self._last_flush = time.monotonic()
+
+    def detach_pending(self) -> Tuple[List[dict], Optional[List[Change]]]:
+        """
+        Забирает накопленные изменения для записи, которую вызывающий выполнит сам
+        (например, в другом потоке). До вызова finish_write() хранилище не перечитывается,
+        чтобы собственная незавершенная запись не была принята за изменение извне.
+        :return: все записи и список изменений (None — файл нужно перезаписать целиком).
+        """
+        records = [task.to_dict() for task in self._tasks.values()]
+        if self._rewrite:
+            changes = None
+        else:
+            changes = [Change(op, task_id, task.to_dict() if task is not None else None)
+                       for op, task_id, task in self._pending]
+        self._pending = []
+        self._rewrite = False
+        self._writing = True
+        return records, changes
+
+    def finish_write(self, saved: bool) -> None:
+        """
+        Завершает запись, начатую detach_pending().
+        :param saved: удалась ли запись; если нет, при следующем сбросе файл будет перезаписан целиком.
+        """
+        self._writing = False
+        if saved:
+            self._signature = self.storage.signature()
+        else:
+            self._rewrite = True
+
+    def discard_pending(self) -> None:
+        """
+        Отбрасывает изменения, которые не удалось записать: задачи будут перечитаны
+        из хранилища при следующем обращении, а слушатели — перестроены.
+        """
+        self._pending = []
+        self._rewrite = False
+        self._writing = False
+        self._loaded = False
+
+    def _notify(self, old: Optional[Task], new: Optional[Task]) -> None:
+        for listener in self._listeners:
+            listener.update(old, new)
+
+    def _rebuild(self) -> None:
+        for listener in self._listeners:
+            listener.rebuild(self._tasks.values())
+
+    def _maybe_flush(self) -> None:
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _reload(self) -> None:
+        """
+        Перечитывает хранилище и повторно применяет еще не записанные изменения (см. _replay_pending).
+        :raises StorageError: если файл задач поврежден.
+        :raises ConcurrentModificationError: если часть изменений пришлось отбросить.
+        """
+        signature = self.storage.signature()
+        try:
+            records = self.storage.load()
+        except FileNotFoundError:
+            records = []
+        except json.JSONDecodeError as error:
+            # Поврежденный файл не считается пустым: задачи не должны молча пропасть из вывода,
+            # а изменения — дописаться к нему. Ошибка повторяется, пока файл не исправят
+            raise StorageError(f"Файл {self.storage.file_path} поврежден: {error}") from error
+        self._tasks = {record["id"]: Task(**record) for record in records}
+        self._shared = False
+        conflicts = self._replay_pending()
+        self._signature = signature
+        self._loaded = True
+        self._rebuild()
+        if conflicts:
+            raise ConcurrentModificationError("Изменения не сохранены, файл изменен другим процессом: "
+                                              + "; ".join(conflicts))
+
+    def _replay_pending(self) -> List[str]:
+        """
+        Накладывает еще не записанные изменения на перечитанные задачи. ID для добавленных
+        задач выдавались по старой версии файла: если другой процесс успел занять такой ID,
+        задача получает новый ID (и последующие изменения ее следуют за ним), а не затирает чужую.
+        Отбрасываются добавленные задачи, чей заголовок тем временем занял другой процесс
+        (вместе со своими изменениями), и правки задач, которые другой процесс удалил:
+        иначе правка вернула бы удаленную задачу.
+        :return: описания отброшенных изменений.
+        """
+        titles = {task.title for task in self._tasks.values()}
+        next_id = max(self._tasks, default=0) + 1
+        remapped: Dict[int, Optional[int]] = {}
+        conflicts = []
+        pending = []
+        for op, task_id, task in self._pending:
+            if op == "add":
+                if task.title in titles:
+                    remapped[task_id] = None
+                    conflicts.append(f"заголовок «{task.title}» уже занят")
+                    continue
+                if task_id in self._tasks:
+                    remapped[task_id] = next_id
+                else:
+                    remapped.pop(task_id, None)
+                titles.add(task.title)
+            target = remapped.get(task_id, task_id)
+            if target is None:
+                continue
+            if op != "add" and target not in self._tasks:
+                if op == "edit":
+                    conflicts.append(f"задача {target} удалена")
+                continue
+            if target != task_id and task is not None:
+                task = Task(**dict(task.to_dict(), id=target))
+            if task is None:
+                self._tasks.pop(target, None)
+            else:
+                self._tasks[target] = task
+            next_id = max(next_id, target + 1)
+            pending.append((op, target, task))
+        self._pending = pending
+        return conflicts
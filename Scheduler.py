@@ -0,0 +1,178 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from Task import Task
+from TaskFields import Status
+
+
+COMPLETED = Status.COMPLETED.label
+
+
+class DeadlineScheduler:
+    """
+    Очередь сроков невыполненных задач: двоичная куча пар (день срока, ID) с ленивым удалением.
+    Правка или удаление задачи не ищет ее в куче, а только помечает старую запись устаревшей;
+    устаревшие записи пропускаются при обходе и выбрасываются при перестройке кучи.
+
+    Срок задачи — конец дня due_date. Работает как слушатель ResidentStore
+    (rebuild(tasks) и update(old, new)), поэтому следует за каждым изменением задач.
+    Задачи хранилища общие, поэтому наружу выдаются их копии.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int]] = []
+        self._live: Dict[int, Tuple[int, Task]] = {}
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self._live = {}
+        for task in tasks:
+            if task._status is not Status.COMPLETED:
+                self._live[task.id] = (task.due_date.toordinal(), task)
+        self._heap = [(day, task_id) for task_id, (day, _) in self._live.items()]
+        heapq.heapify(self._heap)
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        if new is None or new._status is Status.COMPLETED:
+            task_id = new.id if new is not None else old.id
+            self._live.pop(task_id, None)
+        else:
+            day = new.due_date.toordinal()
+            previous = self._live.get(new.id)
+            self._live[new.id] = (day, new)
+            if previous is None or previous[0] != day:
+                heapq.heappush(self._heap, (day, new.id))
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self.rebuild(task for _, task in self._live.values())
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def _ascending(self) -> Iterator[Task]:
+        """
+        Перебирает задачи по возрастанию срока, не разрушая кучу: обход идет по вспомогательной
+        куче индексов, поэтому первые k задач стоят O(k log k), а не O(N).
+        """
+        heap = self._heap
+        # Устаревшие записи на вершине выбрасываются сразу
+        while heap and self._live.get(heap[0][1], (None,))[0] != heap[0][0]:
+            heapq.heappop(heap)
+        frontier = [(heap[0], 0)] if heap else []
+        seen: Set[int] = set()
+        while frontier:
+            (day, task_id), position = heapq.heappop(frontier)
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            live = self._live.get(task_id)
+            if live is not None and live[0] == day and task_id not in seen:
+                seen.add(task_id)
+                yield live[1]
+
+    def next_due(self, k: int = 1) -> List[Task]:
+        """
+        :param k: число задач.
+        :return: k невыполненных задач с ближайшими сроками, включая просроченные.
+        """
+        result = []
+        for task in self._ascending():
+            if len(result) >= k:
+                break
+            result.append(task.copy())
+        return result
+
+    def due_before(self, moment: datetime) -> List[Task]:
+        """
+        :param moment: момент времени.
+        :return: невыполненные задачи, срок которых истекает не позже moment, по возрастанию срока.
+        """
+        result = []
+        for task in self._ascending():
+            if task.due_date + timedelta(days=1) > moment:
+                break
+            result.append(task.copy())
+        return result
+
+    def overdue(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        :param now: текущий момент (по умолчанию datetime.now()).
+        :return: просроченные невыполненные задачи, самые давние первыми.
+        """
+        return self.due_before(now or datetime.now())
+
+    def due_within(self, hours: float, now: Optional[datetime] = None) -> List[Task]:
+        """
+        :param hours: длина окна в часах.
+        :param now: текущий момент (по умолчанию datetime.now()).
+        :return: невыполненные задачи, срок которых истекает в ближайшие hours часов (без просроченных).
+        """
+        now = now or datetime.now()
+        return [task for task in self.due_before(now + timedelta(hours=hours))
+                if task.due_date + timedelta(days=1) > now]
+
+
+class ReminderLoop:
+    """
+    Периодически вызывает callback(task) для задач, срок которых истекает в ближайшие lead
+    (в том числе уже просроченных). Каждая задача напоминается один раз на свой срок.
+    Цикл работает в фоновом потоке; TaskManager не потокобезопасен, поэтому при фоновом
+    запуске менеджер не должен одновременно использоваться из других потоков —
+    иначе вызывайте check() из своего цикла.
+    """
+
+    def __init__(self, scheduler: Callable[[], DeadlineScheduler], callback: Callable[[Task], None],
+                 lead: timedelta = timedelta(hours=24), interval: float = 60.0,
+                 clock: Callable[[], datetime] = datetime.now) -> None:
+        """
+        :param scheduler: функция, возвращающая актуальный DeadlineScheduler (например, TaskManager.scheduler).
+        :param callback: функция, вызываемая для каждой задачи.
+        :param lead: за сколько до срока напоминать.
+        :param interval: период проверки в секундах.
+        :param clock: источник текущего времени.
+        """
+        self.scheduler = scheduler
+        self.callback = callback
+        self.lead = lead
+        self.interval = interval
+        self.clock = clock
+        self._notified: Set[Tuple[int, datetime]] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> List[Task]:
+        """
+        Выполняет одну проверку.
+        :return: задачи, о которых напомнили в этот раз.
+        """
+        due = self.scheduler().due_before(self.clock() + self.lead)
+        keys = {(task.id, task.due_date) for task in due}
+        reminded = [task for task in due if (task.id, task.due_date) not in self._notified]
+        # Забываем задачи, которые выполнены, удалены или перенесены, чтобы напомнить о новом сроке
+        self._notified = keys
+        for task in reminded:
+            self.callback(task)
+        return reminded
+
+    def start(self) -> None:
+        """
+        Запускает проверки в фоновом потоке.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="task-reminders", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Останавливает фоновые проверки.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self.check()
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,352 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from Task import Task
+from Storage import TaskStorage, atomic_write
+from FileLock import FileLock
+from TaskManager import TaskManager
+
+
+SHARD_BY = ("category", "id")
+TITLE_STRIPES = 64
+
+
+class IdAllocator:
+    """
+    Глобальный счетчик ID для всех шардов: следующий свободный ID хранится в отдельном
+    маленьком файле и выдается под блокировкой, поэтому процессы не получат одинаковых ID.
+    """
+
+    def __init__(self, path: str, initial: Callable[[], int], lock_timeout: float = 10.0) -> None:
+        """
+        :param path: путь к файлу счетчика.
+        :param initial: функция, вычисляющая первый свободный ID, если файла счетчика еще нет.
+        :param lock_timeout: максимальное время ожидания блокировки в секундах.
+        """
+        self.path = path
+        self.initial = initial
+        self.lock = FileLock(path + ".lock", lock_timeout)
+
+    def allocate(self, count: int = 1) -> List[int]:
+        """
+        :param count: сколько ID выдать.
+        :return: подряд идущие новые ID.
+        """
+        with self.lock.exclusive():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    next_id = int(file.read())
+            except (FileNotFoundError, ValueError):
+                next_id = self.initial()
+            atomic_write(self.path, lambda file: file.write(str(next_id + count)))
+        return list(range(next_id, next_id + count))
+
+    def close(self) -> None:
+        self.lock.close()
+
+
+class ShardedTaskManager:
+    """
+    Задачи, разделенные на шарды — отдельные файлы в каталоге directory, каждый со своим
+    TaskManager и своей блокировкой. Шард выбирается по категории (тогда просмотр одной
+    категории читает один файл) или по хешу ID. Изменения разных шардов не ждут друг друга,
+    а запросы ко всем шардам выполняются параллельно в пуле потоков.
+
+    ID выдает общий IdAllocator. Уникальность заголовков между шардами обеспечивается
+    блокировками по полосам хеша заголовка: добавления с разными заголовками почти
+    никогда не конкурируют, а с одинаковым — проверяются строго по очереди.
+    """
+
+    def __init__(self, directory: str, shard_by: str = "category", shards: int = 8,
+                 resident: bool = False, storage: Optional[Callable[[str], TaskStorage]] = None,
+                 workers: Optional[int] = None) -> None:
+        """
+        :param directory: каталог шардов.
+        :param shard_by: "category" — шард на категорию, "id" — shards шардов по хешу ID.
+        :param shards: число шардов при shard_by="id".
+        :param resident: держать ли задачи шардов в памяти (см. TaskManager).
+        :param storage: функция, создающая хранилище шарда по пути к файлу; по умолчанию JSON-файл.
+        :param workers: число потоков для запросов ко всем шардам.
+        :raises ValueError: если каталог уже разбит на шарды иначе.
+        """
+        if shard_by not in SHARD_BY:
+            raise ValueError(f"Неизвестный способ разбиения: {shard_by}")
+        self.directory = directory
+        self.resident = resident
+        self._storage_factory = storage
+        os.makedirs(directory, exist_ok=True)
+        self.shard_by, self.shards = self._load_layout(shard_by, shards)
+        self.allocator = IdAllocator(os.path.join(directory, "next_id"), self._max_id_plus_one)
+        self._managers: Dict[str, TaskManager] = {}
+        self._shard_locks: Dict[str, threading.RLock] = {}
+        self._registry_lock = threading.Lock()
+        self._title_locks = [FileLock(os.path.join(directory, f"titles-{stripe}.lock"))
+                             for stripe in range(TITLE_STRIPES)]
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task-shard")
+
+    def _load_layout(self, shard_by: str, shards: int) -> Tuple[str, int]:
+        path = os.path.join(self.directory, "sharding.json")
+        layout = {"shard_by": shard_by, "shards": shards if shard_by == "id" else None}
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                stored = json.load(file)
+        except FileNotFoundError:
+            atomic_write(path, lambda file: json.dump(layout, file))
+            return shard_by, shards
+        if stored != layout:
+            raise ValueError(f"Каталог {self.directory} уже разбит на шарды иначе: {stored}")
+        return stored["shard_by"], stored["shards"]
+
+    # Шарды
+
+    def shard_key(self, task_id: Optional[int] = None, category: Optional[str] = None) -> str:
+        """
+        :return: имя шарда для задачи с данным ID (разбиение по ID) или категорией (по категории).
+        """
+        if self.shard_by == "id":
+            return f"id-{task_id % self.shards}"
+        return "category-" + hashlib.sha1(category.encode('utf-8')).hexdigest()[:16]
+
+    def _shard(self, key: str) -> Tuple[TaskManager, threading.RLock]:
+        with self._registry_lock:
+            manager = self._managers.get(key)
+            if manager is None:
+                file_path = os.path.join(self.directory, key + ".json")
+                storage = self._storage_factory(file_path) if self._storage_factory is not None else None
+                manager = TaskManager(file_path, storage=storage, resident=self.resident)
+                self._managers[key] = manager
+                self._shard_locks[key] = threading.RLock()
+            return manager, self._shard_locks[key]
+
+    def shard_keys(self) -> List[str]:
+        """
+        :return: имена всех существующих шардов.
+        """
+        if self.shard_by == "id":
+            return [f"id-{index}" for index in range(self.shards)]
+        names = sorted(name[:-len(".json")] for name in os.listdir(self.directory)
+                       if name.startswith("category-") and name.endswith(".json"))
+        with self._registry_lock:
+            return sorted(set(names) | set(self._managers))
+
+    def _fan_out(self, call: Callable[[TaskManager], Any], keys: Optional[List[str]] = None) -> List[Any]:
+        """
+        Выполняет call над каждым шардом в пуле потоков.
+        :return: результаты в порядке шардов.
+        """
+        def run(key: str) -> Any:
+            manager, lock = self._shard(key)
+            with lock:
+                return call(manager)
+        return list(self._pool.map(run, self.shard_keys() if keys is None else keys))
+
+    def _locate(self, task_id: int) -> Optional[Tuple[str, Task]]:
+        """
+        :return: шард и задача с данным ID или None.
+        """
+        if self.shard_by == "id":
+            keys = [self.shard_key(task_id)]
+        else:
+            keys = self.shard_keys()
+        for key, task in zip(keys, self._fan_out(lambda manager: manager.find_task_by_id(task_id), keys)):
+            if task is not None:
+                return key, task
+        return None
+
+    def _title_lock(self, titles: Iterable[str]) -> ExitStack:
+        """
+        Захватывает полосы блокировок для заголовков; полосы берутся по возрастанию номера,
+        чтобы одновременные добавления не заблокировали друг друга.
+        """
+        with ExitStack() as stack:
+            for stripe in sorted({zlib.crc32(title.encode('utf-8')) % TITLE_STRIPES for title in titles}):
+                stack.enter_context(self._title_locks[stripe].exclusive())
+            # pop_all передает захваченные полосы вызывающему; если захват не удался, with освободит уже взятые
+            return stack.pop_all()
+
+    def _title_owner(self, title: str) -> Optional[int]:
+        """
+        :return: ID задачи с данным заголовком в любом шарде или None.
+        """
+        for task in self._fan_out(lambda manager: manager.query().where(title=title).first()):
+            if task is not None:
+                return task.id
+        return None
+
+    def _max_id_plus_one(self) -> int:
+        ids = [task.id for tasks in self._fan_out(lambda manager: manager.load_tasks()) for task in tasks]
+        return max(ids) + 1 if ids else 1
+
+    def _insert(self, tasks: List[Task]) -> None:
+        """
+        Записывает задачи с уже выданными ID: по одной транзакции на шард, шарды — параллельно.
+        """
+        groups: Dict[str, List[Task]] = {}
+        for task in tasks:
+            groups.setdefault(self.shard_key(task.id, task.category), []).append(task)
+
+        def write(key: str) -> None:
+            manager, lock = self._shard(key)
+            with lock, manager.transaction() as batch:
+                for task in groups[key]:
+                    batch.insert(task)
+        list(self._pool.map(write, groups))
+
+    # Операции TaskManager
+
+    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> None:
+        """
+        Добавляет новую задачу в шард ее категории (или ID).
+        """
+        if not all([title, description, category, due_date, priority]):
+            print("Ошибка: все поля задачи должны быть заполнены.")
+            return
+        with self._title_lock([title]):
+            if self._title_owner(title) is not None:
+                print("Ошибка: задача с таким заголовком уже существует.")
+                return
+            task = Task(0, title, description, category, due_date, priority)
+            task.id = self.allocator.allocate()[0]
+            self._insert([task])
+
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Добавляет несколько задач; в каждый шард — одной транзакцией.
+        :return: ID добавленных задач.
+        :raises ValueError: если какая-либо задача не проходит проверку; тогда не добавляется ни одна.
+        """
+        tasks = list(tasks)
+        for task in tasks:
+            if not all(task.get(field) for field in ("title", "description", "category", "due_date", "priority")):
+                raise ValueError("Ошибка: все поля задачи должны быть заполнены.")
+        titles = [task["title"] for task in tasks]
+        with self._title_lock(titles):
+            if len(set(titles)) != len(titles) or any(self._title_owner(title) is not None for title in titles):
+                raise ValueError("Ошибка: задача с таким заголовком уже существует.")
+            built = [Task(0, **task) for task in tasks]
+            for task, task_id in zip(built, self.allocator.allocate(len(built)) if built else []):
+                task.id = task_id
+            self._insert(built)
+        return [task.id for task in built]
+
+    def find_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        :return: задача с данным ID или None.
+        """
+        located = self._locate(task_id)
+        return located[1] if located is not None else None
+
+    def delete_task(self, task_id: int) -> None:
+        """
+        Удаляет задачу по ID.
+        """
+        located = self._locate(task_id)
+        if located is None:
+            print(f"Задача с ID {task_id} не найдена.")
+            return
+        manager, lock = self._shard(located[0])
+        with lock:
+            manager.delete_task(task_id)
+
+    def edit_task(self, task_id: int, **kwargs: Any) -> None:
+        """
+        Редактирует задачу. Смена категории при разбиении по категориям переносит задачу
+        в другой шард: сначала она записывается в новый шард, потом удаляется из старого.
+        """
+        located = self._locate(task_id)
+        if located is None:
+            print(f"Задача с ID {task_id} не найдена.")
+            return
+        key, task = located
+        edited = TaskManager._edited_copy(task, kwargs)
+        new_key = self.shard_key(task_id, edited.category)
+        titles = [edited.title] if edited.title != task.title else []
+        with self._title_lock(titles):
+            if titles and self._title_owner(edited.title) not in (None, task_id):
+                print("Ошибка: задача с таким заголовком уже существует.")
+                return
+            manager, lock = self._shard(key)
+            if new_key == key:
+                with lock:
+                    manager.edit_task(task_id, **kwargs)
+                return
+            self._insert([edited])
+            with lock:
+                manager.delete_task(task_id)
+
+    def mark_task_as_completed(self, task_id: int) -> None:
+        """
+        Отмечает задачу как выполненную.
+        :raises ValueError: если задача не найдена.
+        """
+        located = self._locate(task_id)
+        if located is None:
+            raise ValueError("Задача не найдена")
+        manager, lock = self._shard(located[0])
+        with lock:
+            manager.mark_task_as_completed(task_id)
+
+    def load_tasks(self) -> List[Task]:
+        """
+        :return: задачи всех шардов, упорядоченные по ID.
+        """
+        return sorted((task for tasks in self._fan_out(lambda manager: manager.load_tasks()) for task in tasks),
+                      key=lambda task: task.id)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Лениво перебирает задачи шард за шардом, не загружая их все в память.
+        """
+        for key in self.shard_keys():
+            yield from self._shard(key)[0].iter_tasks()
+
+    def view_tasks(self, category: Optional[str] = None) -> List[Task]:
+        """
+        :param category: категория; при разбиении по категориям читается только ее шард.
+        :return: задачи, упорядоченные по ID.
+        """
+        if category and self.shard_by == "category":
+            key = self.shard_key(category=category)
+            if key not in self.shard_keys():
+                return []
+            return self._fan_out(lambda manager: manager.view_tasks(category), [key])[0]
+        return sorted((task for tasks in self._fan_out(lambda manager: manager.view_tasks(category))
+                       for task in tasks), key=lambda task: task.id)
+
+    def search_tasks(self, keyword: Optional[str] = None, category: Optional[str] = None,
+                     status: Optional[str] = None) -> List[Task]:
+        """
+        Ищет задачи по критериям во всех подходящих шардах параллельно.
+        :return: найденные задачи, упорядоченные по ID.
+        """
+        keys = None
+        if category and self.shard_by == "category":
+            key = self.shard_key(category=category)
+            keys = [key] if key in self.shard_keys() else []
+        results = self._fan_out(lambda manager: manager.search_tasks(keyword, category, status), keys)
+        return sorted((task for tasks in results for task in tasks), key=lambda task: task.id)
+
+    def flush(self) -> None:
+        self._fan_out(lambda manager: manager.flush(), list(self._managers))
+
+    def close(self) -> None:
+        """
+        Записывает отложенные изменения и закрывает все шарды.
+        """
+        for manager in self._managers.values():
+            manager.close()
+        for lock in self._title_locks:
+            lock.close()
+        self.allocator.close()
+        self._pool.shutdown()
+
+    def __enter__(self) -> "ShardedTaskManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,64 @@
+from typing import Dict, Iterator, List, Optional
+from Task import Task
+from Query import Query
+
+
+class Snapshot:
+    """
+    Неизменяемый срез задач на момент записи ленты изменений с номером seq.
+    Читатель снимка видит согласованное состояние, пока писатели продолжают работу;
+    изменения после снимка получаются через TaskManager.changes_since(snapshot.seq).
+    Объекты Task снимка общие с хранилищем, поэтому наружу выдаются их копии: правка
+    полученной задачи не меняет ни снимок, ни хранилище.
+    """
+
+    def __init__(self, tasks: Dict[int, Task], seq: int) -> None:
+        """
+        :param tasks: задачи по ID; словарь больше не должен изменяться.
+        :param seq: номер последней записи ленты изменений, вошедшей в снимок.
+        """
+        self._tasks = tasks
+        self.seq = seq
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return map(Task.copy, self._tasks.values())
+
+    def load_tasks(self) -> List[Task]:
+        """
+        :return: все задачи снимка.
+        """
+        return [task.copy() for task in self._tasks.values()]
+
+    def find_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        :param task_id: ID задачи.
+        :return: задача или None.
+        """
+        task = self._tasks.get(task_id)
+        return task.copy() if task is not None else None
+
+    def view_tasks(self, category: Optional[str] = None) -> List[Task]:
+        """
+        :param category: категория для фильтрации.
+        :return: список задач.
+        """
+        return self.query().where(category=category or None).all()
+
+    def search_tasks(self, keyword: Optional[str] = None,
+                     category: Optional[str] = None,
+                     status: Optional[str] = None) -> List[Task]:
+        """
+        Ищет задачи снимка по тем же критериям, что и TaskManager.search_tasks.
+        :return: список найденных задач.
+        """
+        return self.query().where(keyword=keyword or None, category=category or None,
+                                  status=status or None).all()
+
+    def query(self) -> Query:
+        """
+        :return: запрос к задачам снимка (полный перебор, без индексов).
+        """
+        return Query(tasks=lambda: self._tasks)
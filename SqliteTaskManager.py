@@ -0,0 +1,227 @@
+import argparse
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+from Task import Task
+from TaskFields import status_key, status_label, validate_changes
+
+
+FIELDS = ("id", "title", "description", "category", "due_date", "priority", "status")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_title ON tasks (title);
+CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+"""
+
+# Запросы — постоянные строки с параметрами, поэтому sqlite3 готовит их один раз
+# и дальше берет из кэша подготовленных выражений соединения.
+_SELECT = "SELECT id, title, description, category, due_date, priority, status FROM tasks"
+_INSERT = "INSERT INTO tasks (id, title, description, category, due_date, priority, status) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_UPDATE = "UPDATE tasks SET id = ?, title = ?, description = ?, category = ?, due_date = ?, priority = ?, status = ? WHERE id = ?"
+
+
+class SqliteTaskManager:
+    """
+    TaskManager, хранящий задачи в базе SQLite (режим WAL) с индексами по
+    id, title, category, status и due_date. Методы повторяют интерфейс TaskManager,
+    фильтры поиска выполняются самой базой.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Открывает базу задач, создавая схему при необходимости.
+        :param db_path: путь к файлу базы SQLite.
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # Встроенная lower() в SQLite понимает только ASCII, для кириллицы нужна питоновская
+        self.connection.create_function("py_lower", 1, lambda text: text.lower() if text is not None else None,
+                                        deterministic=True)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """
+        Закрывает соединение с базой.
+        """
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteTaskManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        return Task(**dict(zip(FIELDS, row)))
+
+    @staticmethod
+    def _task_to_row(task: Task) -> tuple:
+        record = task.to_dict()
+        return tuple(record[field] for field in FIELDS)
+
+    def load_tasks(self) -> List[Task]:
+        """
+        Загружает все задачи.
+        :return: список задач.
+        """
+        return [self._row_to_task(row) for row in self.connection.execute(_SELECT + " ORDER BY id")]
+
+    def save_tasks(self, tasks: List[Task]) -> None:
+        """
+        Заменяет все задачи в базе одной транзакцией.
+        :param tasks: список задач.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(_INSERT, (self._task_to_row(task) for task in tasks))
+
+    def find_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        Ищет задачу по ID.
+        :param task_id: ID задачи.
+        :return: Найденная задача или None.
+        """
+        row = self.connection.execute(_SELECT + " WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> None:
+        """
+        Добавляет новую задачу.
+        :param title: заголовок задачи.
+        :param description: описание задачи.
+        :param category: категория задачи.
+        :param due_date: дата выполнения задачи.
+        :param priority: приоритет задачи.
+        """
+        if not all([title, description, category, due_date, priority]):
+            print("Ошибка: все поля задачи должны быть заполнены.")
+            return
+
+        with self.connection:
+            # BEGIN IMMEDIATE сразу берет блокировку записи: проверка заголовка и выдача ID атомарны
+            self.connection.execute("BEGIN IMMEDIATE")
+            if self.connection.execute("SELECT 1 FROM tasks WHERE title = ?", (title,)).fetchone():
+                print("Ошибка: задача с таким заголовком уже существует.")
+                return
+            new_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0]
+            new_task = Task(id=new_id, title=title, description=description, category=category, due_date=due_date, priority=priority)
+            self.connection.execute(_INSERT, self._task_to_row(new_task))
+
+    def delete_task(self, task_id: int) -> None:
+        """
+        Удаляет задачу по ID.
+        :param task_id: ID задачи.
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        if cursor.rowcount == 0:
+            print(f"Задача с ID {task_id} не найдена.")
+
+    def edit_task(self, task_id: int, **kwargs: Dict[str, Any]) -> None:
+        """
+        Редактирует задачу по ее ID.
+        :param task_id: ID задачи.
+        :param kwargs: новые значения полей задачи.
+        :raises ValueError: если новые значения неверны.
+        """
+        validate_changes(kwargs)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(_SELECT + " WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                print(f"Задача с ID {task_id} не найдена.")
+                return
+            task = self._row_to_task(row)
+            for key, value in kwargs.items():
+                if hasattr(task, key):
+                    setattr(task, key, value)
+            self.connection.execute(_UPDATE, self._task_to_row(task) + (task_id,))
+
+    def search_tasks(self, keyword: Optional[str] = None,
+                     category: Optional[str] = None,
+                     status: Optional[str] = None) -> List[Task]:
+        """
+        Ищет задачи по критериям; все условия проверяются в SQL.
+        :param keyword: ключевое слово для поиска.
+        :param category: категория для поиска.
+        :param status: статус для поиска.
+        :return: список найденных задач.
+        """
+        conditions = []
+        params: List[Any] = []
+        if keyword:
+            conditions.append("(instr(py_lower(title), ?) > 0 OR instr(py_lower(description), ?) > 0)")
+            params += [keyword.lower(), keyword.lower()]
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if status:
+            # В таблицу пишутся только канонические подписи статуса (см. Task.status)
+            wanted = status_key(status)
+            if wanted is None:
+                return []
+            conditions.append("status = ?")
+            params.append(status_label(wanted))
+        query = _SELECT + (" WHERE " + " AND ".join(conditions) if conditions else "") + " ORDER BY id"
+        return [self._row_to_task(row) for row in self.connection.execute(query, params)]
+
+    def view_tasks(self, category: Optional[str] = None) -> List[Task]:
+        """
+        Показывает список задач.
+        :param category: категория для фильтрации.
+        :return: список задач.
+        """
+        return self.search_tasks(category=category)
+
+    def mark_task_as_completed(self, task_id: int):
+        """
+        Отмечает задачу как выполненную.
+        :param task_id: ID задачи.
+        :raises ValueError: если задача не найдена.
+        """
+        with self.connection:
+            cursor = self.connection.execute("UPDATE tasks SET status = ? WHERE id = ?", ('Выполнена', task_id))
+        if cursor.rowcount == 0:
+            raise ValueError("Задача не найдена")
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """
+    Переносит задачи из файла формата tasks.json в базу SQLite, заменяя ее содержимое.
+    :param json_path: путь к JSON-файлу задач.
+    :param db_path: путь к базе SQLite.
+    :return: число перенесенных задач.
+    """
+    with open(json_path, 'r', encoding='utf-8') as file:
+        tasks = [Task(**task) for task in json.load(file)]
+    with SqliteTaskManager(db_path) as manager:
+        manager.save_tasks(tasks)
+    return len(tasks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Перенос задач из tasks.json в базу SQLite.")
+    parser.add_argument("json_path", help="путь к JSON-файлу задач")
+    parser.add_argument("db_path", help="путь к базе SQLite")
+    args = parser.parse_args()
+    count = migrate_json_to_sqlite(args.json_path, args.db_path)
+    print(f"Перенесено задач: {count}")
+
+
+if __name__ == "__main__":
+    main()
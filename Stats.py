@@ -0,0 +1,144 @@
+import bisect
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from Task import Task
+from Scheduler import COMPLETED
+from TaskFields import Status, status_key, status_label
+
+
+# Ключ счетчика: (категория, статус, приоритет)
+Key = Tuple[str, str, str]
+GROUP_FIELDS = ("category", "status", "priority")
+
+
+class StatsReport:
+    """
+    Снимок статистики задач: число задач по сочетаниям категории, статуса и приоритета,
+    доля выполненных и число просроченных.
+    """
+
+    def __init__(self, counts: Dict[Key, int], overdue: int) -> None:
+        """
+        :param counts: число задач по ключу (категория, статус, приоритет).
+        :param overdue: число невыполненных задач с истекшим сроком.
+        """
+        self.counts = counts
+        self.overdue = overdue
+        self.total = sum(counts.values())
+        self.completed = sum(count for (_, status, _), count in counts.items() if status == COMPLETED)
+
+    @property
+    def completion_rate(self) -> float:
+        """
+        Доля выполненных задач (0.0, если задач нет).
+        """
+        return self.completed / self.total if self.total else 0.0
+
+    def count(self, category: Optional[str] = None, status: Optional[str] = None,
+              priority: Optional[str] = None) -> int:
+        """
+        :return: число задач с указанными значениями полей (None — любое значение).
+        """
+        wanted = (category, status, priority)
+        return sum(count for key, count in self.counts.items()
+                   if all(value is None or value == actual for value, actual in zip(wanted, key)))
+
+    def by(self, *fields: str) -> Dict[Any, int]:
+        """
+        Группирует счетчики по части полей, например by("category") или by("category", "status").
+        :param fields: поля из category, status, priority.
+        :return: число задач по значению поля (или по кортежу значений для нескольких полей).
+        :raises ValueError: при неизвестном поле.
+        """
+        for field in fields:
+            if field not in GROUP_FIELDS:
+                raise ValueError(f"Неизвестное поле группировки: {field}")
+        positions = [GROUP_FIELDS.index(field) for field in fields]
+        grouped: Counter = Counter()
+        for key, count in self.counts.items():
+            group = tuple(key[position] for position in positions)
+            grouped[group[0] if len(group) == 1 else group] += count
+        return dict(grouped)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "completion_rate": round(self.completion_rate, 4),
+            "overdue": self.overdue,
+            "by_category": self.by("category"),
+            "by_status": self.by("status"),
+            "by_priority": self.by("priority"),
+        }
+
+
+class TaskStats:
+    """
+    Материализованные счетчики задач. Работает как слушатель ResidentStore
+    (rebuild(tasks) и update(old, new)): каждое изменение задачи меняет счетчики за O(1),
+    а сроки невыполненных задач хранятся отсортированными, поэтому число просроченных
+    на любой момент считается двоичным поиском.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+        self._open_days: List[int] = []
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self._counts = Counter()
+        self._open_days = []
+        for task in tasks:
+            self._counts[(task.category, task.status, task.priority)] += 1
+            if task._status is not Status.COMPLETED:
+                self._open_days.append(task._due_ordinal)
+        self._open_days.sort()
+
+    def update(self, old: Optional[Task], new: Optional[Task]) -> None:
+        if old is not None:
+            self._remove((old.category, old.status, old.priority), old._due_ordinal)
+        if new is not None:
+            self._add((new.category, new.status, new.priority), new._due_ordinal)
+
+    def rebuild_records(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Строит счетчики по словарям задач, не создавая объекты Task.
+        :param records: записи хранилища.
+        """
+        self._counts = Counter()
+        self._open_days = []
+        for record in records:
+            # Старые подписи статуса («выполнено») считаются вместе с каноническими
+            status = status_key(record["status"])
+            self._counts[(record["category"], status_label(status), record["priority"])] += 1
+            if status is not Status.COMPLETED:
+                try:
+                    day = date.fromisoformat(record["due_date"]).toordinal()
+                except ValueError:
+                    day = Task(**record)._due_ordinal
+                self._open_days.append(day)
+        self._open_days.sort()
+
+    def _add(self, key: Key, day: int) -> None:
+        self._counts[key] += 1
+        if key[1] != COMPLETED:
+            bisect.insort(self._open_days, day)
+
+    def _remove(self, key: Key, day: int) -> None:
+        self._counts[key] -= 1
+        if not self._counts[key]:
+            del self._counts[key]
+        if key[1] != COMPLETED:
+            position = bisect.bisect_left(self._open_days, day)
+            if position < len(self._open_days) and self._open_days[position] == day:
+                del self._open_days[position]
+
+    def report(self, now: Optional[datetime] = None) -> StatsReport:
+        """
+        :param now: момент, на который считаются просроченные задачи (по умолчанию datetime.now()).
+        :return: снимок статистики; его стоимость зависит от числа сочетаний полей, а не от числа задач.
+        """
+        now = now or datetime.now()
+        # Срок — конец дня due_date, поэтому просрочены задачи со сроком раньше сегодняшнего дня
+        overdue = bisect.bisect_left(self._open_days, now.toordinal())
+        return StatsReport(dict(self._counts), overdue)
@@ -0,0 +1,378 @@
+import json
+import os
+import stat
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from JsonStream import iter_json_array
+from FileLock import FileLock
+from Metrics import enabled, increment, timed
+
+
+Change = namedtuple("Change", ["op", "task_id", "record"])
+Change.__doc__ = """
+Одно изменение задачи: op — "add", "edit" или "delete";
+record — полный словарь задачи (None для удаления).
+"""
+
+
+class StorageError(Exception):
+    """
+    Ошибка хранилища задач.
+    """
+
+
+class ConcurrentModificationError(StorageError):
+    """
+    Файл задач изменился с момента чтения: запись отменена, чтобы не потерять чужие изменения.
+    """
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, ...]]:
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+def atomic_write(path: str, write: Callable[[Any], None], fsync: bool = True, binary: bool = False) -> None:
+    """
+    Записывает файл атомарно: данные пишутся во временный файл рядом с path,
+    сбрасываются на диск и подменяют path через os.replace. Читатели видят
+    либо старое, либо новое содержимое, но никогда не обрезанное.
+    :param path: путь к файлу.
+    :param write: функция, записывающая содержимое в открытый файл.
+    :param fsync: сбрасывать ли данные и каталог на диск.
+    :param binary: открыть файл в двоичном режиме вместо текстового UTF-8.
+    """
+    import tempfile  # импорт отложен: модуль нужен только при записи, а не при запуске
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as file:
+            with timed("taskmanager_phase_seconds", phase="serialize"):
+                write(file)
+                file.flush()
+            if enabled():
+                increment("taskmanager_bytes_written_total", os.fstat(file.fileno()).st_size)
+            if fsync:
+                with timed("taskmanager_phase_seconds", phase="fsync"):
+                    os.fsync(file.fileno())
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class TaskStorage:
+    """
+    Базовый класс хранилища задач. TaskManager работает с задачами
+    как со списком словарей и передает хранилищу как итоговый список,
+    так и сами изменения, чтобы хранилище могло выбрать способ записи.
+
+    Запись выполняется под исключительной блокировкой file_path + ".lock";
+    locked() позволяет удержать ее на весь цикл чтение-изменение-запись.
+    """
+
+    # Записывает ли хранилище только переданные изменения (а не весь список задач)
+    incremental = False
+
+    def __init__(self, file_path: str, lock_timeout: float = 10.0) -> None:
+        """
+        :param file_path: путь к основному файлу задач.
+        :param lock_timeout: максимальное время ожидания блокировки в секундах.
+        """
+        self.file_path = file_path
+        self.lock = FileLock(file_path + ".lock", lock_timeout)
+
+    def ensure_exists(self) -> None:
+        """
+        Создает пустой файл задач, если он не существует.
+        """
+        if not os.path.exists(self.file_path):
+            with open(self.file_path, 'w', encoding='utf-8') as file:
+                json.dump([], file)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Загружает все записи задач.
+        :return: список словарей задач.
+        :raises FileNotFoundError, json.JSONDecodeError: если данные недоступны или повреждены.
+        """
+        raise NotImplementedError
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебирает записи задач по одной; хранилища, умеющие читать потоково,
+        не держат в памяти все записи сразу.
+        :return: итератор словарей задач.
+        :raises FileNotFoundError, json.JSONDecodeError: если данные недоступны или повреждены.
+        """
+        yield from self.load()
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Ищет одну задачу по ID; по умолчанию — потоковым перебором до первого совпадения.
+        :param task_id: ID задачи.
+        :return: словарь задачи или None.
+        :raises FileNotFoundError, json.JSONDecodeError: если данные недоступны или повреждены.
+        """
+        return next((record for record in self.iter_records() if record["id"] == task_id), None)
+
+    def save(self, records: List[Dict[str, Any]], changes: Optional[Iterable[Change]] = None,
+             expected_version: Optional[Any] = None) -> None:
+        """
+        Сохраняет задачи.
+        :param records: полный список задач после изменения.
+        :param changes: изменения, приведшие к records; None означает полную перезапись.
+        :param expected_version: отпечаток signature(), полученный при чтении; если файл
+                                 с тех пор изменился, запись не выполняется.
+        :raises ConcurrentModificationError: если версия не совпала.
+        :raises LockTimeout: если не удалось получить блокировку.
+        """
+        raise NotImplementedError
+
+    def locked(self):
+        """
+        Исключительная блокировка хранилища для цикла чтение-изменение-запись.
+        :return: контекстный менеджер.
+        """
+        return self.lock.exclusive()
+
+    def _check_version(self, expected_version: Optional[Any]) -> None:
+        if expected_version is not None and self.signature() != expected_version:
+            raise ConcurrentModificationError(f"Файл {self.file_path} был изменен другим процессом")
+
+    def signature(self) -> Optional[Tuple[int, ...]]:
+        """
+        Возвращает дешевый отпечаток состояния файла (mtime, размер, inode),
+        по которому можно заметить изменения, сделанные другими процессами.
+        :return: кортеж отпечатка или None, если файла нет.
+        """
+        return _stat_signature(self.file_path)
+
+    def close(self) -> None:
+        """
+        Освобождает ресурсы хранилища.
+        """
+        self.lock.close()
+
+
+class JsonFileStorage(TaskStorage):
+    """
+    Хранилище в виде одного JSON-массива; каждое сохранение атомарно заменяет файл целиком.
+    С cache=True разобранные записи хранятся рядом в RecordCache, и load() не разбирает
+    JSON, пока файл не изменит кто-то, кроме этого хранилища.
+    """
+
+    def __init__(self, file_path: str, lock_timeout: float = 10.0, fsync: bool = True,
+                 cache: bool = False) -> None:
+        """
+        :param file_path: путь к файлу задач.
+        :param lock_timeout: максимальное время ожидания блокировки в секундах.
+        :param fsync: сбрасывать ли файл на диск при каждой записи.
+        :param cache: хранить ли разобранные записи в file_path + ".cache".
+        """
+        super().__init__(file_path, lock_timeout)
+        self.fsync = fsync
+        self.cache = None
+        if cache:
+            from RecordCache import RecordCache  # RecordCache сам импортирует Storage
+            self.cache = RecordCache(file_path)
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self.lock.shared():
+            if self.cache is not None:
+                records = self.cache.load()
+                if records is not None:
+                    return records
+                signature = self.signature()
+            with open(self.file_path, 'rb') as file:
+                data = file.read()
+            with timed("taskmanager_phase_seconds", phase="json_load"):
+                records = json.loads(data)
+            if enabled():
+                increment("taskmanager_bytes_read_total", len(data))
+                increment("taskmanager_records_scanned_total", len(records))
+            if self.cache is not None:
+                from RecordCache import digest
+                self.cache.store(records, signature, digest(data))
+            return records
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        # Файл заменяется атомарно, поэтому открытый на чтение файл всегда целый и блокировка не нужна
+        return iter_json_array(self.file_path)
+
+    def save(self, records: List[Dict[str, Any]], changes: Optional[Iterable[Change]] = None,
+             expected_version: Optional[Any] = None) -> None:
+        with self.lock.exclusive():
+            self._check_version(expected_version)
+            if self.cache is None:
+                atomic_write(self.file_path, lambda file: json.dump(records, file, indent=4, ensure_ascii=False),
+                             self.fsync)
+                return
+            # Записи уже разобраны: кэш обновляется вместе с файлом, без повторного разбора
+            from RecordCache import digest
+            data = json.dumps(records, indent=4, ensure_ascii=False).encode('utf-8')
+            atomic_write(self.file_path, lambda file: file.write(data), self.fsync, binary=True)
+            self.cache.store(records, self.signature(), digest(data))
+
+
+class JournalStorage(TaskStorage):
+    """
+    Хранилище с журналом операций: изменения дописываются в file_path + ".journal"
+    по одной JSON-строке, а основной файл служит снимком и обновляется при уплотнении.
+    Записи журнала содержат полное состояние задачи, поэтому повторное применение
+    журнала к уже уплотненному снимку безопасно.
+    """
+
+    incremental = True
+
+    def __init__(self, file_path: str, compact_threshold: int = 1000, fsync: bool = True,
+                 lock_timeout: float = 10.0) -> None:
+        """
+        :param file_path: путь к файлу снимка (формат tasks.json).
+        :param compact_threshold: число строк журнала, после которого выполняется уплотнение.
+        :param fsync: сбрасывать ли журнал на диск после каждой записи.
+        :param lock_timeout: максимальное время ожидания блокировки в секундах.
+        """
+        super().__init__(file_path, lock_timeout)
+        self.journal_path = file_path + ".journal"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self._records: Optional[Dict[int, Dict[str, Any]]] = None
+        self._journal_size = 0
+        self._journal = None
+        self._signature = None
+
+    def load(self) -> List[Dict[str, Any]]:
+        if self._records is None or self.signature() != self._signature:
+            with self.lock.shared():
+                self._replay()
+        return list(self._records.values())
+
+    def signature(self) -> Optional[Tuple[int, ...]]:
+        return (_stat_signature(self.file_path), _stat_signature(self.journal_path))
+
+    def save(self, records: List[Dict[str, Any]], changes: Optional[Iterable[Change]] = None,
+             expected_version: Optional[Any] = None) -> None:
+        with self.lock.exclusive():
+            self._check_version(expected_version)
+            if changes is None:
+                self._records = {record["id"]: record for record in records}
+                self.compact()
+                return
+            if self._records is None or self.signature() != self._signature:
+                # Другой процесс дописал журнал: сначала догоняем его, потом пишем свое
+                self._replay()
+            self._append(changes)
+
+    def _append(self, changes: Iterable[Change]) -> None:
+        changes = list(changes)
+        entries = [{"op": change.op, "id": change.task_id, "task": change.record} for change in changes]
+        # Несколько изменений пишутся одной строкой, чтобы оборванная запись не применилась частично
+        entry = entries[0] if len(entries) == 1 else {"op": "batch", "changes": entries}
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+        data = line.encode('utf-8')
+        journal = self._open_journal()
+        journal.write(data)
+        journal.flush()
+        increment("taskmanager_bytes_written_total", len(data))
+        if self.fsync:
+            with timed("taskmanager_phase_seconds", phase="fsync"):
+                os.fsync(journal.fileno())
+
+        for change in changes:
+            self._apply(change.op, change.task_id, change.record)
+        self._journal_size += 1
+        if self._journal_size >= self.compact_threshold:
+            self.compact()
+        else:
+            self._signature = self.signature()
+
+    def compact(self) -> None:
+        """
+        Записывает текущее состояние в снимок и очищает журнал.
+        Снимок заменяется атомарно, поэтому сбой на любом шаге не теряет данных.
+        """
+        with self.lock.exclusive():
+            if self._records is None:
+                self._replay()
+            records = list(self._records.values())
+            atomic_write(self.file_path, lambda file: json.dump(records, file, indent=4, ensure_ascii=False))
+
+            journal = self._open_journal()
+            journal.truncate(0)
+            journal.flush()
+            self._journal_size = 0
+            self._signature = self.signature()
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        super().close()
+
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'ab')
+        return self._journal
+
+    def _apply(self, op: str, task_id: int, record: Optional[Dict[str, Any]]) -> None:
+        if op == "delete":
+            self._records.pop(task_id, None)
+        else:
+            self._records[task_id] = record
+
+    def _replay(self) -> None:
+        """
+        Восстанавливает состояние: читает снимок и применяет к нему журнал.
+        Недописанная последняя строка журнала (сбой во время записи) отбрасывается.
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            snapshot = []
+        self._records = {record["id"]: record for record in snapshot}
+        self._journal_size = 0
+
+        try:
+            with open(self.journal_path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        if enabled():
+            increment("taskmanager_bytes_read_total", len(data) + (_stat_signature(self.file_path) or (0, 0))[1])
+            increment("taskmanager_records_scanned_total", len(snapshot))
+
+        valid_end = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            for change in entry["changes"] if entry["op"] == "batch" else (entry,):
+                self._apply(change["op"], change["id"], change["task"])
+            self._journal_size += 1
+            valid_end += len(line)
+
+        if valid_end < len(data):
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(valid_end)
+        self._signature = self.signature()
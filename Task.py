@@ -1,14 +1,86 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Union
+from TaskFields import Status, intern, priority_key, status_key, status_label
 
 class Task:
+    # Без __dict__ у каждого объекта; дата хранится как порядковый номер дня (date.toordinal),
+    # статус — ключом Status (или подписью, если статус не распознан), приоритет — исходной подписью
+    # и ключом сравнения (см. TaskFields)
+    __slots__ = ("id", "title", "description", "_category", "_due_ordinal", "_priority_label", "_priority", "_status")
+
     def __init__(self, id: int, title: str, description: str, category: str, due_date: str, priority: str, status: str = "Не выполнена"):
         self.id = id
         self.title = title
         self.description = description
-        self.category = category
-        self.due_date = self._parse_date(due_date)
-        self.priority = priority
-        self.status = status
+        # Слоты заполняются напрямую, минуя свойства: конструктор вызывается на каждую загруженную запись
+        self._category = intern(category)
+        self.due_date = due_date
+        self._priority_label = intern(priority)
+        self._priority = priority_key(priority)
+        self._status = status_key(status)
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self._category = intern(value)
+
+    @property
+    def priority(self) -> str:
+        """
+        Приоритет задачи в том виде, в котором он был задан.
+        """
+        return self._priority_label
+
+    @priority.setter
+    def priority(self, value: str) -> None:
+        self._priority_label = intern(value)
+        self._priority = priority_key(value)
+
+    @property
+    def status(self) -> str:
+        """
+        Статус задачи; старые подписи («выполнено» и т.п.) приводятся к каноническим,
+        нераспознанные возвращаются как есть.
+        """
+        return status_label(self._status)
+
+    @status.setter
+    def status(self, value: Union[str, Status]) -> None:
+        self._status = status_key(value)
+
+    @property
+    def due_date(self) -> datetime:
+        """
+        Дата выполнения задачи.
+        """
+        return datetime.fromordinal(self._due_ordinal)
+
+    @due_date.setter
+    def due_date(self, value: Union[str, date]) -> None:
+        if isinstance(value, date):
+            self._due_ordinal = value.toordinal()
+        else:
+            self._due_ordinal = self._parse_ordinal(value)
+
+    def _parse_ordinal(self, date_str: str) -> int:
+        """
+        Разбирает строку даты YYYY-MM-DD в порядковый номер дня. Строки канонического вида
+        разбираются через date.fromisoformat, остальные — через _parse_date.
+
+        :param date_str: строка даты
+        :return: порядковый номер дня
+        :raises ValueError: если строка даты имеет неверный формат
+        """
+        if isinstance(date_str, str) and len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-" \
+                and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit():
+            try:
+                return date.fromisoformat(date_str).toordinal()
+            except ValueError:
+                pass
+        return self._parse_date(date_str).toordinal()
 
     def _parse_date(self, date_str: str) -> datetime:
         """
@@ -23,6 +95,23 @@ class Task:
         except ValueError as e:
             raise ValueError(f"Неверный формат даты: {date_str}. Используйте формат YYYY-MM-DD.") from e
 
+    def copy(self) -> "Task":
+        """
+        Создает независимую копию задачи без повторного разбора полей.
+
+        :return: копия задачи
+        """
+        task = Task.__new__(Task)
+        task.id = self.id
+        task.title = self.title
+        task.description = self.description
+        task._category = self._category
+        task._due_ordinal = self._due_ordinal
+        task._priority_label = self._priority_label
+        task._priority = self._priority
+        task._status = self._status
+        return task
+
     def to_dict(self) -> dict:
         """
         Преобразует объект задачи в словарь.
@@ -33,14 +122,14 @@ class Task:
             "id": self.id,
             "title": self.title,
             "description": self.description,
-            "category": self.category,
-            "due_date": self.due_date.strftime("%Y-%m-%d"),
-            "priority": self.priority,
-            "status": self.status
+            "category": self._category,
+            "due_date": date.fromordinal(self._due_ordinal).isoformat(),
+            "priority": self._priority_label,
+            "status": status_label(self._status)
         }
 
     def mark_as_completed(self):
-        self.status = "Выполнена"
+        self._status = Status.COMPLETED
 
     def __str__(self):
         """
@@ -0,0 +1,238 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+from Task import Task
+from Metrics import increment
+
+
+# Примерные накладные расходы на запись кэша: элементы словарей кэша и политики вытеснения
+ENTRY_OVERHEAD = 200
+
+
+def task_size(task: Task) -> int:
+    """
+    Примерный размер задачи в памяти. Категория и подписи приоритета и статуса общие
+    для всех задач (см. TaskFields.intern), поэтому не учитываются.
+    :param task: задача.
+    :return: размер в байтах.
+    """
+    return sys.getsizeof(task) + sys.getsizeof(task.title) + sys.getsizeof(task.description) + ENTRY_OVERHEAD
+
+
+class LRUPolicy:
+    """
+    Вытесняет задачу, к которой дольше всех не обращались.
+    """
+
+    def __init__(self) -> None:
+        self._order: "OrderedDict[int, None]" = OrderedDict()
+
+    def insert(self, key: int) -> None:
+        self._order[key] = None
+
+    def touch(self, key: int) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: int) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> int:
+        return next(iter(self._order))
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LFUPolicy:
+    """
+    Вытесняет задачу с наименьшим числом обращений, а среди равных — самую давнюю.
+    Задачи хранятся в корзинах по числу обращений, поэтому все операции — O(1).
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self._buckets: Dict[int, "OrderedDict[int, None]"] = {}
+        self._minimum = 0
+
+    def insert(self, key: int) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._minimum = 1
+
+    def touch(self, key: int) -> None:
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._minimum == count:
+                self._minimum = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def remove(self, key: int) -> None:
+        count = self._counts.pop(key, None)
+        if count is None:
+            return
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._minimum == count:
+                self._minimum = min(self._buckets, default=0)
+
+    def victim(self) -> int:
+        return next(iter(self._buckets[self._minimum]))
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._buckets.clear()
+        self._minimum = 0
+
+
+POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy}
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Доля попаданий (0.0, если обращений не было).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TaskCache:
+    """
+    Кэш разобранных задач по ID для обычного (нерезидентного) режима TaskManager:
+    повторный find_task_by_id горячей задачи не читает хранилище и не создает Task.
+
+    Объем ограничивается числом задач и (или) примерным размером в байтах; при переполнении
+    задачи вытесняются политикой "lru", "lfu" или собственным объектом с методами
+    insert, touch, remove, victim и clear. Кэш сбрасывается целиком, как только меняется
+    отпечаток хранилища (в том числе после записи другим процессом), а изменения через
+    TaskManager сбрасывают только затронутые задачи.
+
+    Задачи кэша общие для всех, кто их получил, поэтому их нельзя менять на месте.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 4096, max_bytes: Optional[int] = None,
+                 policy: Any = "lru") -> None:
+        """
+        :param max_entries: максимальное число задач (None — без ограничения).
+        :param max_bytes: максимальный примерный размер задач в байтах (None — без ограничения).
+        :param policy: политика вытеснения: "lru", "lfu" или объект политики.
+        :raises ValueError: при неизвестной политике или неположительном ограничении.
+        """
+        if isinstance(policy, str):
+            if policy not in POLICIES:
+                raise ValueError(f"Неизвестная политика вытеснения: {policy}")
+            policy = POLICIES[policy]()
+        if (max_entries is not None and max_entries <= 0) or (max_bytes is not None and max_bytes <= 0):
+            raise ValueError("Ограничение кэша должно быть положительным")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._tasks: Dict[int, Task] = {}
+        self._sizes: Dict[int, int] = {}
+        self._size = 0
+        self._signature: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, task_id: int, signature: Optional[Hashable] = None) -> Optional[Task]:
+        """
+        :param task_id: ID задачи.
+        :param signature: текущий отпечаток хранилища; если он изменился, кэш сбрасывается.
+        :return: задача из кэша или None при промахе.
+        """
+        if signature != self._signature:
+            self.clear()
+            self._signature = signature
+        task = self._tasks.get(task_id)
+        if task is None:
+            self.misses += 1
+            increment("taskmanager_task_cache_total", result="miss")
+            return None
+        self.hits += 1
+        self.policy.touch(task_id)
+        increment("taskmanager_task_cache_total", result="hit")
+        return task
+
+    def put(self, task: Task, signature: Optional[Hashable] = None) -> None:
+        """
+        Кладет задачу в кэш, при необходимости вытесняя другие.
+        :param task: задача.
+        :param signature: отпечаток хранилища, из которого прочитана задача.
+        """
+        if signature != self._signature:
+            self.clear()
+            self._signature = signature
+        self.discard(task.id)
+        size = task_size(task)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        # Место освобождается до вставки: иначе LFU вытеснил бы саму новую задачу с одним обращением
+        while self._tasks and ((self.max_entries is not None and len(self._tasks) >= self.max_entries)
+                               or (self.max_bytes is not None and self._size + size > self.max_bytes)):
+            self._remove(self.policy.victim())
+            self.evictions += 1
+        self._tasks[task.id] = task
+        self._sizes[task.id] = size
+        self._size += size
+        self.policy.insert(task.id)
+
+    def discard(self, task_id: int) -> None:
+        """
+        Убирает задачу из кэша, если она там есть.
+        :param task_id: ID задачи.
+        """
+        if task_id in self._tasks:
+            self._remove(task_id)
+            self.invalidations += 1
+
+    def rebase(self, old: Optional[Hashable], new: Optional[Hashable]) -> None:
+        """
+        Переносит кэш на новый отпечаток хранилища после собственной записи, из-за которой
+        затронутые задачи уже убраны (discard). Переносится, только если кэш соответствовал
+        состоянию хранилища до записи.
+        :param old: отпечаток хранилища до записи.
+        :param new: отпечаток после записи.
+        """
+        if self._signature == old:
+            self._signature = new
+
+    def clear(self) -> None:
+        """
+        Очищает кэш; статистика обращений сохраняется.
+        """
+        if self._tasks:
+            self.invalidations += len(self._tasks)
+        self._tasks.clear()
+        self._sizes.clear()
+        self._size = 0
+        self.policy.clear()
+
+    def _remove(self, task_id: int) -> None:
+        del self._tasks[task_id]
+        self._size -= self._sizes.pop(task_id)
+        self.policy.remove(task_id)
+
+    def stats(self) -> CacheStats:
+        """
+        :return: счетчики попаданий, промахов, вытеснений и сбросов, число задач и их примерный размер.
+        """
+        return CacheStats(self.hits, self.misses, self.evictions, self.invalidations, len(self._tasks), self._size)
@@ -0,0 +1,364 @@
+import json
+import socket
+import struct
+from datetime import datetime
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from Task import Task
+from Storage import ConcurrentModificationError, StorageError
+from ChangeFeed import ChangeFeedGap, FeedEntry
+from Query import Query
+from Snapshot import Snapshot
+from Stats import StatsReport
+
+
+# Кадр протокола: длина тела (4 байта, big-endian) и тело — JSON в UTF-8.
+# Запрос: {"id": n, "op": имя, "args": [...], "kwargs": {...}} или {"id": n, "batch": [запросы без id]}.
+# Ответ: {"id": n, "result": ...} или {"id": n, "error": {"type": ..., "message": ...}},
+# для пакета — {"id": n, "results": [ответы без id]}; "output" — то, что операция вывела на экран.
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+
+# Операции TaskManager, доступные через сервер
+READ_OPERATIONS = frozenset({
+    "load_tasks", "find_task_by_id", "search_tasks", "search_ranked", "view_tasks",
+    "iter_records", "changes_since", "stats", "snapshot",
+})
+WRITE_OPERATIONS = frozenset({
+    "add_task", "delete_task", "edit_task", "mark_task_as_completed", "save_tasks",
+    "add_tasks", "edit_tasks", "delete_tasks", "flush",
+})
+# Операции атомарного пакета (pipeline(atomic=True)): выполняются над TaskBatch одной транзакцией
+BATCH_OPERATIONS = frozenset({
+    "add_task", "delete_task", "edit_task", "mark_task_as_completed",
+    "add_tasks", "edit_tasks", "delete_tasks", "find_task_by_id",
+})
+TASK_RESULT = frozenset({"find_task_by_id"})
+TASK_LIST_RESULT = frozenset({"load_tasks", "search_tasks", "search_ranked", "view_tasks"})
+
+ERRORS = {
+    "ValueError": ValueError,
+    "KeyError": KeyError,
+    "StorageError": StorageError,
+    "ConcurrentModificationError": ConcurrentModificationError,
+    "ChangeFeedGap": ChangeFeedGap,
+}
+
+
+class TaskServerError(Exception):
+    """
+    Ошибка сервера задач, не имеющая соответствия среди исключений TaskManager.
+    """
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """
+    :param message: сообщение протокола.
+    :return: кадр: длина и JSON-тело.
+    """
+    body = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(len(body)) + body
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Приводит результат операции к виду, который можно передать в JSON (Task — словарь).
+    """
+    if isinstance(value, Task):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_result(op: str, value: Any) -> Any:
+    """
+    Восстанавливает результат операции на стороне клиента.
+    :param op: имя операции.
+    :param value: результат из ответа сервера.
+    """
+    if op in TASK_LIST_RESULT:
+        return [Task(**record) for record in value]
+    if op in TASK_RESULT:
+        return Task(**value) if value is not None else None
+    if op == "changes_since":
+        return [FeedEntry(*entry) for entry in value]
+    if op == "stats":
+        return StatsReport({tuple(row[:3]): row[3] for row in value["counts"]}, value["overdue"])
+    if op == "snapshot":
+        return Snapshot({record["id"]: Task(**record) for record in value["tasks"]}, value["seq"])
+    return value
+
+
+def decode_error(error: Dict[str, str]) -> Exception:
+    """
+    :return: исключение того же типа, что было выброшено на сервере (или TaskServerError).
+    """
+    error_type = ERRORS.get(error["type"])
+    if error_type is None:
+        return TaskServerError(f"{error['type']}: {error['message']}")
+    return error_type(error["message"])
+
+
+class TaskClient:
+    """
+    Клиент сервера задач (TaskServer) с тем же интерфейсом, что и TaskManager.
+    Соединение устанавливается при первом запросе и используется повторно.
+    Несколько операций можно отправить за один обмен через pipeline().
+    Сообщения, которые операция вывела на сервере, выводятся у клиента.
+    Транзакций (transaction()) нет: результат операции известен только после ответа сервера,
+    поэтому вместо них используется pipeline(atomic=True).
+    Пример: manager = TaskClient("/tmp/tasks.sock"); manager.add_task(...)
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                 port: Optional[int] = None, timeout: Optional[float] = 30.0) -> None:
+        """
+        :param socket_path: путь к Unix-сокету сервера.
+        :param host: адрес TCP-сервера, если socket_path не задан.
+        :param port: порт TCP-сервера.
+        :param timeout: время ожидания ответа в секундах.
+        """
+        if socket_path is None and port is None:
+            raise ValueError("Укажите путь к сокету или порт сервера задач")
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._buffer = b""
+        self._ids = count(1)
+
+    @classmethod
+    def from_address(cls, address: str, timeout: Optional[float] = 30.0) -> "TaskClient":
+        """
+        :param address: путь к Unix-сокету или host:port.
+        :return: клиент сервера по этому адресу.
+        """
+        host, separator, port = address.rpartition(":")
+        if separator and "/" not in address and port.isdigit():
+            return cls(host=host or "127.0.0.1", port=int(port), timeout=timeout)
+        return cls(socket_path=address, timeout=timeout)
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            self._buffer = b""
+
+    def __enter__(self) -> "TaskClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            if self.socket_path is not None:
+                connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                connection.settimeout(self.timeout)
+                connection.connect(self.socket_path)
+            else:
+                connection = socket.create_connection((self.host, self.port), self.timeout)
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket = connection
+        return self._socket
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self._socket.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                self.close()
+                raise ConnectionError("Сервер задач закрыл соединение")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _read_frame(self) -> Dict[str, Any]:
+        (size,) = HEADER.unpack(self._read_exact(HEADER.size))
+        return json.loads(self._read_exact(size))
+
+    def exchange(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Отправляет запросы одной записью в сокет, не дожидаясь ответов (конвейер),
+        и затем собирает ответы.
+        :param requests: запросы протокола без id.
+        :return: ответы в порядке запросов.
+        """
+        connection = self._connect()
+        ids = [next(self._ids) for _ in requests]
+        try:
+            connection.sendall(b"".join(encode_frame(dict(request, id=request_id))
+                                        for request, request_id in zip(requests, ids)))
+            responses = {}
+            while len(responses) < len(ids):
+                response = self._read_frame()
+                responses[response["id"]] = response
+        except (OSError, ValueError):
+            # После сбоя посреди обмена в потоке могут остаться чужие ответы
+            self.close()
+            raise
+        return [responses[request_id] for request_id in ids]
+
+    def _call(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        return unpack_response(op, self.exchange([{"op": op, "args": list(args), "kwargs": kwargs}])[0])
+
+    def pipeline(self, atomic: bool = False) -> "Pipeline":
+        """
+        Собирает несколько операций и отправляет их за один обмен с сервером.
+        Пример: with manager.pipeline() as pipe: pipe.add_task(...); pipe.delete_task(3)
+        :param atomic: отправить операции одним пакетом: сервер выполнит их одной транзакцией,
+                       не перемежая с чужими, и запишет на диск одной операцией; при ошибке
+                       любой операции не применяется ни одна. В пакете доступны только
+                       изменения и find_task_by_id (BATCH_OPERATIONS).
+        :return: Pipeline; результаты — в pipe.results после выхода из блока.
+        """
+        return Pipeline(self, atomic)
+
+    def load_tasks(self) -> List[Task]:
+        return self._call("load_tasks")
+
+    def save_tasks(self, tasks: List[Task]) -> None:
+        self._call("save_tasks", [task.to_dict() for task in tasks])
+
+    def find_task_by_id(self, task_id: int) -> Optional[Task]:
+        return self._call("find_task_by_id", task_id)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        return iter(self.load_tasks())
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._call("iter_records"))
+
+    def iter_search(self, keyword: Optional[str] = None, category: Optional[str] = None,
+                    status: Optional[str] = None) -> Iterator[Task]:
+        return iter(self.search_tasks(keyword, category, status))
+
+    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> None:
+        self._call("add_task", title, description, category, due_date, priority)
+
+    def delete_task(self, task_id: int) -> None:
+        self._call("delete_task", task_id)
+
+    def edit_task(self, task_id: int, **kwargs: Any) -> None:
+        self._call("edit_task", task_id, **kwargs)
+
+    def mark_task_as_completed(self, task_id: int) -> None:
+        self._call("mark_task_as_completed", task_id)
+
+    def search_tasks(self, keyword: Optional[str] = None, category: Optional[str] = None,
+                     status: Optional[str] = None) -> List[Task]:
+        return self._call("search_tasks", keyword, category, status)
+
+    def search_ranked(self, query: str, prefix: bool = False, limit: Optional[int] = None) -> List[Task]:
+        return self._call("search_ranked", query, prefix, limit)
+
+    def view_tasks(self, category: Optional[str] = None) -> List[Task]:
+        return self._call("view_tasks", category)
+
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        return self._call("add_tasks", list(tasks))
+
+    def edit_tasks(self, updates: Dict[int, Dict[str, Any]]) -> None:
+        # Ключи JSON-объекта — строки, поэтому изменения передаются парами
+        self._call("edit_tasks", [[task_id, changes] for task_id, changes in updates.items()])
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> None:
+        self._call("delete_tasks", list(task_ids))
+
+    def changes_since(self, seq: int) -> List[FeedEntry]:
+        return self._call("changes_since", seq)
+
+    def stats(self, now: Optional[datetime] = None) -> StatsReport:
+        return self._call("stats", now.isoformat() if now is not None else None)
+
+    def snapshot(self) -> Snapshot:
+        """
+        :return: срез задач сервера; в отличие от TaskManager.snapshot, задачи копируются целиком.
+        """
+        return self._call("snapshot")
+
+    def flush(self) -> None:
+        self._call("flush")
+
+    def query(self) -> Query:
+        """
+        :return: запрос к задачам; условия проверяются на стороне клиента по записям сервера.
+        """
+        return Query(records=self.iter_records)
+
+
+def unpack_response(op: str, response: Dict[str, Any]) -> Any:
+    """
+    Выводит сообщения операции и возвращает ее результат.
+    :raises: исключение операции на сервере.
+    """
+    if response.get("output"):
+        print(response["output"], end="")
+    if "error" in response:
+        raise decode_error(response["error"])
+    return decode_result(op, response.get("result"))
+
+
+class Pipeline:
+    """
+    Операции TaskClient, отложенные до execute(). Методы повторяют TaskManager,
+    но ничего не возвращают: результаты (или исключения) появляются в results.
+    """
+
+    def __init__(self, client: TaskClient, atomic: bool = False) -> None:
+        self.client = client
+        self.atomic = atomic
+        self.results: List[Any] = []
+        self._calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        if name not in READ_OPERATIONS and name not in WRITE_OPERATIONS:
+            raise AttributeError(name)
+
+        def call(*args: Any, **kwargs: Any) -> "Pipeline":
+            if name == "save_tasks":
+                args = ([task.to_dict() for task in args[0]],)
+            elif name == "edit_tasks":
+                args = ([[task_id, changes] for task_id, changes in args[0].items()],)
+            elif name in ("add_tasks", "delete_tasks"):
+                args = (list(args[0]),)
+            elif name == "stats" and args and args[0] is not None:
+                args = (args[0].isoformat(),)
+            self._calls.append((name, {"op": name, "args": list(args), "kwargs": kwargs}))
+            return self
+        return call
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def execute(self) -> List[Any]:
+        """
+        Отправляет накопленные операции.
+        :return: результаты в порядке операций; для неудачной операции — ее исключение.
+        :raises: в атомарном режиме — исключение неудачной операции: тогда не применена ни одна.
+        """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+        if self.atomic:
+            unsupported = [op for op, _ in calls if op not in BATCH_OPERATIONS]
+            if unsupported:
+                raise ValueError(f"Операции недоступны в атомарном пакете: {', '.join(unsupported)}")
+            response = self.client.exchange([{"batch": [request for _, request in calls]}])[0]
+            if "error" in response:
+                raise decode_error(response["error"])
+            responses = response["results"]
+        else:
+            responses = self.client.exchange([request for _, request in calls])
+        self.results = []
+        for (op, _), response in zip(calls, responses):
+            try:
+                self.results.append(unpack_response(op, response))
+            except Exception as error:
+                self.results.append(error)
+        return self.results
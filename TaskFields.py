@@ -0,0 +1,138 @@
+import sys
+from enum import IntEnum
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+STATUS_LABELS = ("Не выполнена", "Выполнена")
+
+
+class Status(IntEnum):
+    """
+    Статус задачи. В памяти хранится числом, на диск записывается подписью (label).
+    Нераспознанные подписи («В процессе» и т.п.) хранятся как есть (см. status_key).
+    """
+    NOT_COMPLETED = 0
+    COMPLETED = 1
+
+    @property
+    def label(self) -> str:
+        return STATUS_LABELS[self]
+
+
+class Priority(IntEnum):
+    """
+    Известные приоритеты; порядок чисел — порядок важности.
+    """
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.lower().replace("ё", "е").split())
+
+
+# Подписи, встречающиеся в старых файлах и в вводе пользователя (после _normalize)
+_STATUS_ALIASES: Dict[str, Status] = {
+    "не выполнена": Status.NOT_COMPLETED, "не выполнено": Status.NOT_COMPLETED,
+    "невыполнена": Status.NOT_COMPLETED, "невыполнено": Status.NOT_COMPLETED,
+    "todo": Status.NOT_COMPLETED, "open": Status.NOT_COMPLETED, "pending": Status.NOT_COMPLETED,
+    "выполнена": Status.COMPLETED, "выполнено": Status.COMPLETED, "готово": Status.COMPLETED,
+    "done": Status.COMPLETED, "completed": Status.COMPLETED, "closed": Status.COMPLETED,
+}
+_PRIORITY_ALIASES: Dict[str, Priority] = {
+    "низкий": Priority.LOW, "low": Priority.LOW,
+    "средний": Priority.MEDIUM, "medium": Priority.MEDIUM, "normal": Priority.MEDIUM,
+    "высокий": Priority.HIGH, "high": Priority.HIGH,
+}
+
+# Уже разобранные строки: повторяющиеся значения не нормализуются заново
+_statuses: Dict[Any, Hashable] = {label: Status(code) for code, label in enumerate(STATUS_LABELS)}
+_priorities: Dict[str, Hashable] = {}
+
+
+def status_key(value: Any) -> Optional[Hashable]:
+    """
+    Ключ сравнения статуса: Status для известных подписей с учетом старых и неканонических
+    («выполнено», «Done» и т.п.), иначе сама подпись — так задачи с чужими статусами
+    загружаются и сохраняются без изменений.
+    :param value: подпись статуса или Status.
+    :return: Status, исходная подпись или None, если значение нельзя использовать как ключ.
+    """
+    try:
+        return _statuses[value]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    if isinstance(value, Status):
+        return value
+    status = _STATUS_ALIASES.get(_normalize(value), intern(value)) if isinstance(value, str) else value
+    if len(_statuses) < 1024:
+        _statuses[value] = status
+    return status
+
+
+def status_label(key: Hashable) -> Any:
+    """
+    :param key: ключ статуса (см. status_key).
+    :return: каноническая подпись известного статуса или исходная подпись.
+    """
+    return STATUS_LABELS[key] if key.__class__ is Status else key
+
+
+def parse_status(value: Any) -> Status:
+    """
+    Проверяет статус из ввода (добавление и редактирование задач): принимаются только известные статусы.
+    :param value: подпись статуса или Status.
+    :return: Status.
+    :raises ValueError: если статус не распознан.
+    """
+    status = status_key(value)
+    if not isinstance(status, Status):
+        raise ValueError(f"Неизвестный статус: {value}. Используйте «{STATUS_LABELS[0]}» или «{STATUS_LABELS[1]}».")
+    return status
+
+
+def validate_changes(changes: Dict[str, Any]) -> None:
+    """
+    Проверяет новые значения полей задачи из ввода (добавление и редактирование).
+    :param changes: значения полей задачи.
+    :raises ValueError: если статус не распознан.
+    """
+    if "status" in changes:
+        parse_status(changes["status"])
+
+
+def priority_key(value: str) -> Hashable:
+    """
+    Ключ сравнения приоритета: Priority для известных подписей на любом языке и в любом
+    регистре («высокий», «High»), иначе сама строка.
+    :param value: подпись приоритета.
+    :return: Priority или исходная строка.
+    """
+    try:
+        return _priorities[value]
+    except KeyError:
+        pass
+    key = _PRIORITY_ALIASES.get(_normalize(value), value) if isinstance(value, str) else value
+    if len(_priorities) < 1024:
+        _priorities[value] = key
+    return key
+
+
+def priority_rank(key: Hashable) -> Tuple[int, Any]:
+    """
+    Ключ сортировки по приоритету: известные приоритеты по возрастанию важности,
+    затем остальные подписи по алфавиту.
+    :param key: ключ приоритета (см. priority_key).
+    """
+    return (0, int(key)) if key.__class__ is Priority else (1, key)
+
+
+def intern(value: str) -> str:
+    """
+    Возвращает единственный экземпляр строки (категории, подписи приоритета): задачи
+    с одинаковым значением ссылаются на одну строку, а сравнение таких строк — сравнение ссылок.
+    """
+    return sys.intern(value) if type(value) is str else value
@@ -1,58 +1,369 @@
 import json
-import os
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
 from Task import Task
+from TaskFields import Status, status_key, validate_changes
+from Storage import Change, JsonFileStorage, TaskStorage
+from ResidentStore import ResidentStore
+from Index import TaskIndexes
+from FullText import InvertedIndex
+from Batch import TaskBatch
+from Query import Query
+from Scheduler import DeadlineScheduler
+from Stats import StatsReport, TaskStats
+from Metrics import instrumented
+from ChangeFeed import ChangeFeed, FeedEntry
+from Snapshot import Snapshot
+from TaskCache import TaskCache
 
 
 class TaskManager:
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, storage: Optional[TaskStorage] = None,
+                 resident: bool = False, flush_interval: Optional[float] = 0.0,
+                 change_feed: Optional[ChangeFeed] = None, task_cache: Optional[TaskCache] = None) -> None:
         """
         Инициализирует TaskManager, создавая файл задач, если он не существует.
         :param file_path: путь к файлу задач.
+        :param storage: хранилище задач; по умолчанию JSON-файл file_path.
+        :param resident: держать ли разобранные задачи в памяти между вызовами. Задачи выдаются
+                         копиями: правка полученной задачи не меняет хранилище до save_tasks.
+        :param flush_interval: в резидентном режиме — минимальный интервал между записями
+                               в секундах; 0 — запись после каждого изменения, None — только по flush().
+        :param change_feed: лента изменений; по умолчанию — в памяти процесса. Чтобы ленту
+                            видели другие процессы, передайте ChangeFeed(path) с общим файлом.
+        :param task_cache: кэш задач для find_task_by_id в обычном режиме (в резидентном
+                           режиме все задачи и так в памяти, и кэш не используется).
         """
         self.file_path = file_path
+        self.storage = storage if storage is not None else JsonFileStorage(file_path)
         self._ensure_file_exists()
+        self._store = ResidentStore(self.storage, flush_interval) if resident else None
+        self._scheduler: Optional[DeadlineScheduler] = None
+        self._stats: Optional[TaskStats] = None
+        self._stats_signature = None
+        self.feed = change_feed if change_feed is not None else ChangeFeed()
+        self.task_cache = task_cache if not resident else None
 
     def _ensure_file_exists(self) -> None:
         """
         Создает файл задач, если он не существует.
         """
-        if not os.path.exists(self.file_path):
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump([], file)
+        self.storage.ensure_exists()
 
-    def load_tasks(self) -> List[Task]:
+    def _load_records(self) -> List[Dict[str, Any]]:
         """
-        Загружает все задачи из файла.
-        :return: список задач.
+        Загружает записи задач из хранилища, считая недоступные данные пустым списком.
+        :return: список словарей задач.
         """
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                tasks_data = json.load(file)
-                return [Task(**task) for task in tasks_data]
+            return self.storage.load()
         except (FileNotFoundError, json.JSONDecodeError):
             return []
 
+    @instrumented("flush")
+    def flush(self) -> None:
+        """
+        Записывает отложенные изменения резидентного режима.
+        """
+        if self._store is not None:
+            self._store.flush()
+
+    def close(self) -> None:
+        """
+        Записывает отложенные изменения и закрывает хранилище задач.
+        """
+        self.flush()
+        self.storage.close()
+        self.feed.close()
+
+    def __enter__(self) -> "TaskManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def indexes(self) -> Optional[TaskIndexes]:
+        """
+        Вторичные индексы резидентного режима (None в обычном режиме).
+        """
+        if self._store is None:
+            return None
+        return self._store.indexes
+
+    def _indexed_tasks(self, category: Optional[str], status: Optional[Hashable]) -> List[Task]:
+        """
+        Отбирает задачи резидентного режима по категории и статусу с помощью индексов.
+        :param category: категория или None.
+        :param status: ключ статуса (см. TaskFields.status_key) или None.
+        :return: список задач.
+        """
+        tasks = self._store.tasks()
+        indexes = self._store.indexes
+        if not category and status is None:
+            return list(tasks.values())
+        if category and status is not None:
+            # Перебираем меньшую корзину и проверяем второе условие по самой задаче
+            if indexes.category.count(category) <= indexes.status.count(status):
+                return [tasks[task_id] for task_id in indexes.category.get(category) if tasks[task_id]._status == status]
+            return [tasks[task_id] for task_id in indexes.status.get(status) if tasks[task_id].category == category]
+        if category:
+            return [tasks[task_id] for task_id in indexes.category.get(category)]
+        return [tasks[task_id] for task_id in indexes.status.get(status)]
+
+    @staticmethod
+    def _edited_copy(task: Task, changes: Dict[str, Any]) -> Task:
+        """
+        Возвращает копию задачи с примененными изменениями, не трогая исходный объект.
+        :param task: исходная задача.
+        :param changes: новые значения полей задачи.
+        :return: новая задача.
+        :raises ValueError: если новые значения неверны.
+        """
+        validate_changes(changes)
+        edited = Task(**task.to_dict())
+        for key, value in changes.items():
+            if hasattr(edited, key):
+                setattr(edited, key, value)
+        return edited
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Исключительная блокировка хранилища для изменения в обычном режиме. Изменения внутри
+        сбрасывают из кэша задач только затронутые задачи (см. _publish), а после записи кэш
+        переносится на новый отпечаток хранилища, а не сбрасывается целиком.
+        """
+        with self.storage.locked():
+            if self.task_cache is None:
+                yield
+                return
+            before = self.storage.signature()
+            yield
+            self.task_cache.rebase(before, self.storage.signature())
+
+    def _publish(self, changes: Iterable[Change]) -> None:
+        """
+        Добавляет примененные изменения в ленту изменений.
+        :param changes: изменения; в резидентном режиме запись может содержать объект Task.
+        """
+        if self.task_cache is not None:
+            changes = list(changes)
+            for op, task_id, _ in changes:
+                if op == "reset":
+                    self.task_cache.clear()
+                else:
+                    self.task_cache.discard(task_id)
+        self.feed.append(Change(op, task_id, record.to_dict() if isinstance(record, Task) else record)
+                         for op, task_id, record in changes)
+
+    def changes_since(self, seq: int) -> List[FeedEntry]:
+        """
+        Возвращает изменения задач после записи ленты с номером seq, например после снимка:
+        snapshot = manager.snapshot(); ...; manager.changes_since(snapshot.seq).
+        Запись "reset" означает, что задачи заменены целиком и их нужно перечитать.
+        :param seq: номер последней обработанной записи (0 — с самого начала).
+        :return: записи FeedEntry(seq, op, task_id, record) по возрастанию seq.
+        :raises ChangeFeedGap: если часть изменений уже вытеснена из ленты.
+        """
+        return self.feed.changes_since(seq)
+
+    @instrumented("snapshot")
+    def snapshot(self) -> Snapshot:
+        """
+        Делает согласованный срез задач, не блокируя последующие изменения.
+        В резидентном режиме снимок не копирует задачи, пока их никто не изменил;
+        в обычном — читается под разделяемой блокировкой вместе с номером ленты.
+        :return: Snapshot с методами load_tasks, find_task_by_id, view_tasks, search_tasks, query.
+        """
+        if self._store is not None:
+            return Snapshot(self._store.snapshot(), self.feed.last_seq)
+        with self.storage.lock.shared():
+            records = self._load_records()
+            seq = self.feed.last_seq
+        return Snapshot({record["id"]: Task(**record) for record in records}, seq)
+
+    @instrumented("load_tasks")
+    def load_tasks(self) -> List[Task]:
+        """
+        Загружает все задачи из файла.
+        :return: список задач.
+        """
+        if self._store is not None:
+            return [task.copy() for task in self._store.tasks().values()]
+        return [Task(**task) for task in self._load_records()]
+
+    @staticmethod
+    def _diff_tasks(current: Dict[int, Any], tasks: List[Task],
+                    unchanged: Callable[[Any, Task], bool]) -> Optional[List[Change]]:
+        """
+        Сравнивает новый список задач с сохраненным.
+        :param current: сохраненные задачи (Task или словари) по ID в порядке хранения.
+        :param tasks: новый список задач.
+        :param unchanged: функция (сохраненная задача, новая задача) -> совпадают ли они.
+        :return: изменения, превращающие current в tasks, или None, если изменился порядок задач
+                 (или ID повторяются) и список нужно переписать целиком.
+        """
+        seen = set()
+        kept = []
+        changes = []
+        added = False
+        for task in tasks:
+            if task.id in seen:
+                return None
+            seen.add(task.id)
+            old = current.get(task.id)
+            if old is None:
+                changes.append(Change("add", task.id, task))
+                added = True
+            elif added:
+                return None  # сохраненная задача после новой: новые дописываются только в конец
+            else:
+                kept.append(task.id)
+                if not unchanged(old, task):
+                    changes.append(Change("edit", task.id, task))
+        if kept != [task_id for task_id in current if task_id in seen]:
+            return None
+        return [Change("delete", task_id, None) for task_id in current if task_id not in seen] + changes
+
+    @instrumented("save_tasks")
     def save_tasks(self, tasks: List[Task]) -> None:
         """
         Сохраняет задачи в файл с красивым форматированием.
+        Если порядок задач не изменился, записываются только добавленные, измененные
+        и удаленные задачи (для хранилищ, умеющих писать изменения, — только они и попадут на диск).
         :param tasks: список задач.
         """
-        with open(self.file_path, 'w', encoding='utf-8') as file:
-            json.dump([task.to_dict() for task in tasks], file, indent=4, ensure_ascii=False)
+        if self._store is not None:
+            # Менеджер выдает копии задач, поэтому правка на месте видна как отличие от хранилища
+            changes = self._diff_tasks(self._store.tasks(), tasks, lambda old, new: old.to_dict() == new.to_dict())
+            if changes is None:
+                self._store.replace_all(tasks)
+                self._publish([Change("reset", None, None)])
+            elif changes:
+                self._store.apply(changes)
+                self._publish(changes)
+            return
+        records = [task.to_dict() for task in tasks]
+        with self._locked():
+            changes = None
+            if self.storage.incremental:
+                current = {record["id"]: record for record in self._load_records()}
+                changes = self._diff_tasks(current, tasks, lambda old, new: old == new.to_dict())
+            if changes is None:
+                self.storage.save(records)
+                self._publish([Change("reset", None, None)])
+            elif changes:
+                changes = [Change(op, task_id, task.to_dict() if task is not None else None)
+                           for op, task_id, task in changes]
+                self.storage.save(records, changes)
+                self._publish(changes)
 
+    @instrumented("find_task_by_id")
     def find_task_by_id(self, task_id: int) -> Optional[Task]:
         """
         Ищет задачу по ID, не загружая все данные.
         :param task_id: ID задачи.
         :return: Найденная задача или None.
         """
+        if self._store is not None:
+            task = self._store.tasks().get(task_id)
+            return task.copy() if task is not None else None
+        cache = self.task_cache
+        if cache is not None:
+            # Отпечаток берется до чтения: если файл изменится во время чтения, следующий вызов сбросит кэш
+            signature = self.storage.signature()
+            if signature is None:
+                cache = None
+        if cache is not None:
+            task = cache.get(task_id, signature)
+            if task is not None:
+                return task
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                return next((Task(**task) for task in json.load(file) if task["id"] == task_id), None)
+            # JSON-файл читается потоково до найденной задачи, двоичный — по индексу
+            record = self.storage.get(task_id)
         except (FileNotFoundError, json.JSONDecodeError):
             return None
+        if record is None:
+            return None
+        task = Task(**record)
+        if cache is not None:
+            cache.put(task, signature)
+        return task
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Перебирает задачи по одной, не загружая весь файл в память.
+        Недоступный или поврежденный файл завершает перебор.
+        :return: итератор задач.
+        """
+        if self._store is not None:
+            for task in list(self._store.tasks().values()):
+                yield task.copy()
+            return
+        try:
+            for task_data in self.storage.iter_records():
+                yield Task(**task_data)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
 
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебирает задачи в виде словарей, не создавая объекты Task в обычном режиме.
+        Недоступный или поврежденный файл завершает перебор.
+        :return: итератор словарей задач.
+        """
+        if self._store is not None:
+            for task in list(self._store.tasks().values()):
+                yield task.to_dict()
+            return
+        try:
+            yield from self.storage.iter_records()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+    def iter_search(self, keyword: Optional[str] = None,
+                    category: Optional[str] = None,
+                    status: Optional[str] = None) -> Iterator[Task]:
+        """
+        Потоковый вариант search_tasks: задачи возвращаются по мере нахождения,
+        поэтому перебор можно прервать, не дочитывая файл.
+        :param keyword: ключевое слово для поиска.
+        :param category: категория для поиска.
+        :param status: статус для поиска.
+        :return: итератор найденных задач.
+        """
+        if self._store is not None:
+            yield from self.search_tasks(keyword, category, status)
+            return
+        try:
+            yield from self._iter_matching_records(keyword, category, status)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+    def _iter_matching_records(self, keyword: Optional[str], category: Optional[str],
+                               status: Optional[str]) -> Iterator[Task]:
+        """
+        Потоково отбирает задачи хранилища по критериям поиска.
+        :raises FileNotFoundError, json.JSONDecodeError: если данные недоступны или повреждены.
+        """
+        keyword = keyword.lower() if keyword else None
+        wanted = status_key(status) if status else None
+        if status and wanted is None:
+            return
+        for task_data in self.storage.iter_records():
+            # Фильтрация задач по критериям; статус сравнивается по Status, поэтому
+            # старые подписи («выполнено») находятся вместе с каноническими
+            if (
+                (not keyword or keyword in task_data["title"].lower() or keyword in task_data["description"].lower())
+                and (not category or task_data["category"] == category)
+                and (not status or status_key(task_data["status"]) == wanted)
+            ):
+                yield Task(**task_data)
+
+    @instrumented("add_task")
     def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> None:
         """
         Добавляет новую задачу в список.
@@ -66,70 +377,116 @@ class TaskManager:
             print("Ошибка: все поля задачи должны быть заполнены.")
             return
 
-        tasks = self.load_tasks()
-
-        if any(task.title == title for task in tasks):
-            print("Ошибка: задача с таким заголовком уже существует.")
+        if self._store is not None:
+            indexes = self._store.indexes
+            if title in indexes.title:
+                print("Ошибка: задача с таким заголовком уже существует.")
+                return
+            new_id = indexes.next_id()
+            self._store.put(Task(id=new_id, title=title, description=description, category=category,
+                                 due_date=due_date, priority=priority), "add")
+            self._publish([Change("add", new_id, self._store.tasks()[new_id])])
             return
 
-        # Генерация ID для новой задачи
-        new_id = (max(task.id for task in tasks) + 1) if tasks else 1
-        new_task = Task(id=new_id, title=title, description=description, category=category, due_date=due_date, priority=priority)
-        tasks.append(new_task)
-        self.save_tasks(tasks)
+        # Чтение и запись под одной блокировкой, чтобы не потерять чужие изменения
+        with self._locked():
+            try:
+                records = self.storage.load()
+            except FileNotFoundError:
+                records = []
+            except json.JSONDecodeError:
+                print("Ошибка при добавлении задачи.")
+                return
+
+            if any(task["title"] == title for task in records):
+                print("Ошибка: задача с таким заголовком уже существует.")
+                return
+
+            # Генерация ID для новой задачи
+            new_id = (max(task["id"] for task in records) + 1) if records else 1
+            new_task = Task(id=new_id, title=title, description=description, category=category, due_date=due_date, priority=priority)
+            new_record = new_task.to_dict()
+            changes = [Change("add", new_id, new_record)]
+            self.storage.save(records + [new_record], changes)
+            self._publish(changes)
 
+    @instrumented("delete_task")
     def delete_task(self, task_id: int) -> None:
         """
         Удаляет задачу по ID с минимальной загрузкой данных.
         :param task_id: ID задачи.
         """
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                tasks = json.load(file)
-
-            updated_tasks = [task for task in tasks if task["id"] != task_id]  # Исключение задачи с указанным ID
-            if len(updated_tasks) == len(tasks):
+        if self._store is not None:
+            if task_id not in self._store.tasks():
                 print(f"Задача с ID {task_id} не найдена.")
                 return
+            self._store.remove(task_id)
+            self._publish([Change("delete", task_id, None)])
+            return
+
+        try:
+            with self._locked():
+                tasks = self.storage.load()
 
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(updated_tasks, file, indent=4, ensure_ascii=False)
+                updated_tasks = [task for task in tasks if task["id"] != task_id]  # Исключение задачи с указанным ID
+                if len(updated_tasks) == len(tasks):
+                    print(f"Задача с ID {task_id} не найдена.")
+                    return
+
+                changes = [Change("delete", task_id, None)]
+                self.storage.save(updated_tasks, changes)
+                self._publish(changes)
         except (FileNotFoundError, json.JSONDecodeError):
             print("Ошибка при удалении задачи.")
 
+    @instrumented("edit_task")
     def edit_task(self, task_id: int, **kwargs: Dict[str, Any]) -> None:
         """
         Редактирует задачу по ее ID, минимизируя загрузку данных.
         :param task_id: ID задачи.
         :param kwargs: новые значения полей задачи.
+        :raises ValueError: если новые значения неверны.
         """
+        validate_changes(kwargs)
+        if self._store is not None:
+            task = self._store.tasks().get(task_id)
+            if task is None:
+                print(f"Задача с ID {task_id} не найдена.")
+                return
+            edited = self._edited_copy(task, kwargs)
+            self._store.put(edited)
+            self._publish([Change("edit", task_id, edited)])
+            return
+
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                tasks = json.load(file)
+            with self._locked():
+                tasks = self.storage.load()
 
-            updated_tasks = []
-            found = False
-            for task_data in tasks:
-                if task_data["id"] == task_id:
-                    task = Task(**task_data)
-                    found = True
-                    # Применение изменений к задаче
-                    for key, value in kwargs.items():
-                        if hasattr(task, key):
-                            setattr(task, key, value)
-                    updated_tasks.append(task.to_dict())
-                else:
-                    updated_tasks.append(task_data)
+                updated_tasks = []
+                found = None
+                for task_data in tasks:
+                    if task_data["id"] == task_id:
+                        task = Task(**task_data)
+                        # Применение изменений к задаче
+                        for key, value in kwargs.items():
+                            if hasattr(task, key):
+                                setattr(task, key, value)
+                        found = task.to_dict()
+                        updated_tasks.append(found)
+                    else:
+                        updated_tasks.append(task_data)
 
-            if not found:
-                print(f"Задача с ID {task_id} не найдена.")
-                return
+                if found is None:
+                    print(f"Задача с ID {task_id} не найдена.")
+                    return
 
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(updated_tasks, file, indent=4, ensure_ascii=False)
+                changes = [Change("edit", task_id, found)]
+                self.storage.save(updated_tasks, changes)
+                self._publish(changes)
         except (FileNotFoundError, json.JSONDecodeError):
             print("Ошибка при редактировании задачи.")
 
+    @instrumented("search_tasks")
     def search_tasks(self, keyword: Optional[str] = None,
                     category: Optional[str] = None,
                     status: Optional[str] = None) -> List[Task]:
@@ -140,41 +497,220 @@ class TaskManager:
         :param status: статус для поиска.
         :return: список найденных задач.
         """
-        result = []
+        if self._store is not None:
+            keyword = keyword.lower() if keyword else None
+            wanted = status_key(status) if status else None
+            if status and wanted is None:
+                return []
+            candidates = self._store.indexes.text.candidates(keyword) if keyword else None
+            all_tasks = self._store.tasks()
+            if candidates is None:
+                tasks = self._indexed_tasks(category, wanted)
+            else:
+                # Кандидаты из триграммного индекса проверяются обычным сравнением подстрок
+                tasks = [
+                    all_tasks[task_id] for task_id in sorted(candidates)
+                    if (not category or all_tasks[task_id].category == category)
+                    and (wanted is None or all_tasks[task_id]._status == wanted)
+                ]
+            return [
+                task.copy() for task in tasks
+                if not keyword or keyword in task.title.lower() or keyword in task.description.lower()
+            ]
+
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                for task_data in json.load(file):
-                    # Фильтрация задач по критериям
-                    if (
-                        (not keyword or keyword.lower() in task_data["title"].lower() or keyword.lower() in task_data["description"].lower())
-                        and (not category or task_data["category"] == category)
-                        and (not status or task_data["status"] == status)
-                    ):
-                        result.append(Task(**task_data))
+            return list(self._iter_matching_records(keyword, category, status))
         except (FileNotFoundError, json.JSONDecodeError):
-            pass
-        return result
+            return []
 
+    @instrumented("search_ranked")
+    def search_ranked(self, query: str, prefix: bool = False, limit: Optional[int] = None) -> List[Task]:
+        """
+        Ищет задачи, содержащие все слова запроса, и упорядочивает их по релевантности.
+        Регистр и различие «е»/«ё» не учитываются.
+        :param query: строка запроса.
+        :param prefix: считать ли слова запроса префиксами.
+        :param limit: максимальное число результатов.
+        :return: список задач, самые релевантные первыми.
+        """
+        if self._store is not None:
+            tasks = self._store.tasks()
+            index = self._store.indexes.text
+            return [tasks[task_id].copy() for task_id, _ in index.search(query, prefix, limit)]
+        tasks = {task.id: task for task in self.load_tasks()}
+        index = InvertedIndex()
+        index.rebuild(tasks.values())
+        return [tasks[task_id] for task_id, _ in index.search(query, prefix, limit)]
+
+    @instrumented("view_tasks")
     def view_tasks(self, category: Optional[str] = None) -> List[Task]:
         """
         Показывает список задач.
         :param category: категория для фильтрации.
         :return: список задач.
         """
+        if self._store is not None:
+            return [task.copy() for task in self._indexed_tasks(category, None)]
         tasks = self.load_tasks()
         return [task for task in tasks if task.category == category] if category else tasks
 
+    def scheduler(self) -> DeadlineScheduler:
+        """
+        Возвращает очередь сроков невыполненных задач (next_due, overdue, due_within).
+        В резидентном режиме очередь создается один раз и обновляется при каждом изменении задач;
+        в обычном — строится заново потоковым проходом по хранилищу.
+        :return: DeadlineScheduler.
+        """
+        if self._store is None:
+            scheduler = DeadlineScheduler()
+            scheduler.rebuild(self.iter_tasks())
+            return scheduler
+        if self._scheduler is None:
+            self._scheduler = DeadlineScheduler()
+            self._store.add_listener(self._scheduler)
+        self._store.tasks()
+        return self._scheduler
+
+    @instrumented("stats")
+    def stats(self, now: Optional[datetime] = None) -> StatsReport:
+        """
+        Возвращает статистику задач: число по категории × статусу × приоритету
+        (report.count(...), report.by("category")), долю выполненных и число просроченных.
+        В резидентном режиме счетчики обновляются при каждом изменении задач, и запрос
+        не перебирает задачи; в обычном — считаются потоковым проходом по словарям хранилища
+        и переиспользуются, пока файл не изменился.
+        :param now: момент, на который считаются просроченные задачи (по умолчанию datetime.now()).
+        :return: StatsReport.
+        """
+        if self._store is None:
+            signature = self.storage.signature()
+            if self._stats is None or signature is None or signature != self._stats_signature:
+                self._stats = TaskStats()
+                self._stats.rebuild_records(self.iter_records())
+                self._stats_signature = signature
+            return self._stats.report(now)
+        if self._stats is None:
+            self._stats = TaskStats()
+            self._store.add_listener(self._stats)
+        self._store.tasks()
+        return self._stats.report(now)
+
+    def query(self) -> Query:
+        """
+        Создает запрос к задачам, например:
+        query().where(priority="высокий", due_before="2025-01-01").order_by("due_date").limit(50).offset(100).
+        В резидентном режиме запрос использует индексы, в обычном — потоково читает хранилище.
+        :return: объект Query; результаты перебираются лениво.
+        """
+        if self._store is not None:
+            return Query(tasks=self._store.tasks, indexes=self._store.indexes)
+        return Query(records=self.iter_records)
+
+    @contextmanager
+    def transaction(self) -> Iterator[TaskBatch]:
+        """
+        Открывает транзакцию: изменения копятся в памяти и записываются одной операцией
+        при выходе из блока with. Исключение внутри блока отменяет все изменения.
+        Пример: with manager.transaction() as batch: batch.add_task(...)
+        Блокировка на время блока не удерживается: если файл тем временем изменил другой
+        процесс, фиксация отменяется с ConcurrentModificationError, и транзакцию можно повторить.
+        :return: объект TaskBatch с методами add_task, edit_task, delete_task, mark_task_as_completed.
+        :raises ValueError: при ошибке проверки данных в любой из операций.
+        :raises ConcurrentModificationError: если файл изменился во время транзакции.
+        """
+        if self._store is not None:
+            tasks = self._store.tasks()
+            indexes = self._store.indexes
+            batch = TaskBatch(tasks, indexes.title.count, indexes.next_id())
+        else:
+            version = self.storage.signature()
+            records = {record["id"]: record for record in self.storage.load()}
+            titles = Counter(record["title"] for record in records.values())
+            batch = TaskBatch(records, titles.__getitem__, (max(records) + 1) if records else 1)
+
+        yield batch
+
+        if not batch.changes:
+            return
+        if self._store is not None:
+            self._store.apply(batch.changes)
+            self._publish(batch.changes)
+            return
+        overlay = batch.overlay()
+        updated = []
+        for task_id, record in records.items():
+            if task_id in overlay:
+                if overlay[task_id] is not None:
+                    updated.append(overlay[task_id].to_dict())
+            else:
+                updated.append(record)
+        updated.extend(task.to_dict() for task_id, task in overlay.items() if task_id not in records and task is not None)
+        changes = [Change(op, task_id, task.to_dict() if task is not None else None)
+                   for op, task_id, task in batch.changes]
+        # Номера ленты выдаются под той же блокировкой, что и запись, — в порядке фиксации
+        with self._locked():
+            self.storage.save(updated, changes, expected_version=version)
+            self._publish(changes)
+
+    @instrumented("add_tasks")
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Добавляет несколько задач одной транзакцией.
+        :param tasks: словари с полями title, description, category, due_date, priority.
+        :return: ID добавленных задач.
+        :raises ValueError: если какая-либо задача не проходит проверку; тогда не добавляется ни одна.
+        """
+        with self.transaction() as batch:
+            return [batch.add_task(**task) for task in tasks]
+
+    @instrumented("edit_tasks")
+    def edit_tasks(self, updates: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Редактирует несколько задач одной транзакцией.
+        :param updates: новые значения полей по ID задачи.
+        :raises ValueError: если какая-либо задача не найдена; тогда не изменяется ни одна.
+        """
+        with self.transaction() as batch:
+            for task_id, changes in updates.items():
+                batch.edit_task(task_id, **changes)
+
+    @instrumented("delete_tasks")
+    def delete_tasks(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет несколько задач одной транзакцией.
+        :param task_ids: ID задач.
+        :raises ValueError: если какая-либо задача не найдена; тогда не удаляется ни одна.
+        """
+        with self.transaction() as batch:
+            for task_id in task_ids:
+                batch.delete_task(task_id)
+
+    @instrumented("mark_task_as_completed")
     def mark_task_as_completed(self, task_id: int):
         """
         Отмечает задачу как выполненную.
         :param task_id: ID задачи.
         :raises ValueError: если задача не найдена.
         """
-        tasks = self.load_tasks()
-        for task in tasks:
-            if task.id == task_id:  # Сравниваем по ID задачи
-                task.status = 'Выполнена'  # Исправляем статус на правильный
-                self.save_tasks(tasks)  # Сохраняем задачи обратно в файл
-                return
+        if self._store is not None:
+            task = self._store.tasks().get(task_id)
+            if task is None:
+                raise ValueError("Задача не найдена")
+            completed = self._edited_copy(task, {"status": Status.COMPLETED})
+            self._store.put(completed)
+            self._publish([Change("edit", task_id, completed)])
+            return
+
+        with self._locked():
+            records = self._load_records()
+            for index, task_data in enumerate(records):
+                if task_data["id"] == task_id:  # Сравниваем по ID задачи
+                    task = Task(**task_data)
+                    task.status = 'Выполнена'  # Исправляем статус на правильный
+                    records[index] = task.to_dict()
+                    changes = [Change("edit", task_id, records[index])]
+                    self.storage.save(records, changes)  # Сохраняем задачи обратно в файл
+                    self._publish(changes)
+                    return
         raise ValueError("Задача не найдена")
 
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import stat
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from Task import Task
+from Batch import TaskBatch
+from Storage import TaskStorage
+from TaskManager import TaskManager
+from AsyncTaskManager import AsyncTaskManager
+from TaskClient import (BATCH_OPERATIONS, HEADER, MAX_FRAME, READ_OPERATIONS, WRITE_OPERATIONS, encode_frame,
+                        encode_value)
+
+
+class TaskServer:
+    """
+    Локальный сервер задач: один процесс держит задачи в памяти и обслуживает
+    клиентов (TaskClient) через Unix-сокет или TCP на localhost, вместо того чтобы
+    каждый инструмент сам открывал и перечитывал файл задач.
+
+    Запросы одного соединения можно отправлять конвейером, не дожидаясь ответов.
+    Изменения всех клиентов проходят через очередь AsyncTaskManager и записываются
+    на диск группами; чтение выполняется сразу по задачам в памяти, но после
+    изменений, отправленных раньше по тому же соединению.
+    """
+
+    def __init__(self, file_path: str, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                 port: int = 0, storage: Optional[TaskStorage] = None, commit_delay: float = 0.0) -> None:
+        """
+        :param file_path: путь к файлу задач.
+        :param socket_path: путь к Unix-сокету; если не задан, сервер слушает TCP host:port.
+        :param host: адрес TCP.
+        :param port: порт TCP (0 — выбрать свободный, см. атрибут port после start()).
+        :param storage: хранилище задач; по умолчанию JSON-файл file_path.
+        :param commit_delay: сколько секунд копить изменения перед записью на диск.
+        """
+        self.tasks = AsyncTaskManager(file_path, storage=storage, commit_delay=commit_delay)
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    async def start(self) -> None:
+        """
+        Загружает задачи и начинает принимать соединения.
+        Оставшийся от прошлого запуска сокет удаляется; любой другой файл по пути сокета не трогается.
+        :raises FileExistsError: если путь сокета занят файлом, который не является сокетом.
+        """
+        if self.socket_path is not None:
+            try:
+                mode = os.lstat(self.socket_path).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(f"{self.socket_path} существует и не является сокетом")
+                os.remove(self.socket_path)
+        await self.tasks.start()
+        if self.socket_path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Перестает принимать соединения, дожидается записи изменений и закрывает хранилище.
+        """
+        if self._server is not None:
+            self._server.close()
+            for connection in list(self._connections):
+                connection.cancel()
+            await self._server.wait_closed()
+            self._server = None
+            if self.socket_path is not None and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        await self.tasks.close()
+
+    async def __aenter__(self) -> "TaskServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуживает соединение: запросы читаются по мере поступления, изменения ставятся
+        в очередь писателя, не дожидаясь ответа на предыдущие, и ответы отправляются по готовности.
+        """
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        last_write: Optional[asyncio.Task] = None
+        pending = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                    (size,) = HEADER.unpack(header)
+                    if size > MAX_FRAME:
+                        break
+                    request = json_loads(await reader.readexactly(size))
+                except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break
+                if "batch" in request or request.get("op") in WRITE_OPERATIONS:
+                    last_write = asyncio.create_task(self._respond(writer, request))
+                    pending.add(last_write)
+                    last_write.add_done_callback(pending.discard)
+                else:
+                    if last_write is not None and not last_write.done():
+                        await asyncio.wait([last_write])
+                    writer.write(encode_frame(execute(self.tasks.manager, request)))
+            if pending:
+                await asyncio.wait(pending)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, request: Dict[str, Any]) -> None:
+        """
+        Передает изменение (или пакет) писателю и отправляет ответ после записи на диск.
+        Пакет выполняется одной транзакцией: без чужих изменений между его операциями,
+        а при ошибке любой операции не применяется ни одна.
+        """
+        try:
+            if "batch" in request:
+                items = request["batch"]
+                results = await self.tasks.transaction(lambda batch: execute_batch(batch, items))
+                response = {"id": request.get("id"), "results": results}
+            else:
+                response = await self.tasks._submit(lambda manager: execute(manager, request))
+        except Exception as error:
+            # Ошибка записи на диск касается всех изменений группы
+            response = {"id": request.get("id"), "error": describe(error)}
+        if not writer.is_closing():
+            writer.write(encode_frame(response))
+
+
+def json_loads(data: bytes) -> Dict[str, Any]:
+    request = json.loads(data)
+    if not isinstance(request, dict):
+        raise ValueError("Запрос должен быть объектом JSON")
+    return request
+
+
+def describe(error: Exception) -> Dict[str, str]:
+    return {"type": type(error).__name__, "message": str(error)}
+
+
+def execute(manager: TaskManager, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Выполняет операцию запроса над TaskManager.
+    :param manager: TaskManager сервера.
+    :param request: запрос протокола.
+    :return: ответ с результатом или ошибкой и выводом операции.
+    """
+    response: Dict[str, Any] = {"id": request.get("id")} if "id" in request else {}
+    output = io.StringIO()
+    op = request.get("op")
+    try:
+        if op not in READ_OPERATIONS and op not in WRITE_OPERATIONS:
+            raise ValueError(f"Неизвестная операция: {op}")
+        args: List[Any] = list(request.get("args", ()))
+        kwargs: Dict[str, Any] = request.get("kwargs", {})
+        if op == "save_tasks":
+            args[0] = [Task(**record) for record in args[0]]
+        elif op == "edit_tasks":
+            args[0] = {task_id: changes for task_id, changes in args[0]}
+        elif op == "stats" and args and args[0] is not None:
+            args[0] = datetime.fromisoformat(args[0])
+        with redirect_stdout(output):
+            result = getattr(manager, op)(*args, **kwargs)
+        if op == "iter_records":
+            result = list(result)
+        elif op == "stats":
+            result = {"counts": [[*key, count] for key, count in result.counts.items()], "overdue": result.overdue}
+        elif op == "snapshot":
+            result = {"seq": result.seq, "tasks": [task.to_dict() for task in result]}
+        response["result"] = encode_value(result)
+    except Exception as error:
+        response["error"] = describe(error)
+    if output.getvalue():
+        response["output"] = output.getvalue()
+    return response
+
+
+def execute_batch(batch: TaskBatch, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Выполняет операции атомарного пакета над TaskBatch одной транзакции.
+    В отличие от TaskManager, ошибка любой операции (в том числе занятый заголовок или
+    ненайденная задача) выбрасывается и отменяет весь пакет.
+    :param batch: TaskBatch транзакции.
+    :param items: запросы протокола без id.
+    :return: ответы без id в порядке операций.
+    :raises ValueError: при операции, недоступной в пакете, или ошибке проверки данных.
+    """
+    responses = []
+    for item in items:
+        op = item.get("op")
+        if op not in BATCH_OPERATIONS:
+            raise ValueError(f"Операция {op} недоступна в атомарном пакете")
+        args: List[Any] = list(item.get("args", ()))
+        kwargs: Dict[str, Any] = item.get("kwargs", {})
+        result = None
+        if op == "find_task_by_id":
+            result = batch.get(*args, **kwargs)
+        elif op == "add_task":
+            # TaskManager.add_task ничего не возвращает: ответ пакета такой же
+            batch.add_task(*args, **kwargs)
+        elif op == "add_tasks":
+            result = [batch.add_task(**task) for task in args[0]]
+        elif op == "edit_tasks":
+            for task_id, changes in args[0]:
+                batch.edit_task(task_id, **changes)
+        elif op == "delete_tasks":
+            for task_id in args[0]:
+                batch.delete_task(task_id)
+        else:
+            getattr(batch, op)(*args, **kwargs)
+        responses.append({"result": encode_value(result)})
+    return responses
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Локальный сервер задач.")
+    parser.add_argument("--tasks", default="tasks.json", help="файл задач")
+    parser.add_argument("--socket", help="путь к Unix-сокету")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес TCP, если сокет не задан")
+    parser.add_argument("--port", type=int, default=8765, help="порт TCP")
+    parser.add_argument("--commit-delay", type=float, default=0.0, help="сколько секунд копить изменения перед записью")
+    args = parser.parse_args(argv)
+
+    server = TaskServer(args.tasks, args.socket, args.host, args.port, commit_delay=args.commit_delay)
+    address = args.socket or f"{args.host}:{args.port}"
+    print(f"Сервер задач слушает {address}. Клиенты: TASK_SERVER={address} python Main.py")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
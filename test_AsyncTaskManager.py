@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import pytest
+from unittest.mock import patch
+from AsyncTaskManager import AsyncTaskManager
+from Storage import JournalStorage
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def file_path(tmpdir):
+    return os.path.join(tmpdir, 'tasks.json')
+
+
+def read_file(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def test_concurrent_adds_group_commit(file_path):
+    async def scenario():
+        async with AsyncTaskManager(file_path) as manager:
+            with patch.object(manager.manager.storage, 'save', wraps=manager.manager.storage.save) as save:
+                await asyncio.gather(*(manager.add_task(f'Task {index}', 'Description', 'Work', '2024-12-01', 'High')
+                                       for index in range(200)))
+                assert save.call_count == manager.commits
+                assert manager.commits < 200
+    run(scenario())
+    tasks = read_file(file_path)
+    assert len(tasks) == 200
+    assert sorted(task['id'] for task in tasks) == list(range(1, 201))
+
+
+def test_reads_see_applied_changes(file_path):
+    async def scenario():
+        async with AsyncTaskManager(file_path) as manager:
+            await manager.add_task('Купить молоко', 'В магазине', 'Дом', '2024-12-01', 'Low')
+            await manager.edit_task(1, status='Выполнена', due_date='2025-01-15')
+            task = await manager.find_task_by_id(1)
+            assert task.status == 'Выполнена'
+            assert task.due_date.strftime('%Y-%m-%d') == '2025-01-15'
+            assert [task.id for task in await manager.search_tasks(keyword='молоко')] == [1]
+            assert [task.id async for task in manager.iter_tasks()] == [1]
+            await manager.delete_task(1)
+            assert await manager.view_tasks() == []
+    run(scenario())
+    assert read_file(file_path) == []
+
+
+def test_operation_error_only_fails_its_caller(file_path):
+    async def scenario():
+        async with AsyncTaskManager(file_path) as manager:
+            results = await asyncio.gather(
+                manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High'),
+                manager.mark_task_as_completed(42),
+                manager.add_task('Task 2', 'Description', 'Work', '2024-12-01', 'High'),
+                return_exceptions=True,
+            )
+            assert isinstance(results[1], ValueError)
+            assert results[0] is None and results[2] is None
+    run(scenario())
+    assert [task['title'] for task in read_file(file_path)] == ['Task 1', 'Task 2']
+
+
+def test_write_failure_rolls_back_the_group(file_path):
+    async def scenario():
+        async with AsyncTaskManager(file_path) as manager:
+            await manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+            save = manager.manager.storage.save
+            with patch.object(manager.manager.storage, 'save', side_effect=OSError('disk full')):
+                results = await asyncio.gather(
+                    manager.add_task('Task 2', 'Description', 'Work', '2024-12-01', 'High'),
+                    manager.edit_task(1, title='Edited'),
+                    return_exceptions=True,
+                )
+            assert all(isinstance(result, OSError) for result in results)
+            assert manager.manager.storage.save == save
+            assert [task.title for task in await manager.load_tasks()] == ['Task 1']
+            assert await manager.search_tasks(keyword='edited') == []
+            await manager.add_task('Task 3', 'Description', 'Work', '2024-12-01', 'High')
+    run(scenario())
+    assert [(task['id'], task['title']) for task in read_file(file_path)] == [(1, 'Task 1'), (2, 'Task 3')]
+
+
+def test_transaction_and_bulk_with_journal(file_path):
+    async def scenario():
+        async with AsyncTaskManager(file_path, storage=JournalStorage(file_path, fsync=False)) as manager:
+            ids = await manager.add_tasks({'title': f'Task {index}', 'description': 'Description', 'category': 'Work',
+                                           'due_date': '2024-12-01', 'priority': 'High'} for index in range(3))
+            assert ids == [1, 2, 3]
+            await manager.transaction(lambda batch: (batch.delete_task(1), batch.mark_task_as_completed(2)))
+            with pytest.raises(ValueError):
+                await manager.transaction(lambda batch: batch.delete_task(99))
+            assert [task.id for task in await manager.load_tasks()] == [2, 3]
+    run(scenario())
+    reopened = AsyncTaskManager(file_path, storage=JournalStorage(file_path, fsync=False))
+    tasks = run(reopened.load_tasks())
+    assert [(task.id, task.status) for task in tasks] == [(2, 'Выполнена'), (3, 'Не выполнена')]
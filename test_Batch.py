@@ -0,0 +1,99 @@
+import os
+import json
+import pytest
+from unittest.mock import patch
+from TaskManager import TaskManager
+from Storage import JournalStorage, JsonFileStorage
+
+
+def new_task(index, **overrides):
+    task = {'title': f'Task {index}', 'description': f'Description {index}', 'category': 'Work',
+            'due_date': '2024-12-01', 'priority': 'High'}
+    task.update(overrides)
+    return task
+
+
+@pytest.fixture(params=['json', 'resident', 'journal'])
+def task_manager(request, tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    if request.param == 'resident':
+        return TaskManager(file_path, resident=True)
+    if request.param == 'journal':
+        return TaskManager(file_path, storage=JournalStorage(file_path, fsync=False))
+    return TaskManager(file_path)
+
+
+def test_add_tasks_single_write(task_manager):
+    with patch.object(task_manager.storage, 'save', wraps=task_manager.storage.save) as save:
+        ids = task_manager.add_tasks(new_task(index) for index in range(1, 101))
+        assert save.call_count == 1
+    assert ids == list(range(1, 101))
+    assert len(task_manager.load_tasks()) == 100
+
+
+def test_transaction_mixed_operations(task_manager):
+    task_manager.add_tasks([new_task(1), new_task(2), new_task(3)])
+    with task_manager.transaction() as batch:
+        new_id = batch.add_task(**new_task(4))
+        batch.edit_task(1, title='Edited Task 1')
+        batch.mark_task_as_completed(2)
+        batch.delete_task(3)
+        batch.add_task(**new_task(3))
+        assert batch.get(new_id).title == 'Task 4'
+
+    tasks = {task.id: task for task in task_manager.load_tasks()}
+    assert sorted(tasks) == [1, 2, 4, 5]
+    assert tasks[1].title == 'Edited Task 1'
+    assert tasks[2].status == 'Выполнена'
+    assert tasks[5].title == 'Task 3'
+
+
+def test_transaction_rolls_back_on_error(task_manager):
+    task_manager.add_tasks([new_task(1)])
+    with pytest.raises(ValueError, match='уже существует'):
+        task_manager.add_tasks([new_task(2), new_task(3), new_task(2)])
+    with pytest.raises(ValueError, match='Неверный формат даты'):
+        task_manager.add_tasks([new_task(4), new_task(5, due_date='2024-13-01')])
+    with pytest.raises(ValueError, match='все поля'):
+        task_manager.add_tasks([new_task(6, description='')])
+    with pytest.raises(ValueError, match='не найдена'):
+        task_manager.delete_tasks([1, 42])
+    with pytest.raises(RuntimeError):
+        with task_manager.transaction() as batch:
+            batch.edit_task(1, title='Changed')
+            raise RuntimeError('abort')
+
+    assert [task.title for task in task_manager.load_tasks()] == ['Task 1']
+
+
+def test_edit_and_delete_tasks(task_manager):
+    task_manager.add_tasks([new_task(1), new_task(2), new_task(3)])
+    task_manager.edit_tasks({1: {'category': 'Home'}, 3: {'priority': 'Low'}})
+    task_manager.delete_tasks([2])
+
+    tasks = task_manager.load_tasks()
+    assert [(task.id, task.category, task.priority) for task in tasks] == [(1, 'Home', 'High'), (3, 'Work', 'Low')]
+
+
+def test_journal_batch_is_one_line(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JournalStorage(file_path, fsync=False)
+    task_manager = TaskManager(file_path, storage=storage)
+    task_manager.add_tasks([new_task(1), new_task(2)])
+    storage.close()
+
+    with open(storage.journal_path, encoding='utf-8') as file:
+        lines = file.readlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['op'] == 'batch'
+    assert len(JournalStorage(file_path).load()) == 2
+
+
+def test_resident_transaction_flushes_once(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True)
+    with patch.object(JsonFileStorage, 'save', wraps=task_manager.storage.save) as save:
+        task_manager.add_tasks(new_task(index) for index in range(1, 51))
+        assert save.call_count == 1
+    assert task_manager.indexes.next_id() == 51
+    assert len(TaskManager(file_path).load_tasks()) == 50
@@ -0,0 +1,61 @@
+import json
+import os
+from collections import Counter
+from Benchmark import (OPERATIONS, benchmark_size, compare_to_baseline, generate_tasks, main, percentile,
+                       run_benchmarks)
+from Task import Task
+
+
+def test_generate_tasks_is_deterministic_and_valid():
+    tasks = generate_tasks(500, seed=1)
+    assert tasks == generate_tasks(500, seed=1)
+    assert [task['id'] for task in tasks] == list(range(1, 501))
+    assert len({task['title'] for task in tasks}) == 500
+    assert all(Task(**task) for task in tasks)
+    assert Counter(task['category'] for task in tasks).most_common(1)[0][0] == 'Работа'
+
+
+def test_percentile():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentile([5.0], 0.99) == 5.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_benchmark_size_reports_all_operations():
+    result = benchmark_size(50, mode='resident', repeat=3)
+    assert set(result['operations']) == set(OPERATIONS)
+    for measured in result['operations'].values():
+        assert measured['count'] == 3
+        assert measured['p50_ms'] <= measured['p95_ms'] <= measured['max_ms']
+
+
+def test_run_benchmarks_reports_peak_memory_per_case():
+    large, small = run_benchmarks([5000, 10], ['resident'], repeat=1)
+    assert (large['size'], small['size']) == (5000, 10)
+    if large['peak_rss_kb'] is not None:
+        assert small['peak_rss_kb'] < large['peak_rss_kb']
+
+
+def test_compare_to_baseline():
+    def run(p50):
+        return [{'size': 10, 'mode': 'json', 'operations': {'add_task': {'p50_ms': p50}}}]
+
+    assert compare_to_baseline(run(1.1), run(1.0), tolerance=0.25) == []
+    regressions = compare_to_baseline(run(2.0), run(1.0), tolerance=0.25)
+    assert len(regressions) == 1
+    assert 'add_task' in regressions[0]
+
+
+def test_main_saves_results_and_checks_baseline(tmpdir, capsys):
+    output = os.path.join(tmpdir, 'results.json')
+    assert main(['--sizes', '20', '--repeat', '2', '--output', output]) == 0
+    with open(output, encoding='utf-8') as file:
+        saved = json.load(file)
+    assert saved[0]['size'] == 20
+
+    for measured in saved[0]['operations'].values():
+        measured['p50_ms'] = 1e-9
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(saved, file)
+    assert main(['--sizes', '20', '--repeat', '2', '--baseline', output]) == 1
+    assert 'Регрессия' in capsys.readouterr().out
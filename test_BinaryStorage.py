@@ -0,0 +1,149 @@
+import os
+import json
+import pytest
+from unittest.mock import patch
+from BinaryStorage import _INDEX_ENTRY, BinaryStorage, binary_to_json, json_to_binary
+from Storage import Change
+from Task import Task
+from TaskManager import TaskManager
+
+
+def make_record(task_id, title, **overrides):
+    record = {'id': task_id, 'title': title, 'description': 'Описание задачи', 'category': 'Работа',
+              'due_date': '2024-12-01', 'priority': 'высокий', 'status': 'Не выполнена'}
+    record.update(overrides)
+    return record
+
+
+def test_round_trip_through_json(tmpdir):
+    json_path = os.path.join(tmpdir, 'tasks.json')
+    binary_path = os.path.join(tmpdir, 'tasks.bin')
+    back_path = os.path.join(tmpdir, 'back.json')
+    records = [make_record(2, 'Задача 1'), make_record(7, 'Задача 2', status='Выполнена')]
+    records.append({'id': 9, 'title': 'Без статуса', 'description': 'd', 'category': 'c',
+                    'due_date': '2024-1-5', 'priority': 'Low'})
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(records, file, indent=4, ensure_ascii=False)
+
+    assert json_to_binary(json_path, binary_path) == 3
+    assert os.path.getsize(binary_path) < os.path.getsize(json_path) / 2
+    assert binary_to_json(binary_path, back_path) == 3
+    with open(back_path, encoding='utf-8') as file:
+        assert json.load(file) == records
+
+
+def test_get_reads_single_record(tmpdir):
+    storage = BinaryStorage(os.path.join(tmpdir, 'tasks.bin'), fsync=False)
+    storage.save([make_record(index, f'Задача {index}') for index in range(1, 101)])
+
+    reopened = BinaryStorage(storage.file_path)
+    with patch.object(BinaryStorage, 'load') as load:
+        assert reopened.get(42) == make_record(42, 'Задача 42')
+        assert reopened.get(1000) is None
+        load.assert_not_called()
+    reopened.close()
+
+
+def test_appends_edits_and_tombstones(tmpdir):
+    storage = BinaryStorage(os.path.join(tmpdir, 'tasks.bin'), fsync=False)
+    storage.ensure_exists()
+    storage.save([], [Change('add', 1, make_record(1, 'Задача 1')), Change('add', 2, make_record(2, 'Задача 2'))])
+    storage.save([], [Change('edit', 1, make_record(1, 'Изменена'))])
+    storage.save([], [Change('delete', 2, None)])
+
+    reopened = BinaryStorage(storage.file_path)
+    assert reopened.load() == [make_record(1, 'Изменена')]
+    assert reopened.get(1)['title'] == 'Изменена'
+    assert reopened.get(2) is None
+
+
+def test_recovers_from_crash_between_data_and_index(tmpdir):
+    storage = BinaryStorage(os.path.join(tmpdir, 'tasks.bin'), fsync=False)
+    storage.save([make_record(1, 'Задача 1')])
+    storage.save([], [Change('add', 2, make_record(2, 'Задача 2'))])
+    with open(storage.index_path, 'r+b') as file:
+        file.truncate(16)
+    with open(storage.file_path, 'ab') as file:
+        file.write(b'\x40\x00\x00')
+
+    reopened = BinaryStorage(storage.file_path)
+    assert reopened.get(2)['title'] == 'Задача 2'
+    assert os.path.getsize(reopened.index_path) == 32
+    reopened.save([], [Change('add', 3, make_record(3, 'Задача 3'))])
+    assert [record['id'] for record in BinaryStorage(storage.file_path).load()] == [1, 2, 3]
+
+
+def test_compacts_when_mostly_dead(tmpdir):
+    storage = BinaryStorage(os.path.join(tmpdir, 'tasks.bin'), fsync=False)
+    storage.save([make_record(1, 'Задача 1')])
+    for version in range(100):
+        storage.save([make_record(1, f'Версия {version}')], [Change('edit', 1, make_record(1, f'Версия {version}'))])
+    assert os.path.getsize(storage.file_path) < 70 * 100
+    assert storage.load() == [make_record(1, 'Версия 99')]
+
+
+def test_rejects_unknown_file(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.bin')
+    with open(file_path, 'wb') as file:
+        file.write(b'[]')
+    with pytest.raises(Exception, match='не является'):
+        BinaryStorage(file_path).load()
+
+
+def test_task_manager_on_binary_storage(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.bin')
+    task_manager = TaskManager(file_path, storage=BinaryStorage(file_path, fsync=False))
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.add_task('Task 2', 'Description 2', 'Work', '2024-12-02', 'Low')
+    task_manager.edit_task(1, title='Edited Task 1')
+    task_manager.delete_task(2)
+
+    assert task_manager.find_task_by_id(1).title == 'Edited Task 1'
+    assert task_manager.find_task_by_id(2) is None
+    assert [task.id for task in task_manager.view_tasks()] == [1]
+
+
+def test_dead_records_count_only_superseded_versions(tmpdir):
+    storage = BinaryStorage(os.path.join(tmpdir, 'tasks.bin'), fsync=False)
+    storage.save([make_record(index, f'Задача {index}') for index in range(1, 11)])
+    size = os.path.getsize(storage.file_path)
+    storage.save([], [Change('edit', 5, make_record(5, 'Задача 5', status='Выполнена'))])
+    assert os.path.getsize(storage.file_path) > size
+    assert storage._dead == 1
+
+    # Файл прежней версии с записью на месте: индекс дважды ссылается на одно смещение
+    reopened = BinaryStorage(storage.file_path)
+    reopened.get(1)
+    with open(storage.index_path, 'ab') as file:
+        file.write(_INDEX_ENTRY.pack(6, reopened._offsets[6]))
+    with patch.object(BinaryStorage, '_repair') as repair:
+        legacy = BinaryStorage(storage.file_path)
+        assert legacy.get(6) == make_record(6, 'Задача 6')
+        repair.assert_not_called()
+    assert legacy._dead == 1
+
+
+def test_save_tasks_writes_only_changed_records(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.bin')
+    for resident in (False, True):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        task_manager = TaskManager(file_path, storage=BinaryStorage(file_path, fsync=False), resident=resident)
+        task_manager.add_tasks([dict(title=f'Task {index}', description='Description', category='Work',
+                                     due_date='2024-12-01', priority='High') for index in range(1, 51)])
+        size = os.path.getsize(file_path)
+        seq = task_manager.feed.last_seq
+        tasks = [Task(**task.to_dict()) for task in task_manager.load_tasks()]
+        tasks[9].status = 'Выполнена'
+        del tasks[20]
+        with patch.object(BinaryStorage, '_rewrite') as rewrite:
+            task_manager.save_tasks(tasks)
+            rewrite.assert_not_called()
+        assert os.path.getsize(file_path) - size < 200  # одна новая версия и одно надгробие
+        assert [(entry.op, entry.task_id) for entry in task_manager.changes_since(seq)] == [('delete', 21), ('edit', 10)]
+
+        reopened = TaskManager(file_path, storage=BinaryStorage(file_path))
+        assert reopened.find_task_by_id(10).status == 'Выполнена'
+        assert len(reopened.load_tasks()) == 49
+        task_manager.close()
+        reopened.close()
@@ -0,0 +1,122 @@
+import os
+import pytest
+from ChangeFeed import ChangeFeed, ChangeFeedGap
+from Storage import Change
+from TaskManager import TaskManager
+
+
+@pytest.fixture(params=[False, True], ids=['plain', 'resident'])
+def manager(request, tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=request.param)
+    yield manager
+    manager.close()
+
+
+def add(manager, index, category='Work'):
+    manager.add_task(f'Task {index}', 'Description', category, '2024-12-01', 'High')
+
+
+def test_feed_records_every_mutation(manager):
+    add(manager, 1)
+    add(manager, 2)
+    manager.edit_task(1, title='Renamed')
+    manager.mark_task_as_completed(2)
+    manager.delete_task(1)
+    manager.delete_task(42)
+    with manager.transaction() as batch:
+        batch.add_task('Task 3', 'Description', 'Home', '2024-12-02', 'Low')
+        batch.delete_task(2)
+
+    entries = manager.changes_since(0)
+    assert [entry.seq for entry in entries] == [1, 2, 3, 4, 5, 6, 7]
+    assert [(entry.op, entry.task_id) for entry in entries] == [
+        ('add', 1), ('add', 2), ('edit', 1), ('edit', 2), ('delete', 1), ('add', 3), ('delete', 2)]
+    assert entries[2].record['title'] == 'Renamed'
+    assert entries[3].record['status'] == 'Выполнена'
+    assert entries[4].record is None
+    assert [entry.seq for entry in manager.changes_since(5)] == [6, 7]
+    assert manager.changes_since(7) == []
+
+
+def test_save_tasks_emits_reset(manager):
+    add(manager, 1)
+    add(manager, 2)
+    manager.save_tasks(list(reversed(manager.load_tasks())))
+    assert [(entry.op, entry.task_id) for entry in manager.changes_since(2)] == [('reset', None)]
+
+
+def test_snapshot_is_stable_while_writers_continue(manager):
+    add(manager, 1, 'Home')
+    add(manager, 2)
+    snapshot = manager.snapshot()
+    manager.edit_task(1, title='Changed')
+    add(manager, 3)
+    manager.delete_task(2)
+
+    assert snapshot.seq == 2
+    assert [task.id for task in snapshot.load_tasks()] == [1, 2]
+    assert snapshot.find_task_by_id(1).title == 'Task 1'
+    assert [task.id for task in snapshot.view_tasks('Work')] == [2]
+    assert [task.id for task in snapshot.search_tasks(keyword='task 1')] == [1]
+    assert snapshot.query().where(category='Home').count() == 1
+    assert [(entry.op, entry.task_id) for entry in manager.changes_since(snapshot.seq)] == [
+        ('edit', 1), ('add', 3), ('delete', 2)]
+    assert [task.title for task in manager.load_tasks()] == ['Changed', 'Task 3']
+
+
+def test_snapshot_survives_in_place_changes(manager):
+    add(manager, 1)
+    snapshot = manager.snapshot()
+    tasks = manager.load_tasks()
+    tasks[0].title = 'Changed'
+    manager.save_tasks(tasks)
+    snapshot.find_task_by_id(1).category = 'Home'
+    next(iter(snapshot)).status = 'Выполнена'
+
+    assert snapshot.find_task_by_id(1).to_dict() == dict(tasks[0].to_dict(), title='Task 1')
+    assert snapshot.query().where(category='Work').count() == 1
+    assert manager.find_task_by_id(1).title == 'Changed'
+
+def test_resident_snapshot_copies_only_on_write(tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=True)
+    add(manager, 1)
+    first = manager.snapshot()
+    second = manager.snapshot()
+    assert first._tasks is second._tasks
+    add(manager, 2)
+    assert len(first) == 1
+    assert len(manager.snapshot()) == 2
+
+
+def test_gap_after_capacity(tmpdir):
+    feed = ChangeFeed(capacity=3)
+    feed.append(Change('add', task_id, {}) for task_id in range(1, 6))
+    assert [entry.seq for entry in feed.changes_since(2)] == [3, 4, 5]
+    with pytest.raises(ChangeFeedGap):
+        feed.changes_since(1)
+
+
+def test_shared_feed_file_across_processes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    feed_path = os.path.join(tmpdir, 'tasks.feed')
+    writer = TaskManager(file_path, change_feed=ChangeFeed(feed_path, capacity=4))
+    reader = TaskManager(file_path, change_feed=ChangeFeed(feed_path, capacity=4))
+    add(writer, 1)
+    add(reader, 2)
+    add(writer, 3)
+    assert [(entry.seq, entry.task_id) for entry in reader.changes_since(0)] == [(1, 1), (2, 2), (3, 3)]
+
+    # После ротации файл содержит только последние записи, нумерация продолжается
+    for index in range(4, 12):
+        add(writer, index)
+    assert reader.feed.last_seq == 11
+    assert [entry.seq for entry in reader.changes_since(7)] == [8, 9, 10, 11]
+    with pytest.raises(ChangeFeedGap):
+        reader.changes_since(3)
+
+    # Недописанная строка (сбой при записи) отбрасывается следующей записью
+    with open(feed_path, 'ab') as file:
+        file.write(b'{"seq": 12, "op"')
+    add(reader, 12)
+    assert [(entry.seq, entry.task_id) for entry in writer.changes_since(11)] == [(12, 12)]
+    assert ChangeFeed(feed_path).last_seq == 12
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from FileLock import FileLock, LockTimeout
+from TaskManager import TaskManager
+from Storage import ConcurrentModificationError, JsonFileStorage, StorageError
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='fcntl недоступен')
+
+
+def test_exclusive_lock_blocks_other_holders(tmpdir):
+    path = os.path.join(tmpdir, 'tasks.json.lock')
+    first, second = FileLock(path), FileLock(path, timeout=0.05)
+    with first.exclusive():
+        with pytest.raises(LockTimeout):
+            with second.shared():
+                pass
+    assert second.stats.timeouts == 1
+    assert second.stats.contended == 0
+
+    with second.exclusive():
+        pass
+    assert second.stats.acquisitions == 1
+
+
+def test_shared_locks_coexist_and_nest(tmpdir):
+    path = os.path.join(tmpdir, 'tasks.json.lock')
+    first, second = FileLock(path), FileLock(path, timeout=0.05)
+    with first.shared(), second.shared():
+        pass
+    with first.exclusive():
+        with first.shared():
+            with first.exclusive():
+                pass
+    with first.shared():
+        with pytest.raises(RuntimeError):
+            with first.exclusive():
+                pass
+
+
+def test_atomic_save_keeps_mode_and_leaves_no_temp_files(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JsonFileStorage(file_path)
+    storage.ensure_exists()
+    os.chmod(file_path, 0o640)
+    inode = os.stat(file_path).st_ino
+
+    storage.save([{'id': 1}])
+    assert os.stat(file_path).st_ino != inode
+    assert os.stat(file_path).st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmpdir)) == ['tasks.json', 'tasks.json.lock']
+
+
+def test_optimistic_version_check(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JsonFileStorage(file_path)
+    storage.ensure_exists()
+    version = storage.signature()
+    storage.save([{'id': 1}])
+    with pytest.raises(ConcurrentModificationError):
+        storage.save([{'id': 2}], expected_version=version)
+    assert storage.load() == [{'id': 1}]
+
+
+def test_transaction_detects_lost_update(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path)
+    other = TaskManager(file_path)
+    with pytest.raises(ConcurrentModificationError):
+        with task_manager.transaction() as batch:
+            batch.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+            other.add_task('Task 2', 'Description 2', 'Work', '2024-12-01', 'High')
+    assert [task.title for task in task_manager.load_tasks()] == ['Task 2']
+
+
+def test_corrupt_file_is_not_overwritten(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write('[{"id": 1, "title": ')
+
+    TaskManager(file_path).add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    resident = TaskManager(file_path, resident=True)
+    with pytest.raises(StorageError):
+        resident.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    # Поврежденный файл не выдается за пустой список задач
+    with pytest.raises(StorageError, match='поврежден'):
+        resident.load_tasks()
+    with pytest.raises(StorageError):
+        resident.view_tasks()
+
+    with open(file_path, encoding='utf-8') as file:
+        assert file.read() == '[{"id": 1, "title": '
+
+
+def test_concurrent_processes_do_not_lose_updates(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    TaskManager(file_path)
+    script = (
+        "import sys\n"
+        "from TaskManager import TaskManager\n"
+        "manager = TaskManager(sys.argv[1])\n"
+        "for index in range(10):\n"
+        "    manager.add_task(f'Task {sys.argv[2]}-{index}', 'Description', 'Work', '2024-12-01', 'High')\n"
+    )
+    root = os.path.dirname(os.path.abspath(__file__))
+    workers = [subprocess.Popen([sys.executable, '-c', script, file_path, str(worker)], cwd=root)
+               for worker in range(4)]
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+
+    with open(file_path, encoding='utf-8') as file:
+        tasks = json.load(file)
+    assert len(tasks) == 40
+    assert sorted(task['id'] for task in tasks) == list(range(1, 41))
@@ -0,0 +1,84 @@
+import os
+from Task import Task
+from FullText import InvertedIndex, fold, tokenize
+from TaskManager import TaskManager
+
+
+def make_task(task_id, title, description='Описание'):
+    return Task(task_id, title, description, 'Работа', '2024-12-01', 'высокий')
+
+
+def test_fold_and_tokenize():
+    assert fold('ЁЛКА') == 'елка'
+    assert tokenize('Купить Ёлку, 2 шт.') == ['купить', 'елку', '2', 'шт']
+
+
+def test_candidates_are_superset_of_substring_matches():
+    index = InvertedIndex()
+    index.rebuild([make_task(1, 'Отчет за квартал'), make_task(2, 'Квартальный план'), make_task(3, 'Покупки')])
+    assert index.candidates('вартал') == {1, 2}
+    assert index.candidates('ква') == {1, 2}
+    assert index.candidates('отпуск') == set()
+    assert index.candidates('за') is None
+
+
+def test_ranked_search_prefers_title_matches():
+    index = InvertedIndex()
+    index.rebuild([
+        make_task(1, 'Планерка', 'обсудить отчет'),
+        make_task(2, 'Отчет', 'подготовить отчет'),
+        make_task(3, 'Покупки', 'молоко'),
+    ])
+    assert [task_id for task_id, _ in index.search('отчет')] == [2, 1]
+    assert index.search('отчет молоко') == []
+    assert [task_id for task_id, _ in index.search('отч', prefix=True, limit=1)] == [2]
+
+
+def test_incremental_update():
+    index = InvertedIndex()
+    old = make_task(1, 'Старый заголовок')
+    index.rebuild([old])
+    index.update(old, make_task(1, 'Новый заголовок'))
+    assert index.search('старый') == []
+    assert [task_id for task_id, _ in index.search('новый')] == [1]
+
+    index.update(make_task(1, 'Новый заголовок'), None)
+    assert index.search('заголовок') == []
+    assert index.candidates('заголовок') == set()
+
+
+def test_resident_search_tasks_uses_index(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True)
+    task_manager.add_task('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'высокий')
+    task_manager.add_task('Ёлка', 'Купить ёлку', 'Дом', '2024-12-20', 'низкий')
+    task_manager.add_task('Task 3', 'Description 3', 'Work', '2024-12-03', 'Low')
+    task_manager.edit_task(1, description='Годовой отчет')
+
+    assert [task.id for task in task_manager.search_tasks(keyword='ОТЧЕТ')] == [1]
+    assert task_manager.search_tasks(keyword='квартальный') == []
+    assert [task.id for task in task_manager.search_tasks(keyword='ёлку', category='Дом')] == [2]
+    assert [task.id for task in task_manager.search_tasks(keyword='k 3')] == [3]
+
+
+def test_resident_keyword_search_sees_current_file(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    TaskManager(file_path).add_task('Молоко', 'Купить молоко', 'Дом', '2024-12-01', 'низкий')
+    task_manager = TaskManager(file_path, resident=True)
+    assert [task.title for task in task_manager.search_tasks('молоко')] == ['Молоко']
+
+    # Индекс, построенный до записи другим процессом, тоже должен увидеть новые задачи
+    TaskManager(file_path).add_task('Хлеб', 'Купить хлеб', 'Дом', '2024-12-02', 'низкий')
+    assert [task.title for task in task_manager.search_tasks('купить')] == ['Молоко', 'Хлеб']
+    assert [task.title for task in task_manager.search_ranked('хлеб')] == ['Хлеб']
+    assert [task.id for task in TaskManager(file_path, resident=True).query().where(keyword='хлеб')] == [2]
+
+def test_search_ranked_in_both_modes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path)
+    task_manager.add_task('Планерка', 'обсудить отчет', 'Работа', '2024-12-01', 'высокий')
+    task_manager.add_task('Отчет', 'подготовить отчет', 'Работа', '2024-12-02', 'высокий')
+
+    assert [task.id for task in task_manager.search_ranked('отчет')] == [2, 1]
+    resident = TaskManager(file_path, resident=True)
+    assert [task.id for task in resident.search_ranked('ОТЧ', prefix=True)] == [2, 1]
@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+import pytest
+from unittest.mock import patch
+from TaskManager import TaskManager
+from ImportExport import detect_format, export_tasks, import_tasks, main, validate_chunk
+
+
+def task_row(index, **overrides):
+    row = {'title': f'Task {index}', 'description': f'Description {index}', 'category': 'Work',
+           'due_date': '2024-12-01', 'priority': 'High'}
+    row.update(overrides)
+    return row
+
+
+def write_jsonl(file_path, rows):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for row in rows:
+            file.write((row if isinstance(row, str) else json.dumps(row, ensure_ascii=False)) + '\n')
+
+
+@pytest.fixture
+def task_manager(tmpdir):
+    return TaskManager(os.path.join(tmpdir, 'tasks.json'))
+
+
+def test_detect_format():
+    assert detect_format('data.CSV') == 'csv'
+    assert detect_format('data.ndjson') == 'jsonl'
+    assert detect_format('data.txt', 'jsonl') == 'jsonl'
+    with pytest.raises(ValueError):
+        detect_format('data.txt')
+
+
+def test_validate_chunk_reports_errors_with_line_numbers():
+    records, errors = validate_chunk([
+        (1, json.dumps(task_row(1, due_date='2024-1-5'))),
+        (2, '{broken'),
+        (3, json.dumps(task_row(3, priority=''))),
+        (4, json.dumps(task_row(4, due_date='01.12.2024'))),
+        (5, '[1, 2]'),
+        (6, json.dumps(task_row(6, due_date=20241201))),
+        (7, json.dumps(task_row(7, status=1))),
+        (8, json.dumps(task_row(8, status='В процессе'))),
+    ])
+    assert records == [{'title': 'Task 1', 'description': 'Description 1', 'category': 'Work',
+                        'due_date': '2024-01-05', 'priority': 'High', 'status': 'Не выполнена'}]
+    assert [line for line, message in errors] == [2, 3, 4, 5, 6, 7, 8]
+    assert 'priority' in errors[1][1]
+    assert 'Неверный формат даты' in errors[2][1]
+    assert 'due_date' in errors[4][1]
+    assert 'Неизвестный статус' in errors[6][1]
+
+
+def test_import_jsonl_single_commit_and_dedup(task_manager, tmpdir):
+    task_manager.add_task('Task 0', 'Existing', 'Work', '2024-12-01', 'High')
+    source = os.path.join(tmpdir, 'import.jsonl')
+    rows = [task_row(index) for index in range(50)] + [task_row(7), task_row(99, due_date='bad')]
+    write_jsonl(source, rows)
+    reports = []
+    with patch.object(task_manager.storage, 'save', wraps=task_manager.storage.save) as save:
+        stats = import_tasks(task_manager, source, chunk_size=10, workers=0, progress=lambda s: reports.append(s.read))
+        assert save.call_count == 1
+    assert (stats.read, stats.imported, stats.duplicates, stats.invalid) == (52, 49, 2, 1)
+    assert stats.errors[0][0] == 52
+    assert reports == [10, 20, 30, 40, 50, 52]
+    tasks = task_manager.load_tasks()
+    assert len(tasks) == 50
+    assert [task.id for task in tasks] == list(range(1, 51))
+
+
+def test_import_skips_rows_with_unknown_status(task_manager, tmpdir):
+    source = os.path.join(tmpdir, 'import.jsonl')
+    write_jsonl(source, [task_row(1), task_row(2, status='В процессе'), task_row(3, status='выполнено')])
+    stats = import_tasks(task_manager, source, workers=0)
+    assert (stats.imported, stats.invalid) == (2, 1)
+    assert stats.errors[0][0] == 2
+    assert [task.status for task in task_manager.load_tasks()] == ['Не выполнена', 'Выполнена']
+
+def test_import_csv_with_process_pool(task_manager, tmpdir):
+    source = os.path.join(tmpdir, 'import.csv')
+    with open(source, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, ['title', 'description', 'category', 'due_date', 'priority', 'status'])
+        writer.writeheader()
+        for index in range(30):
+            writer.writerow(task_row(index, title=f'Задача, "{index}"', status='Выполнена' if index % 2 else ''))
+    stats = import_tasks(task_manager, source, chunk_size=7, workers=2)
+    assert stats.imported == 30
+    tasks = task_manager.load_tasks()
+    assert tasks[0].title == 'Задача, "0"'
+    assert [task.status for task in tasks[:2]] == ['Не выполнена', 'Выполнена']
+
+
+def test_export_roundtrip(task_manager, tmpdir):
+    for index in range(5):
+        task_manager.add_task(f'Задача {index}', 'Описание,\nс переводом строки', 'Дом', '2024-12-01', 'Low')
+    for name in ('export.jsonl', 'export.csv'):
+        target = os.path.join(tmpdir, name)
+        assert export_tasks(task_manager, target, fsync=False) == 5
+        other = TaskManager(os.path.join(tmpdir, f'{name}.tasks.json'))
+        stats = import_tasks(other, target, workers=0)
+        assert stats.imported == 5
+        assert [task.to_dict() for task in other.load_tasks()] == [task.to_dict() for task in task_manager.load_tasks()]
+
+
+def test_export_does_not_create_tasks(task_manager, tmpdir):
+    task_manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    with patch('TaskManager.Task') as task_class:
+        export_tasks(task_manager, os.path.join(tmpdir, 'export.jsonl'), fsync=False)
+        task_class.assert_not_called()
+
+
+def test_main_cli(tmpdir, capsys):
+    tasks_path = os.path.join(tmpdir, 'tasks.json')
+    source = os.path.join(tmpdir, 'import.jsonl')
+    write_jsonl(source, [task_row(1), '{broken'])
+    assert main(['import', source, '--tasks', tasks_path, '--workers', '0']) == 1
+    output = capsys.readouterr()
+    assert 'Импортировано задач: 1' in output.out
+    assert 'Строка 2' in output.err
+    target = os.path.join(tmpdir, 'export.csv')
+    assert main(['export', target, '--tasks', tasks_path]) == 0
+    with open(target, encoding='utf-8', newline='') as file:
+        assert [row['title'] for row in csv.DictReader(file)] == ['Task 1']
@@ -0,0 +1,83 @@
+import os
+from datetime import datetime
+from Task import Task
+from Index import HashIndex, SortedIndex, TaskIndexes
+from TaskManager import TaskManager
+
+
+def make_task(task_id, title='Task', category='Work', due_date='2024-12-01', status='Не выполнена'):
+    return Task(task_id, title, 'Description', category, due_date, 'High', status)
+
+
+def test_hash_index_update():
+    index = HashIndex(lambda task: task.category)
+    first, second = make_task(1), make_task(2, category='Personal')
+    index.rebuild([first, second])
+    assert index.get('Work') == [1]
+
+    index.update(first, make_task(1, category='Personal'))
+    assert 'Work' not in index
+    assert index.get('Personal') == [2, 1]
+
+    index.update(second, None)
+    assert index.count('Personal') == 1
+
+
+def test_sorted_index_range():
+    index = SortedIndex(lambda task: task.due_date)
+    tasks = [make_task(1, due_date='2024-12-03'), make_task(2, due_date='2024-12-01'), make_task(3, due_date='2024-12-02')]
+    index.rebuild(tasks)
+    assert list(index.range()) == [2, 3, 1]
+    assert list(index.range(datetime(2024, 12, 2), datetime(2024, 12, 3))) == [3]
+
+    index.update(tasks[0], None)
+    assert list(index.range(datetime(2024, 12, 2))) == [3]
+
+
+def test_task_indexes_next_id():
+    indexes = TaskIndexes()
+    assert indexes.next_id() == 1
+    indexes.rebuild([make_task(1), make_task(5)])
+    assert indexes.next_id() == 6
+    indexes.update(make_task(5), None)
+    assert indexes.next_id() == 2
+
+
+def test_resident_manager_keeps_indexes_current(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True)
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.add_task('Task 2', 'Description 2', 'Personal', '2024-12-02', 'Low')
+    task_manager.edit_task(1, category='Home')
+    task_manager.mark_task_as_completed(2)
+
+    indexes = task_manager.indexes
+    assert indexes.category.get('Home') == [1]
+    assert 'Work' not in indexes.category
+    assert indexes.status.get('Выполнена') == [2]
+    assert list(indexes.due_date.range(datetime(2024, 12, 2))) == [2]
+
+    task_manager.delete_task(2)
+    assert indexes.title.get('Task 2') == []
+    assert indexes.next_id() == 2
+
+
+def test_resident_manager_uses_indexes_for_filters(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True)
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.add_task('Task 2', 'Description 2', 'Work', '2024-12-02', 'Low')
+    task_manager.add_task('Task 3', 'Description 3', 'Personal', '2024-12-03', 'Low')
+    task_manager.add_task('Task 1', 'Duplicate', 'Work', '2024-12-04', 'Low')
+    task_manager.mark_task_as_completed(2)
+
+    assert [task.id for task in task_manager.view_tasks('Work')] == [1, 2]
+    assert [task.id for task in task_manager.search_tasks(category='Work', status='Выполнена')] == [2]
+    assert [task.id for task in task_manager.search_tasks(keyword='task 3', status='Не выполнена')] == [3]
+    assert task_manager.search_tasks(category='Missing') == []
+    assert len(task_manager.view_tasks()) == 3
+
+
+def test_non_resident_manager_has_no_indexes(tmpdir):
+    task_manager = TaskManager(os.path.join(tmpdir, 'tasks.json'))
+    assert task_manager.indexes is None
@@ -0,0 +1,63 @@
+import os
+import json
+import pytest
+from JsonStream import iter_json_array
+from TaskManager import TaskManager
+
+
+def write_json(file_path, data, **kwargs):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, **kwargs)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64 * 1024])
+def test_iter_json_array_matches_json_load(tmpdir, chunk_size):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    data = [{'id': index, 'title': f'Задача {index}', 'tags': [1, 2.5, None, True], 'n': 12345} for index in range(20)]
+    data.append(678)
+    write_json(file_path, data, indent=4)
+
+    assert list(iter_json_array(file_path, chunk_size)) == data
+
+
+def test_iter_json_array_empty_and_compact(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_json(file_path, [])
+    assert list(iter_json_array(file_path)) == []
+
+    write_json(file_path, [{'id': 1}, {'id': 2}], separators=(',', ':'))
+    assert list(iter_json_array(file_path, 2)) == [{'id': 1}, {'id': 2}]
+
+
+@pytest.mark.parametrize('content', ['', '{}', '[{"id": 1},', '[{"id": 1}] x', '[{"id": 1} {"id": 2}]'])
+def test_iter_json_array_rejects_invalid(tmpdir, content):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(file_path, 4))
+
+
+def test_iter_json_array_stops_early(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write('[{"id": 1}, {"id": 2}, broken')
+    records = iter_json_array(file_path, 4)
+    assert next(records) == {'id': 1}
+
+
+def test_task_manager_streaming_api(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path)
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.add_task('Task 2', 'Description 2', 'Personal', '2024-12-02', 'Low')
+
+    assert [task.id for task in task_manager.iter_tasks()] == [1, 2]
+    assert [task.id for task in task_manager.iter_search(category='Personal')] == [2]
+    assert next(task_manager.iter_search(keyword='task')).id == 1
+
+    with open(file_path, 'a', encoding='utf-8') as file:
+        file.write('garbage')
+    assert task_manager.find_task_by_id(1).title == 'Task 1'
+    assert task_manager.search_tasks(keyword='task') == []
+    assert [task.id for task in task_manager.iter_tasks()] == [1, 2]
@@ -1,7 +1,14 @@
+import io
+import json
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import patch, MagicMock
+from Benchmark import generate_tasks
+from Storage import JsonFileStorage
 from TaskManager import TaskManager
-from Main import handle_add_task, handle_delete_task, handle_edit_task, handle_view_tasks, handle_search_tasks, handle_mark_completed
+from Main import main, handle_exit, handle_add_task, handle_delete_task, handle_edit_task, handle_view_tasks, handle_search_tasks, handle_mark_completed
 
 
 @pytest.fixture
@@ -90,3 +97,135 @@ def test_handle_mark_completed_task_not_found(mock_manager, capsys):
     captured = capsys.readouterr()
     assert "Задача не найдена." in captured.out
     mock_manager.edit_task.assert_not_called()
+
+
+def test_handle_exit_closes_manager(mock_manager):
+    """Тестирует, что выход записывает отложенные изменения."""
+    with pytest.raises(SystemExit):
+        handle_exit(mock_manager)
+    mock_manager.close.assert_called_once_with()
+
+def test_handle_view_tasks_pages(mock_manager, capsys):
+    """Тестирует постраничный просмотр задач."""
+    tasks = [f"Задача {index}" for index in range(25)]
+    mock_manager.query.return_value.where.return_value = iter(tasks)
+    with patch("builtins.input", side_effect=["Работа", "", "q"]):
+        handle_view_tasks(mock_manager)
+    mock_manager.query.return_value.where.assert_called_once_with(category="Работа")
+    captured = capsys.readouterr()
+    assert "Задача 19" in captured.out
+    assert "Задача 20" not in captured.out
+
+
+# Секунд на импорт Main и загрузку 5000 задач из кэша. Обычно хватает 0.5 с, но на нагруженной машине
+# время непредсказуемо, поэтому по умолчанию проверяется только грубая регрессия; строгий предел —
+# через переменную окружения, например STARTUP_BUDGET=0.5. Точно проверяется состав импортов.
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', '5.0'))
+
+
+def test_startup_budget(tmpdir):
+    """Проверяет время запуска CLI и то, что тяжелые модули не загружаются при старте."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JsonFileStorage(file_path, fsync=False, cache=True)
+    storage.ensure_exists()
+    storage.save(generate_tasks(5000, seed=1))
+    script = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        "from Main import open_manager\n"
+        f"tasks = open_manager({file_path!r}).load_tasks()\n"
+        "elapsed = time.perf_counter() - started\n"
+        "heavy = [name for name in ('asyncio', 'socket', 'cProfile', 'pstats', 'tracemalloc', 'logging',"
+        " 'concurrent.futures', 'tempfile') if name in sys.modules]\n"
+        "print(len(tasks), elapsed, ','.join(heavy))\n"
+    )
+    env = dict(os.environ)
+    env.pop('TASK_SERVER', None)
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    count, elapsed, heavy = (result.stdout.strip().split(' ') + [''])[:3]
+    assert int(count) == 5000
+    assert heavy == ''
+    assert float(elapsed) < STARTUP_BUDGET
+
+
+def run_main(argv, capsys, stdin=''):
+    with patch('sys.stdin', io.StringIO(stdin)):
+        code = main(argv)
+    return code, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_cli_single_commands(tmpdir, capsys):
+    """Тестирует отдельные команды неинтерактивного режима."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    code, [result] = run_main(['--tasks', file_path, 'add', '--title', 'Отчет', '--description', 'Квартальный',
+                               '--category', 'Работа', '--due-date', '2024-12-01', '--priority', 'высокий'], capsys)
+    assert (code, result['result'], result['saved']) == (0, 1, True)
+    code, [result] = run_main(['--tasks', file_path, 'complete', '1'], capsys)
+    assert code == 0
+    code, [result] = run_main(['--tasks', file_path, 'search', '--status', 'выполнено'], capsys)
+    assert [task['title'] for task in result['result']] == ['Отчет']
+    code, [result] = run_main(['--tasks', file_path, 'delete', '42'], capsys)
+    assert (code, result['ok']) == (1, False)
+    code, [result] = run_main(['--tasks', file_path, 'edit'], capsys)
+    assert (code, result['ok']) == (2, False)
+
+
+def test_cli_batch_loads_and_saves_once(tmpdir, capsys):
+    """Тестирует пакет команд: одна загрузка, одна запись, результат каждой команды в JSON."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    commands = [f'add --title "Задача {index}" --description Описание --category Работа '
+                f'--due-date 2024-12-01 --priority низкий' for index in range(1, 101)]
+    commands += ['# комментарий', '', 'edit 5 --title "Новое название"', 'complete 7', 'delete 9',
+                 'delete 500', 'unknown', 'view --category Работа']
+    with patch.object(JsonFileStorage, 'load', autospec=True, side_effect=JsonFileStorage.load) as load, \
+            patch.object(JsonFileStorage, 'save', autospec=True, side_effect=JsonFileStorage.save) as save:
+        code, lines = run_main(['--tasks', file_path, 'batch'], capsys, stdin='\n'.join(commands))
+    assert load.call_count <= 1 and save.call_count == 1
+    assert code == 1
+    *results, summary = lines
+    assert summary == {'failed': 2, 'saved': True}
+    assert [result['line'] for result in results if not result['ok']] == [106, 107]
+    assert len(results[-1]['result']) == 99
+
+    tasks = TaskManager(file_path)
+    assert tasks.find_task_by_id(5).title == 'Новое название'
+    assert tasks.find_task_by_id(7).status == 'Выполнена'
+    assert tasks.find_task_by_id(9) is None
+
+
+def test_cli_atomic_batch(tmpdir, capsys):
+    """Тестирует пакет, который при ошибке не сохраняет ничего."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    batch_path = os.path.join(tmpdir, 'commands.txt')
+    with open(batch_path, 'w', encoding='utf-8') as file:
+        file.write('add --title A --description B --category C --due-date 2024-12-01 --priority низкий\n'
+                   'add --title A2 --description B --category C --due-date 01.12.2024 --priority низкий\n')
+    code, lines = run_main(['--tasks', file_path, '--atomic', 'batch', batch_path], capsys)
+    assert code == 1 and lines[-1] == {'failed': 1, 'saved': False}
+    assert TaskManager(file_path).load_tasks() == []
+
+
+def test_cli_batch_help_and_global_options_are_line_errors(tmpdir, capsys):
+    """Тестирует, что -h и общие опции в строке пакета — ошибка строки, а не выход из программы."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    commands = ['add --title A --description B --category C --due-date 2024-12-01 --priority низкий',
+                'view -h', '--tasks other.json view', 'view --atomic', 'batch commands.txt', 'view']
+    code, lines = run_main(['--tasks', file_path, 'batch'], capsys, stdin='\n'.join(commands))
+    *results, summary = lines
+    assert code == 1 and summary == {'failed': 4, 'saved': True}
+    assert [result['ok'] for result in results] == [True, False, False, False, False, True]
+    assert '--tasks' in results[2]['error'] and '--atomic' in results[3]['error']
+    assert [task.title for task in TaskManager(file_path).load_tasks()] == ['A']
+    assert not os.path.exists(os.path.join(tmpdir, 'other.json'))
+
+
+def test_menu_reports_corrupt_file(tmpdir, capsys):
+    """Тестирует, что поврежденный файл задач показывается ошибкой, а не пустым списком."""
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write('[{"id": 1, "title": ')
+    with patch("builtins.input", side_effect=["4", "", "7"]), pytest.raises(SystemExit):
+        main(['--tasks', file_path])
+    output = capsys.readouterr().out
+    assert "поврежден" in output and "Задач не найдено" not in output
@@ -0,0 +1,104 @@
+import logging
+import os
+import pytest
+import Metrics
+from Metrics import LoggingSink, MetricsRegistry, PrometheusFileSink, add_sink, profile, remove_sink, timed
+from Task import Task
+from TaskManager import TaskManager
+from Storage import JournalStorage
+
+
+@pytest.fixture
+def registry():
+    sink = MetricsRegistry()
+    add_sink(sink)
+    yield sink
+    remove_sink(sink)
+
+
+def test_disabled_by_default():
+    assert not Metrics.enabled()
+    assert timed('anything') is timed('other')
+    assert Task.__init__.__code__.co_filename.endswith('Task.py')
+
+
+def test_operation_and_storage_metrics(registry, tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'))
+    manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    manager.add_task('Task 2', 'Description', 'Work', '2024-1-5', 'High')
+    manager.search_tasks(keyword='task')
+
+    assert registry.timer('taskmanager_operation_seconds', operation='add_task')['count'] == 2
+    assert registry.timer('taskmanager_operation_seconds', operation='search_tasks')['count'] == 1
+    assert registry.timer('taskmanager_phase_seconds', phase='fsync')['count'] == 2
+    assert registry.counter('taskmanager_bytes_written_total') > os.path.getsize(manager.file_path)
+    assert registry.counter('taskmanager_records_scanned_total') >= 2
+    assert registry.counter('taskmanager_bytes_read_total') > 0
+    assert registry.counter('taskmanager_tasks_built_total') >= 4
+    assert registry.counter('taskmanager_strptime_calls_total') >= 1
+    assert registry.counter('taskmanager_date_parses_total') >= registry.counter('taskmanager_tasks_built_total')
+
+
+def test_journal_bytes_written(registry, tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    manager = TaskManager(file_path, storage=JournalStorage(file_path, fsync=False))
+    registry.reset()
+    manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    assert registry.counter('taskmanager_bytes_written_total') == os.path.getsize(file_path + '.journal')
+
+
+def test_task_hooks_removed_with_last_sink():
+    original = Task.__init__
+    sink = MetricsRegistry()
+    add_sink(sink)
+    assert Task.__init__ is not original
+    Task(1, 'Task', 'Description', 'Work', '2024-12-01', 'High')
+    remove_sink(sink)
+    assert Task.__init__ is original
+    Task(2, 'Task', 'Description', 'Work', '2024-12-01', 'High')
+    assert sink.counter('taskmanager_tasks_built_total') == 1
+
+
+def test_prometheus_file_sink(tmpdir):
+    path = os.path.join(tmpdir, 'metrics.prom')
+    sink = PrometheusFileSink(path, min_interval=None)
+    add_sink(sink)
+    try:
+        Metrics.increment('taskmanager_records_scanned_total', 3)
+        Metrics.observe('taskmanager_operation_seconds', 0.5, operation='add_task')
+        Metrics.observe('taskmanager_operation_seconds', 0.25, operation='add_task')
+        Metrics.increment('taskmanager_errors_total', operation='say "hi"')
+    finally:
+        remove_sink(sink)
+    assert not os.path.exists(path)
+    sink.write()
+    with open(path, encoding='utf-8') as file:
+        text = file.read()
+    assert '# TYPE taskmanager_records_scanned_total counter\ntaskmanager_records_scanned_total 3\n' in text
+    assert 'taskmanager_operation_seconds_count{operation="add_task"} 2\n' in text
+    assert 'taskmanager_operation_seconds_sum{operation="add_task"} 0.750000000\n' in text
+    assert 'taskmanager_operation_seconds_max{operation="add_task"} 0.500000000\n' in text
+    assert 'taskmanager_errors_total{operation="say \\"hi\\""} 1\n' in text
+
+
+def test_logging_sink(caplog):
+    sink = LoggingSink()
+    add_sink(sink)
+    try:
+        with caplog.at_level(logging.DEBUG, logger='taskmanager.metrics'):
+            with timed('taskmanager_phase_seconds', phase='json_load'):
+                pass
+    finally:
+        remove_sink(sink)
+    assert 'taskmanager_phase_seconds{phase="json_load"}' in caplog.text
+
+
+def test_profile_context_manager(tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'))
+    with profile(limit=5) as report:
+        manager.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    assert 'add_task' in report.text
+    assert report.peak_memory > 0
+    assert report.top_allocations
+    report.dump(os.path.join(tmpdir, 'profile.out'))
+    assert os.path.getsize(os.path.join(tmpdir, 'profile.out')) > 0
@@ -0,0 +1,98 @@
+import os
+import pytest
+from datetime import date
+from TaskManager import TaskManager
+
+
+TASKS = [
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-03-01', 'высокий', 'Не выполнена'),
+    ('Молоко', 'Купить молоко', 'Дом', '2024-01-15', 'низкий', 'Выполнена'),
+    ('Встреча', 'Встреча с клиентом', 'Работа', '2024-02-10', 'средний', 'Не выполнена'),
+    ('Врач', 'Записаться к врачу', 'Здоровье', '2024-02-10', 'высокий', 'Не выполнена'),
+    ('Билеты', 'Купить билеты', 'Дом', '2024-05-20', 'высокий', 'Не выполнена'),
+    ('Договор', 'Проверить договор с клиентом', 'Работа', '2024-01-05', 'низкий', 'Выполнена'),
+]
+
+
+@pytest.fixture(params=['json', 'resident'])
+def task_manager(request, tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=request.param == 'resident')
+    with manager.transaction() as batch:
+        for title, description, category, due_date, priority, status in TASKS:
+            batch.add_task(title, description, category, due_date, priority, status)
+    return manager
+
+
+def ids(query):
+    return [task.id for task in query]
+
+
+def test_where_equality_and_sets(task_manager):
+    assert ids(task_manager.query().where(category='Работа')) == [1, 3, 6]
+    assert ids(task_manager.query().where(category='Работа', priority='низкий')) == [6]
+    assert ids(task_manager.query().where(priority=['низкий', 'средний']).order_by('id')) == [2, 3, 6]
+    assert ids(task_manager.query().where(category='Работа').where(category=['Дом', 'Работа'])) == [1, 3, 6]
+    assert ids(task_manager.query().where(category=None, status='Выполнена')) == [2, 6]
+    assert ids(task_manager.query().where(id=4)) == [4]
+
+
+def test_where_several_indexed_fields(task_manager):
+    # Источник плана должен читать индекс своего поля, а не последнего из перебранных
+    assert ids(task_manager.query().where(category='Дом', status='Выполнена')) == [2]
+    assert ids(task_manager.query().where(category='Работа', status='Не выполнена')) == [1, 3]
+    assert ids(task_manager.query().where(category='Работа', priority='высокий')) == [1]
+    assert ids(task_manager.query().where(title='Врач', category='Здоровье', status='Не выполнена')) == [4]
+
+def test_where_dates_keyword_and_predicate(task_manager):
+    assert ids(task_manager.query().where(due_before='2024-02-10').order_by('id')) == [2, 6]
+    assert ids(task_manager.query().where(due_after='2024-02-10').order_by('id')) == [1, 5]
+    assert ids(task_manager.query().where(due_after=date(2024, 1, 15), due_before='2024-03-01')
+               .order_by('id')) == [3, 4]
+    assert ids(task_manager.query().where(keyword='КЛИЕНТ').order_by('id')) == [3, 6]
+    assert ids(task_manager.query().where(lambda task: len(task.title) > 6)) == [3, 6]
+    with pytest.raises(ValueError):
+        task_manager.query().where(due_before='10.02.2024')
+    with pytest.raises(ValueError):
+        task_manager.query().where(owner='me')
+
+
+def test_order_by_limit_offset(task_manager):
+    assert ids(task_manager.query().order_by('due_date')) == [6, 2, 3, 4, 1, 5]
+    assert ids(task_manager.query().order_by('-due_date')) == [5, 1, 3, 4, 2, 6]
+    assert ids(task_manager.query().order_by('priority', '-due_date')) == [2, 6, 3, 5, 1, 4]
+    assert ids(task_manager.query().order_by('-priority', 'due_date')) == [4, 1, 5, 3, 6, 2]
+    assert ids(task_manager.query().order_by('due_date').limit(2).offset(1)) == [2, 3]
+    assert ids(task_manager.query().order_by('-title').limit(3)) == [1, 2, 6]
+    assert ids(task_manager.query().offset(4)) == [5, 6]
+    assert task_manager.query().where(status='Выполнена').count() == 2
+    assert task_manager.query().where(title='Нет такой').first() is None
+    with pytest.raises(ValueError):
+        task_manager.query().order_by('owner')
+
+
+def test_query_is_immutable_and_lazy(task_manager):
+    base = task_manager.query().where(category='Работа')
+    limited = base.limit(1)
+    assert len(base.all()) == 3 and len(limited.all()) == 1
+    iterator = iter(task_manager.query())
+    assert next(iterator).id == 1
+    task_manager.add_task('Новая', 'Описание', 'Дом', '2024-06-01', 'низкий')
+    assert task_manager.query().where(title='Новая').first().id == 7
+
+
+def test_planner_choice(tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=True)
+    manager.add_tasks({'title': f'Задача {index}', 'description': 'Описание', 'category': f'Категория {index % 10}',
+                       'due_date': f'2024-{index % 12 + 1:02d}-01', 'priority': 'низкий'} for index in range(200))
+    assert manager.query().explain() == 'scan'
+    assert manager.query().where(category='Категория 3', priority='низкий').explain() == 'index:category'
+    assert manager.query().where(title='Задача 5', category='Категория 5').explain() == 'index:title'
+    assert manager.query().where(id=[1, 2], category='Категория 1').explain() == 'index:id'
+    assert manager.query().where(due_before='2024-02-01').explain() == 'index:due_date'
+    assert manager.query().where(keyword='задача 17').explain() == 'index:text'
+    assert manager.query().order_by('due_date').explain() == 'index:due_date (ordered)'
+    assert TaskManager(os.path.join(tmpdir, 'tasks.json')).query().where(category='Категория 3').explain() == 'stream'
+
+    ordered = manager.query().where(priority='низкий').order_by('due_date').limit(3).all()
+    assert [task.id for task in ordered] == [1, 13, 25]
+    assert [task.id for task in manager.query().where(category='Категория 3').order_by('-due_date').limit(2)] == [24, 84]
@@ -0,0 +1,182 @@
+import os
+import json
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from TaskManager import TaskManager
+from Storage import ConcurrentModificationError, JsonFileStorage
+
+
+def write_tasks(file_path, titles):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump([
+            {'id': index, 'title': title, 'description': 'Description', 'category': 'Work',
+             'due_date': '2024-12-01', 'priority': 'High', 'status': 'Не выполнена'}
+            for index, title in enumerate(titles, start=1)
+        ], file)
+
+
+def test_resident_reads_do_not_reload(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    task_manager = TaskManager(file_path, resident=True)
+
+    with patch.object(JsonFileStorage, 'load', wraps=task_manager.storage.load) as load:
+        task_manager.view_tasks()
+        task_manager.find_task_by_id(1)
+        task_manager.search_tasks(keyword='Task')
+        assert load.call_count == 1
+
+
+def test_resident_detects_outside_changes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1'])
+    task_manager = TaskManager(file_path, resident=True)
+    assert [task.title for task in task_manager.view_tasks()] == ['Task 1']
+
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    assert [task.title for task in task_manager.view_tasks()] == ['Task 1', 'Task 2']
+
+
+def test_resident_write_through(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True)
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.edit_task(1, title='Edited Task 1')
+
+    tasks = TaskManager(file_path).load_tasks()
+    assert [task.title for task in tasks] == ['Edited Task 1']
+
+
+def test_resident_deferred_flush_batches_writes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, resident=True, flush_interval=None)
+
+    with patch.object(JsonFileStorage, 'save', wraps=task_manager.storage.save) as save:
+        for index in range(1, 11):
+            task_manager.add_task(f'Task {index}', 'Description', 'Work', '2024-12-01', 'High')
+        task_manager.mark_task_as_completed(3)
+        task_manager.delete_task(5)
+        assert save.call_count == 0
+        assert TaskManager(file_path).load_tasks() == []
+
+        task_manager.flush()
+        assert save.call_count == 1
+
+    tasks = TaskManager(file_path).load_tasks()
+    assert len(tasks) == 9
+    assert next(task for task in tasks if task.id == 3).status == 'Выполнена'
+
+
+def test_resident_replays_pending_changes_on_outside_change(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1'])
+    task_manager = TaskManager(file_path, resident=True, flush_interval=None)
+    task_manager.edit_task(1, title='Edited Task 1')
+
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    assert [task.title for task in task_manager.view_tasks()] == ['Edited Task 1', 'Task 2']
+
+
+def test_resident_edit_does_not_mutate_returned_tasks(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1'])
+    task_manager = TaskManager(file_path, resident=True)
+    task = task_manager.find_task_by_id(1)
+    task_manager.edit_task(1, title='Edited Task 1')
+
+    assert task.title == 'Task 1'
+    assert task_manager.find_task_by_id(1).title == 'Edited Task 1'
+
+
+def test_changing_returned_tasks_does_not_change_store(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    task_manager = TaskManager(file_path, resident=True)
+    task_manager.find_task_by_id(1).category = 'Home'
+    task_manager.load_tasks()[1].category = 'Home'
+    task_manager.view_tasks()[0].title = 'Changed'
+    task_manager.query().where(id=2).first().status = 'Выполнена'
+    task_manager.edit_task(1, description='Edited')
+
+    assert [task.title for task in task_manager.view_tasks('Work')] == ['Task 1', 'Task 2']
+    assert task_manager.view_tasks('Home') == []
+    assert task_manager.stats().count(category='Home') == 0
+    with open(file_path, encoding='utf-8') as file:
+        assert [(record['category'], record['status']) for record in json.load(file)] == \
+            [('Work', 'Не выполнена'), ('Work', 'Не выполнена')]
+
+def test_close_flushes_pending_changes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    with TaskManager(file_path, resident=True, flush_interval=None) as task_manager:
+        task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+
+    assert [task.title for task in TaskManager(file_path).load_tasks()] == ['Task 1']
+
+
+def test_deferred_changes_are_flushed_at_exit(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    script = (
+        "from TaskManager import TaskManager\n"
+        f"manager = TaskManager({file_path!r}, resident=True, flush_interval=3600)\n"
+        "manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')\n"
+        "manager.add_task('Task 2', 'Description 2', 'Work', '2024-12-01', 'High')\n"
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    assert [task.title for task in TaskManager(file_path).load_tasks()] == ['Task 1', 'Task 2']
+
+def test_save_tasks_after_in_place_change(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    task_manager = TaskManager(file_path, resident=True)
+    tasks = task_manager.load_tasks()
+    tasks[1].status = 'Выполнена'
+    tasks[1].category = 'Home'
+    task_manager.save_tasks(tasks)
+
+    assert [task.id for task in task_manager.search_tasks(status='Выполнена')] == [2]
+    assert task_manager.indexes.category.get('Home') == [2]
+    assert TaskManager(file_path).find_task_by_id(2).status == 'Выполнена'
+
+
+def test_pending_adds_do_not_overwrite_outside_adds(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1', 'Task 2'])
+    deferred = TaskManager(file_path, resident=True, flush_interval=None)
+    deferred.add_task('Local', 'Description', 'Work', '2024-12-01', 'High')
+    deferred.edit_task(3, description='Edited')
+    deferred.add_task('Same', 'Description', 'Work', '2024-12-01', 'High')
+    deferred.delete_task(1)
+
+    other = TaskManager(file_path)
+    other.add_task('Outside', 'Description', 'Work', '2024-12-01', 'High')
+    other.add_task('Same', 'Outside copy', 'Work', '2024-12-01', 'High')
+
+    with pytest.raises(ConcurrentModificationError):
+        deferred.flush()
+    deferred.flush()
+    saved = {task.id: task for task in TaskManager(file_path).load_tasks()}
+    assert sorted(saved) == [2, 3, 4, 5]
+    assert (saved[3].title, saved[4].title) == ('Outside', 'Same')
+    assert saved[4].description == 'Outside copy'
+    assert (saved[5].title, saved[5].description) == ('Local', 'Edited')
+
+
+def test_pending_edits_do_not_restore_outside_deletes(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    write_tasks(file_path, ['Task 1', 'Task 2', 'Task 3'])
+    deferred = TaskManager(file_path, resident=True, flush_interval=None)
+    deferred.edit_task(1, description='Edited')
+    deferred.edit_task(2, description='Edited')
+    deferred.delete_task(3)
+
+    other = TaskManager(file_path)
+    other.delete_task(1)
+    other.delete_task(3)
+
+    with pytest.raises(ConcurrentModificationError, match='задача 1 удалена'):
+        deferred.flush()
+    deferred.flush()
+    saved = TaskManager(file_path).load_tasks()
+    assert [(task.id, task.description) for task in saved] == [(2, 'Edited')]
@@ -0,0 +1,91 @@
+import os
+import pytest
+from datetime import datetime, timedelta
+from Task import Task
+from TaskManager import TaskManager
+from Scheduler import DeadlineScheduler, ReminderLoop
+
+
+NOW = datetime(2024, 6, 10, 12, 0)
+
+
+def make_task(task_id, due_date, status='Не выполнена'):
+    return Task(task_id, f'Task {task_id}', 'Description', 'Work', due_date, 'High', status)
+
+
+@pytest.fixture
+def task_manager(tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=True)
+    for index, due_date in enumerate(['2024-06-12', '2024-06-01', '2024-06-10', '2024-06-11', '2024-07-01'], 1):
+        manager.add_task(f'Task {index}', 'Description', 'Work', due_date, 'High')
+    return manager
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def test_next_due_overdue_and_window(task_manager):
+    scheduler = task_manager.scheduler()
+    assert ids(scheduler.next_due(3)) == [2, 3, 4]
+    assert ids(scheduler.overdue(NOW)) == [2]
+    # Срок задачи — конец дня: задача на 10 июня еще не просрочена в полдень 10 июня
+    assert ids(scheduler.due_within(24, NOW)) == [3]
+    assert ids(scheduler.due_within(48, NOW)) == [3, 4]
+    assert len(scheduler) == 5
+
+
+def test_incremental_updates(task_manager):
+    scheduler = task_manager.scheduler()
+    task_manager.mark_task_as_completed(2)
+    task_manager.delete_task(3)
+    task_manager.edit_task(5, due_date='2024-06-05')
+    task_manager.add_task('Task 6', 'Description', 'Work', '2024-06-09', 'High')
+    assert task_manager.scheduler() is scheduler
+    assert ids(scheduler.next_due(10)) == [5, 6, 4, 1]
+    assert ids(scheduler.overdue(NOW)) == [5, 6]
+    task_manager.edit_task(2, status='Не выполнена')
+    assert ids(scheduler.next_due(2)) == [2, 5]
+
+
+def test_stale_entries_are_compacted():
+    scheduler = DeadlineScheduler()
+    scheduler.rebuild([make_task(1, '2024-06-01')])
+    old = make_task(1, '2024-06-01')
+    for day in range(1, 301):
+        new = make_task(1, (datetime(2024, 6, 1) + timedelta(days=day)).date())
+        scheduler.update(old, new)
+        old = new
+    assert ids(scheduler.next_due(5)) == [1]
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+    assert ids(scheduler.due_before(datetime(2025, 3, 29))) == [1]
+    assert scheduler.due_before(datetime(2025, 3, 28)) == []
+
+
+def test_non_resident_scheduler(tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'))
+    manager.add_task('Task 1', 'Description', 'Work', '2024-06-01', 'High')
+    manager.add_task('Task 2', 'Description', 'Work', '2024-05-01', 'High')
+    manager.mark_task_as_completed(2)
+    assert ids(manager.scheduler().overdue(NOW)) == [1]
+
+
+def test_reminder_loop_notifies_once(task_manager):
+    clock = [NOW]
+    reminded = []
+    loop = ReminderLoop(task_manager.scheduler, reminded.append, lead=timedelta(hours=24), clock=lambda: clock[0])
+    assert ids(loop.check()) == [2, 3]
+    assert loop.check() == []
+    clock[0] += timedelta(days=1)
+    assert ids(loop.check()) == [4]
+    task_manager.edit_task(2, due_date='2024-06-11')
+    assert ids(loop.check()) == [2]
+    assert ids(reminded) == [2, 3, 4, 2]
+
+
+def test_reminder_loop_thread(task_manager):
+    reminded = []
+    loop = ReminderLoop(task_manager.scheduler, reminded.append, interval=0.01, clock=lambda: NOW)
+    loop.start()
+    loop.stop()
+    assert ids(reminded) == [2, 3]
@@ -0,0 +1,121 @@
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+import pytest
+from FileLock import LockTimeout
+from ShardedTaskManager import TITLE_STRIPES, ShardedTaskManager
+from Storage import JournalStorage
+
+
+def add(manager, index, category='Work', **overrides):
+    task = dict(title=f'Task {index}', description='Description', category=category,
+                due_date='2024-12-01', priority='High')
+    task.update(overrides)
+    manager.add_task(**task)
+
+
+@pytest.fixture(params=['category', 'id'])
+def sharded(request, tmpdir):
+    manager = ShardedTaskManager(os.path.join(tmpdir, 'shards'), shard_by=request.param, shards=4)
+    yield manager
+    manager.close()
+
+
+def test_add_and_find_across_shards(sharded):
+    for index, category in enumerate(['Работа', 'Дом', 'Работа', 'Учеба', 'Дом'], 1):
+        add(sharded, index, category)
+    assert [task.id for task in sharded.load_tasks()] == [1, 2, 3, 4, 5]
+    assert sharded.find_task_by_id(4).category == 'Учеба'
+    assert sharded.find_task_by_id(42) is None
+    assert [task.id for task in sharded.view_tasks('Дом')] == [2, 5]
+    assert sharded.view_tasks('Нет такой') == []
+    assert [task.id for task in sharded.search_tasks(keyword='task 3')] == [3]
+    assert sorted(task.id for task in sharded.iter_tasks()) == [1, 2, 3, 4, 5]
+
+
+def test_title_unique_across_shards(sharded, capsys):
+    add(sharded, 1, 'Работа')
+    add(sharded, 1, 'Дом')
+    assert 'уже существует' in capsys.readouterr().out
+    add(sharded, 2, 'Дом')
+    sharded.edit_task(2, title='Task 1')
+    assert 'уже существует' in capsys.readouterr().out
+    assert sharded.find_task_by_id(2).title == 'Task 2'
+    with pytest.raises(ValueError):
+        sharded.add_tasks([dict(title='Task 1', description='D', category='Учеба', due_date='2024-12-01', priority='Low')])
+    assert len(sharded.load_tasks()) == 2
+
+
+def test_edit_delete_complete(sharded):
+    add(sharded, 1, 'Работа')
+    add(sharded, 2, 'Работа')
+    sharded.edit_task(1, category='Дом', title='Moved')
+    sharded.mark_task_as_completed(2)
+    moved = sharded.find_task_by_id(1)
+    assert (moved.title, moved.category) == ('Moved', 'Дом')
+    assert [task.id for task in sharded.view_tasks('Работа')] == [2]
+    assert sharded.find_task_by_id(2).status == 'Выполнена'
+    sharded.delete_task(1)
+    assert [task.id for task in sharded.load_tasks()] == [2]
+    with pytest.raises(ValueError):
+        sharded.mark_task_as_completed(1)
+
+
+def test_category_shards_are_separate_files(tmpdir):
+    directory = os.path.join(tmpdir, 'shards')
+    with ShardedTaskManager(directory) as manager:
+        add(manager, 1, 'Работа')
+        add(manager, 2, 'Дом')
+        assert len(manager.shard_keys()) == 2
+    shard_files = [name for name in os.listdir(directory) if name.startswith('category-') and name.endswith('.json')]
+    assert len(shard_files) == 2
+    with pytest.raises(ValueError):
+        ShardedTaskManager(directory, shard_by='id')
+
+
+def test_global_ids_survive_reopen_and_journal(tmpdir):
+    directory = os.path.join(tmpdir, 'shards')
+    journal = lambda path: JournalStorage(path, fsync=False)
+    with ShardedTaskManager(directory, storage=journal) as manager:
+        assert manager.add_tasks([dict(title=f'Task {index}', description='D', category=f'C{index % 3}',
+                                       due_date='2024-12-01', priority='Low') for index in range(6)]) == [1, 2, 3, 4, 5, 6]
+    os.remove(os.path.join(directory, 'next_id'))
+    with ShardedTaskManager(directory, storage=journal, resident=True) as manager:
+        add(manager, 7, 'C0')
+        assert manager.find_task_by_id(7).title == 'Task 7'
+
+
+def test_parallel_writers_in_threads(tmpdir):
+    directory = os.path.join(tmpdir, 'shards')
+    with ShardedTaskManager(directory) as manager:
+        def writer(category):
+            for index in range(10):
+                add(manager, f'{category}-{index}', category)
+        threads = [threading.Thread(target=writer, args=(category,)) for category in ('Работа', 'Дом', 'Учеба')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tasks = manager.load_tasks()
+        assert [task.id for task in tasks] == list(range(1, 31))
+        assert len(manager.view_tasks('Дом')) == 10
+
+
+def test_title_lock_timeout_releases_taken_stripes(tmpdir):
+    with ShardedTaskManager(os.path.join(tmpdir, 'shards')) as manager:
+        titles = ['Task 1', 'Task 2']
+        first, last = sorted({zlib.crc32(title.encode('utf-8')) % TITLE_STRIPES for title in titles})
+
+        @contextmanager
+        def timed_out():
+            raise LockTimeout('занято')
+            yield
+
+        manager._title_locks[last].exclusive = timed_out
+        # Исключение держит кадр _title_lock: полосы не освободятся сборщиком мусора раньше проверки
+        with pytest.raises(LockTimeout) as error:
+            with manager._title_lock(titles):
+                pass
+        assert str(error.value) == 'занято'
+        assert manager._title_locks[first]._depth == 0
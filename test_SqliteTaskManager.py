@@ -0,0 +1,77 @@
+import os
+import json
+import sqlite3
+from SqliteTaskManager import SqliteTaskManager, migrate_json_to_sqlite
+
+
+def test_sqlite_uses_wal(tmpdir):
+    db_path = os.path.join(tmpdir, 'tasks.db')
+    with SqliteTaskManager(db_path) as manager:
+        assert manager.connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_sqlite_add_edit_delete(tmpdir, capsys):
+    with SqliteTaskManager(os.path.join(tmpdir, 'tasks.db')) as manager:
+        manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+        manager.add_task('Task 2', 'Description 2', 'Personal', '2024-12-02', 'Low')
+        manager.add_task('Task 1', 'Duplicate', 'Work', '2024-12-03', 'Low')
+        assert 'уже существует' in capsys.readouterr().out
+
+        manager.edit_task(1, title='Edited Task 1', category='Personal')
+        manager.mark_task_as_completed(2)
+        task = manager.find_task_by_id(1)
+        assert task.title == 'Edited Task 1'
+        assert task.category == 'Personal'
+        assert manager.find_task_by_id(2).status == 'Выполнена'
+
+        manager.delete_task(1)
+        manager.delete_task(1)
+        assert 'не найдена' in capsys.readouterr().out
+        assert [task.id for task in manager.load_tasks()] == [2]
+        manager.add_task('Task 3', 'Description 3', 'Work', '2024-12-03', 'Low')
+        assert manager.find_task_by_id(3).title == 'Task 3'
+
+
+def test_sqlite_search_is_pushed_down(tmpdir):
+    with SqliteTaskManager(os.path.join(tmpdir, 'tasks.db')) as manager:
+        manager.add_task('Отчет', 'Квартальный ОТЧЕТ', 'Работа', '2024-12-01', 'высокий')
+        manager.add_task('Покупки', 'Молоко', 'Дом', '2024-12-02', 'низкий')
+        manager.mark_task_as_completed(2)
+
+        assert [task.id for task in manager.search_tasks(keyword='отчет')] == [1]
+        assert [task.id for task in manager.search_tasks(status='Выполнена')] == [2]
+        assert [task.id for task in manager.search_tasks(keyword='о', category='Дом')] == [2]
+        assert [task.id for task in manager.view_tasks('Работа')] == [1]
+        assert len(manager.view_tasks()) == 2
+
+        plan = manager.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE category = ?', ('Дом',)).fetchall()
+        assert 'tasks_category' in str(plan)
+
+
+def test_sqlite_mark_missing_task_raises(tmpdir):
+    with SqliteTaskManager(os.path.join(tmpdir, 'tasks.db')) as manager:
+        try:
+            manager.mark_task_as_completed(42)
+        except ValueError as error:
+            assert str(error) == 'Задача не найдена'
+        else:
+            raise AssertionError('ValueError expected')
+
+
+def test_migrate_json_to_sqlite(tmpdir):
+    json_path = os.path.join(tmpdir, 'tasks.json')
+    db_path = os.path.join(tmpdir, 'tasks.db')
+    records = [
+        {'id': 2, 'title': 'Task 1', 'description': 'Description 1', 'category': 'Work',
+         'due_date': '2024-12-01', 'priority': 'High', 'status': 'Не выполнена'},
+        {'id': 5, 'title': 'Task 2', 'description': 'Description 2', 'category': 'Personal',
+         'due_date': '2024-12-02', 'priority': 'Low', 'status': 'Выполнена'},
+    ]
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(records, file)
+
+    assert migrate_json_to_sqlite(json_path, db_path) == 2
+    with SqliteTaskManager(db_path) as manager:
+        assert [task.to_dict() for task in manager.load_tasks()] == records
+    assert sqlite3.connect(db_path).execute('SELECT COUNT(*) FROM tasks').fetchone()[0] == 2
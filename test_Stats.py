@@ -0,0 +1,71 @@
+import os
+import pytest
+from datetime import datetime
+from Stats import TaskStats
+from Task import Task
+from TaskManager import TaskManager
+
+
+NOW = datetime(2024, 6, 10, 12, 0)
+
+
+@pytest.fixture(params=[False, True], ids=['plain', 'resident'])
+def manager(request, tmpdir):
+    manager = TaskManager(os.path.join(tmpdir, 'tasks.json'), resident=request.param)
+    tasks = [('Работа', '2024-06-01', 'высокий'), ('Работа', '2024-06-10', 'низкий'),
+             ('Дом', '2024-06-09', 'высокий'), ('Дом', '2024-07-01', 'высокий')]
+    for index, (category, due_date, priority) in enumerate(tasks, 1):
+        manager.add_task(f'Task {index}', 'Description', category, due_date, priority)
+    return manager
+
+
+def test_counts_and_rates(manager):
+    manager.mark_task_as_completed(3)
+    report = manager.stats(now=NOW)
+    assert report.total == 4
+    assert report.completed == 1
+    assert report.completion_rate == 0.25
+    assert report.overdue == 1
+    assert report.count(category='Дом') == 2
+    assert report.count(category='Работа', priority='высокий') == 1
+    assert report.count(status='Выполнена', priority='высокий') == 1
+    assert report.by('category') == {'Работа': 2, 'Дом': 2}
+    assert report.by('category', 'status') == {('Работа', 'Не выполнена'): 2, ('Дом', 'Выполнена'): 1,
+                                               ('Дом', 'Не выполнена'): 1}
+    assert report.as_dict()['by_priority'] == {'высокий': 3, 'низкий': 1}
+    with pytest.raises(ValueError):
+        report.by('title')
+
+
+def test_counters_follow_changes(manager):
+    assert manager.stats(now=NOW).overdue == 2
+    manager.edit_task(1, category='Дом', due_date='2024-06-20')
+    manager.delete_task(4)
+    manager.add_task('Task 5', 'Description', 'Учеба', '2024-05-01', 'средний')
+    report = manager.stats(now=NOW)
+    assert report.by('category') == {'Работа': 1, 'Дом': 2, 'Учеба': 1}
+    assert report.overdue == 2
+    assert manager.stats(now=datetime(2024, 6, 11)).overdue == 3
+    assert manager.stats(now=datetime(2024, 6, 21)).overdue == 4
+
+
+def test_incremental_matches_rebuild():
+    tasks = [Task(index, f'Task {index}', 'D', f'C{index % 3}', f'2024-06-{index % 28 + 1:02d}',
+                  ['low', 'high'][index % 2]) for index in range(1, 60)]
+    incremental = TaskStats()
+    incremental.rebuild(tasks[:10])
+    for task in tasks[10:]:
+        incremental.update(None, task)
+    for task in tasks[::4]:
+        completed = Task(**dict(task.to_dict(), status='Выполнена'))
+        incremental.update(task, completed)
+        tasks[task.id - 1] = completed
+    for task in tasks[::7]:
+        incremental.update(task, None)
+    remaining = [task for index, task in enumerate(tasks) if index % 7]
+
+    rebuilt = TaskStats()
+    rebuilt.rebuild_records(task.to_dict() for task in remaining)
+    for now in (datetime(2024, 6, 1), datetime(2024, 6, 15), datetime(2024, 7, 1)):
+        assert incremental.report(now).counts == rebuilt.report(now).counts
+        assert incremental.report(now).overdue == rebuilt.report(now).overdue
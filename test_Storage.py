@@ -0,0 +1,126 @@
+import os
+import json
+from TaskManager import TaskManager
+from Storage import Change, JournalStorage, JsonFileStorage
+
+
+def make_record(task_id, title):
+    return {'id': task_id, 'title': title, 'description': 'Description', 'category': 'Work',
+            'due_date': '2024-12-01', 'priority': 'High', 'status': 'Не выполнена'}
+
+
+def test_json_storage_round_trip(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JsonFileStorage(file_path)
+    storage.ensure_exists()
+    assert storage.load() == []
+
+    storage.save([make_record(1, 'Task 1')])
+    assert storage.load() == [make_record(1, 'Task 1')]
+
+
+def test_journal_appends_without_rewriting_snapshot(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JournalStorage(file_path, fsync=False)
+    storage.ensure_exists()
+    storage.load()
+    snapshot_mtime = os.stat(file_path).st_mtime_ns
+
+    storage.save([], [Change('add', 1, make_record(1, 'Task 1'))])
+    storage.save([], [Change('add', 2, make_record(2, 'Task 2'))])
+    storage.close()
+
+    assert os.stat(file_path).st_mtime_ns == snapshot_mtime
+    with open(storage.journal_path, encoding='utf-8') as file:
+        assert len(file.readlines()) == 2
+
+
+def test_journal_replay_after_restart(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JournalStorage(file_path, fsync=False)
+    storage.ensure_exists()
+    storage.load()
+    storage.save([], [Change('add', 1, make_record(1, 'Task 1')), Change('add', 2, make_record(2, 'Task 2'))])
+    storage.save([], [Change('edit', 1, make_record(1, 'Edited'))])
+    storage.save([], [Change('delete', 2, None)])
+    storage.close()
+
+    reopened = JournalStorage(file_path)
+    assert reopened.load() == [make_record(1, 'Edited')]
+
+
+def test_journal_drops_torn_tail(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JournalStorage(file_path, fsync=False)
+    storage.ensure_exists()
+    storage.load()
+    storage.save([], [Change('add', 1, make_record(1, 'Task 1'))])
+    storage.close()
+
+    with open(storage.journal_path, 'ab') as file:
+        file.write(b'{"op":"add","id":2,"ta')
+
+    reopened = JournalStorage(file_path)
+    assert [task['id'] for task in reopened.load()] == [1]
+    with open(storage.journal_path, 'rb') as file:
+        assert file.read().endswith(b'}\n')
+
+
+def test_journal_compaction(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JournalStorage(file_path, compact_threshold=3, fsync=False)
+    storage.ensure_exists()
+    storage.load()
+    for task_id in range(1, 4):
+        storage.save([], [Change('add', task_id, make_record(task_id, f'Task {task_id}'))])
+
+    assert os.path.getsize(storage.journal_path) == 0
+    with open(file_path, encoding='utf-8') as file:
+        assert [task['id'] for task in json.load(file)] == [1, 2, 3]
+
+
+def test_task_manager_with_journal_storage(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path, storage=JournalStorage(file_path, fsync=False))
+    task_manager.add_task('Task 1', 'Description 1', 'Work', '2024-12-01', 'High')
+    task_manager.add_task('Task 2', 'Description 2', 'Personal', '2024-12-02', 'Low')
+    task_manager.edit_task(1, title='Edited Task 1')
+    task_manager.mark_task_as_completed(2)
+    task_manager.delete_task(1)
+    task_manager.close()
+
+    with open(file_path, encoding='utf-8') as file:
+        assert json.load(file) == []
+
+    reopened = TaskManager(file_path, storage=JournalStorage(file_path))
+    tasks = reopened.load_tasks()
+    assert len(tasks) == 1
+    assert tasks[0].title == 'Task 2'
+    assert tasks[0].status == 'Выполнена'
+
+
+def test_json_storage_record_cache(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    storage = JsonFileStorage(file_path, fsync=False, cache=True)
+    storage.ensure_exists()
+    storage.save([make_record(1, 'Task 1')])
+    assert os.path.exists(file_path + '.cache')
+    with open(file_path, encoding='utf-8') as file:
+        assert json.load(file) == [make_record(1, 'Task 1')]
+    assert storage.load() == [make_record(1, 'Task 1')]
+
+    # Файл «тронут», но не изменен: кэш подтверждается по хэшу
+    os.utime(file_path, ns=(1, 1))
+    assert storage.cache.load() == [make_record(1, 'Task 1')]
+
+    # Файл изменен в обход хранилища: кэш устарел и будет перестроен
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump([make_record(2, 'Task 2')], file)
+    assert storage.cache.load() is None
+    assert storage.load() == [make_record(2, 'Task 2')]
+    assert storage.cache.load() == [make_record(2, 'Task 2')]
+
+    # Поврежденный кэш просто не используется
+    with open(file_path + '.cache', 'wb') as file:
+        file.write(b'\x00\x00')
+    assert storage.load() == [make_record(2, 'Task 2')]
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from Task import Task
 
 def test_task_creation():
@@ -61,3 +62,29 @@ def test_task_priority():
 def test_task_missing_fields():
     with pytest.raises(TypeError):
         Task(1, "Test Task", "Description", "Work", "2024-12-01")  # Отсутствует `priority`
+
+def test_task_uses_slots():
+    task = Task(1, "Test Task", "Description", "Work", "2024-12-01", "High")
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.unknown_field = "value"
+
+def test_task_due_date_setter_accepts_string():
+    task = Task(1, "Test Task", "Description", "Work", "2024-12-01", "High")
+    task.due_date = "2025-01-15"
+    assert task.due_date == datetime(2025, 1, 15)
+    assert task.to_dict()["due_date"] == "2025-01-15"
+    with pytest.raises(ValueError, match="Неверный формат даты: 2025-02-30"):
+        task.due_date = "2025-02-30"
+
+def test_task_non_padded_date():
+    task = Task(1, "Test Task", "Description", "Work", "2024-1-5", "High")
+    assert task.to_dict()["due_date"] == "2024-01-05"
+
+
+def test_task_copy_is_independent():
+    task = Task(1, "Task", "Description", "Work", "2024-12-01", "High", "Выполнена")
+    copy = task.copy()
+    copy.category = "Home"
+    copy.status = "Не выполнена"
+    assert task.to_dict() == dict(copy.to_dict(), category="Work", status="Выполнена")
@@ -0,0 +1,87 @@
+import os
+import pytest
+from unittest.mock import patch
+from Task import Task
+from TaskCache import TaskCache, task_size
+from TaskManager import TaskManager
+from Storage import JsonFileStorage
+from BinaryStorage import BinaryStorage
+
+
+def make_task(task_id, description='Description'):
+    return Task(task_id, f'Task {task_id}', description, 'Work', '2024-12-01', 'High')
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TaskCache(max_entries=2)
+    cache.put(make_task(1))
+    cache.put(make_task(2))
+    assert cache.get(1) is not None
+    cache.put(make_task(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (3, 1, 1, 2)
+    assert stats.hit_rate == 0.75
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = TaskCache(max_entries=2, policy='lfu')
+    cache.put(make_task(1))
+    cache.put(make_task(2))
+    cache.get(2)
+    cache.get(2)
+    cache.get(1)
+    cache.put(make_task(3))
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    cache.discard(3)
+    cache.put(make_task(4))
+    assert len(cache) == 2
+    with pytest.raises(ValueError):
+        TaskCache(policy='fifo')
+
+
+def test_byte_budget_and_signature():
+    budget = task_size(make_task(1)) * 3
+    cache = TaskCache(max_entries=None, max_bytes=budget)
+    for task_id in range(1, 6):
+        cache.put(make_task(task_id), signature=(1,))
+    assert len(cache) == 3 and cache.stats().size <= budget
+    cache.put(make_task(6, 'x' * budget), signature=(1,))
+    assert cache.get(6, signature=(1,)) is None
+    assert cache.get(5, signature=(1,)) is not None
+    assert cache.get(5, signature=(2,)) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize('storage_class', [JsonFileStorage, BinaryStorage])
+def test_task_manager_uses_cache(tmpdir, storage_class):
+    file_path = os.path.join(tmpdir, 'tasks.data')
+    cache = TaskCache(max_entries=100)
+    manager = TaskManager(file_path, storage=storage_class(file_path), task_cache=cache)
+    manager.add_tasks([dict(title=f'Task {index}', description='Description', category='Work',
+                            due_date='2024-12-01', priority='High') for index in range(1, 11)])
+    for task_id in (1, 2, 3):
+        manager.find_task_by_id(task_id)
+
+    with patch.object(storage_class, 'get') as get:
+        assert manager.find_task_by_id(1).title == 'Task 1'
+        get.assert_not_called()
+
+    # Своя правка сбрасывает только измененную задачу
+    manager.edit_task(1, title='Renamed')
+    manager.mark_task_as_completed(2)
+    with patch.object(storage_class, 'get', wraps=manager.storage.get) as get:
+        assert manager.find_task_by_id(1).title == 'Renamed'
+        assert manager.find_task_by_id(2).status == 'Выполнена'
+        assert manager.find_task_by_id(3).title == 'Task 3'
+        assert get.call_count == 2
+    manager.delete_task(3)
+    assert manager.find_task_by_id(3) is None
+
+    # Запись другим процессом сбрасывает кэш целиком
+    other = TaskManager(file_path, storage=storage_class(file_path))
+    other.edit_task(1, title='Changed elsewhere')
+    assert manager.find_task_by_id(1).title == 'Changed elsewhere'
+    assert cache.stats().hits >= 2
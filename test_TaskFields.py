@@ -0,0 +1,96 @@
+import json
+import os
+import pytest
+from Task import Task
+from TaskFields import Priority, Status, parse_status, priority_key, status_key
+from Batch import TaskBatch
+from TaskManager import TaskManager
+
+
+def test_status_parsing_accepts_legacy_labels():
+    assert parse_status('Выполнена') is Status.COMPLETED
+    assert parse_status('выполнено') is Status.COMPLETED
+    assert parse_status('  ВЫПОЛНЕНО ') is Status.COMPLETED
+    assert parse_status('не  выполнено') is Status.NOT_COMPLETED
+    assert parse_status(Status.COMPLETED) is Status.COMPLETED
+    assert status_key('В процессе') == 'В процессе'
+    assert status_key(['список']) is None
+    with pytest.raises(ValueError, match='Неизвестный статус'):
+        parse_status('неизвестно')
+
+
+def test_priority_key_keeps_unknown_labels():
+    assert priority_key('High') is Priority.HIGH
+    assert priority_key('высокий') is Priority.HIGH
+    assert priority_key('Средний') is Priority.MEDIUM
+    assert priority_key('срочно') == 'срочно'
+
+
+def test_task_normalizes_status_and_interns_values():
+    task = Task(1, 'Task', 'Description', ''.join(['Wo', 'rk']), '2024-12-01', 'высокий', 'выполнено')
+    other = Task(2, 'Task', 'Description', ''.join(['W', 'ork']), '2024-12-01', 'высокий')
+    assert task.status == 'Выполнена'
+    assert task.to_dict()['status'] == 'Выполнена'
+    assert task.priority == 'высокий'
+    assert task.category is other.category
+    task.status = 'не выполнено'
+    assert task.status == other.status == 'Не выполнена'
+    task.status = 'В процессе'
+    assert task.to_dict()['status'] == 'В процессе'
+
+
+@pytest.mark.parametrize('resident', [False, True])
+def test_legacy_statuses_are_found(tmpdir, resident):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    records = [
+        {'id': 1, 'title': 'Task 1', 'description': 'D', 'category': 'Work', 'due_date': '2024-12-01',
+         'priority': 'High', 'status': 'выполнено'},
+        {'id': 2, 'title': 'Task 2', 'description': 'D', 'category': 'Work', 'due_date': '2024-12-02',
+         'priority': 'высокий', 'status': 'Выполнена'},
+        {'id': 3, 'title': 'Task 3', 'description': 'D', 'category': 'Home', 'due_date': '2024-12-03',
+         'priority': 'Low', 'status': 'Не выполнена'},
+    ]
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(records, file, ensure_ascii=False)
+    manager = TaskManager(file_path, resident=resident)
+
+    assert [task.id for task in manager.search_tasks(status='Выполнена')] == [1, 2]
+    assert [task.id for task in manager.search_tasks(category='Work', status='выполнено')] == [1, 2]
+    assert [task.id for task in manager.search_tasks(status='не выполнено')] == [3]
+    assert manager.search_tasks(status='в работе') == []
+    assert [task.id for task in manager.query().where(priority='HIGH')] == [1, 2]
+    assert [task.id for task in manager.query().where(status='выполнено', priority='высокий')] == [1, 2]
+    assert manager.stats().completed == 2
+
+    manager.edit_task(3, status='выполнено')
+    assert manager.find_task_by_id(3).status == 'Выполнена'
+
+
+@pytest.mark.parametrize('resident', [False, True])
+def test_unknown_statuses_round_trip(tmpdir, resident):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    records = [
+        {'id': 1, 'title': 'Task 1', 'description': 'D', 'category': 'Work', 'due_date': '2024-12-01',
+         'priority': 'срочно', 'status': 'В процессе'},
+        {'id': 2, 'title': 'Task 2', 'description': 'D', 'category': 'Work', 'due_date': '2024-12-02',
+         'priority': 'Low', 'status': 'Выполнена'},
+    ]
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(records, file, ensure_ascii=False)
+    manager = TaskManager(file_path, resident=resident)
+
+    assert [task.status for task in manager.load_tasks()] == ['В процессе', 'Выполнена']
+    assert manager.find_task_by_id(1).status == 'В процессе'
+    assert [task.id for task in manager.search_tasks(status='В процессе')] == [1]
+    assert [task.id for task in manager.query().where(status='В процессе')] == [1]
+    assert [task.id for task in manager.query().order_by('priority')] == [2, 1]
+    assert manager.stats().count(status='В процессе') == 1
+
+    manager.edit_task(2, title='Renamed')
+    with pytest.raises(ValueError, match='Неизвестный статус'):
+        manager.edit_task(2, status='В процессе')
+    with pytest.raises(ValueError):
+        TaskBatch({}, lambda title: 0, 1).add_task('T', 'D', 'C', '2024-12-01', 'Low', status='В процессе')
+    manager.flush()
+    with open(file_path, encoding='utf-8') as file:
+        assert [record['status'] for record in json.load(file)] == ['В процессе', 'Выполнена']
@@ -107,3 +107,11 @@ def test_task_manager_view_tasks(tmpdir):
 
     tasks = task_manager.view_tasks()
     assert len(tasks) == 2
+
+def test_task_manager_edit_task_due_date(tmpdir):
+    file_path = os.path.join(tmpdir, 'tasks.json')
+    task_manager = TaskManager(file_path)
+    task_manager.add_task('Task 3', 'Description 3', 'Work', '2024-12-03', 'Low')
+    task_manager.edit_task(1, due_date='2025-01-10')
+
+    assert task_manager.find_task_by_id(1).to_dict()['due_date'] == '2025-01-10'
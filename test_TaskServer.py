@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+from datetime import datetime
+import pytest
+from Task import Task
+from TaskClient import TaskClient, TaskServerError
+from TaskManager import TaskManager
+from TaskServer import TaskServer
+
+
+@pytest.fixture(params=['unix', 'tcp'])
+def server(request, tmpdir):
+    socket_path = os.path.join(tmpdir, 'tasks.sock') if request.param == 'unix' else None
+    server = TaskServer(os.path.join(tmpdir, 'tasks.json'), socket_path=socket_path)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def client(server):
+    address = server.socket_path or f'127.0.0.1:{server.port}'
+    with TaskClient.from_address(address, timeout=5) as client:
+        yield client
+
+
+def test_client_mirrors_task_manager(server, client, capsys):
+    client.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    client.add_task('Task 2', 'Other', 'Home', '2024-12-02', 'Low')
+    client.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    assert 'уже существует' in capsys.readouterr().out
+
+    assert [task.id for task in client.load_tasks()] == [1, 2]
+    assert isinstance(client.find_task_by_id(2), Task)
+    assert client.find_task_by_id(42) is None
+    client.edit_task(1, title='Renamed')
+    client.mark_task_as_completed(2)
+    assert [task.title for task in client.search_tasks(status='Выполнена')] == ['Task 2']
+    assert [task.id for task in client.view_tasks('Work')] == [1]
+    assert [task.id for task in client.query().where(category='Home')] == [2]
+    assert client.add_tasks([dict(title='Task 3', description='D', category='Work',
+                                  due_date='2024-12-03', priority='Low')]) == [3]
+    client.edit_tasks({3: {'priority': 'High'}})
+    client.delete_tasks([3])
+    with pytest.raises(ValueError):
+        client.mark_task_as_completed(42)
+    assert [(entry.op, entry.task_id) for entry in client.changes_since(5)] == [('edit', 3), ('delete', 3)]
+
+    client.flush()
+    on_disk = TaskManager(server.tasks.manager.file_path).load_tasks()
+    assert [(task.id, task.title) for task in on_disk] == [(1, 'Renamed'), (2, 'Task 2')]
+
+
+def test_pipeline_and_atomic_batch(server, client):
+    with client.pipeline() as pipe:
+        for index in range(1, 6):
+            pipe.add_task(f'Task {index}', 'Description', 'Work', '2024-12-01', 'High')
+        pipe.load_tasks()
+        pipe.mark_task_as_completed(42)
+    assert len(pipe.results[5]) == 5
+    assert isinstance(pipe.results[6], ValueError)
+
+    with client.pipeline(atomic=True) as batch:
+        batch.delete_task(1)
+        batch.edit_task(2, title='Changed')
+        batch.find_task_by_id(2)
+    assert batch.results[2].title == 'Changed'
+    assert [task.id for task in client.load_tasks()] == [2, 3, 4, 5]
+
+
+def test_many_clients_share_one_store(server, client):
+    address = server.socket_path or f'127.0.0.1:{server.port}'
+
+    def worker(name):
+        with TaskClient.from_address(address, timeout=5) as own:
+            for index in range(10):
+                own.add_task(f'{name}-{index}', 'Description', name, '2024-12-01', 'High')
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b', 'c')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(task.id for task in client.load_tasks()) == list(range(1, 31))
+
+
+def test_unknown_operation(client):
+    response = client.exchange([{'op': '__init__', 'args': ['x']}])[0]
+    assert response['error']['type'] == 'ValueError'
+    with pytest.raises(TaskServerError):
+        client._call('iter_records', 'unexpected')
+
+
+def test_failed_atomic_batch_changes_nothing(client):
+    client.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    with pytest.raises(ValueError):
+        with client.pipeline(atomic=True) as batch:
+            batch.edit_task(1, title='Changed')
+            batch.add_task('Task 2', 'Description', 'Work', '2024-12-01', 'High')
+            batch.delete_task(42)
+    assert [task.title for task in client.load_tasks()] == ['Task 1']
+    with pytest.raises(ValueError):
+        with client.pipeline(atomic=True) as batch:
+            batch.load_tasks()
+
+
+def test_client_stats_and_snapshot(client):
+    client.add_task('Task 1', 'Description', 'Work', '2024-12-01', 'High')
+    client.add_task('Task 2', 'Description', 'Home', '2099-12-01', 'Low')
+    client.mark_task_as_completed(2)
+    report = client.stats(datetime(2025, 1, 1))
+    assert (report.total, report.completed, report.overdue) == (2, 1, 1)
+    assert report.by('category') == {'Work': 1, 'Home': 1}
+
+    snapshot = client.snapshot()
+    client.delete_task(1)
+    assert [task.id for task in snapshot.load_tasks()] == [1, 2]
+    assert [(entry.op, entry.task_id) for entry in client.changes_since(snapshot.seq)] == [('delete', 1)]
+
+
+def test_start_keeps_file_that_is_not_a_socket(tmpdir):
+    socket_path = os.path.join(tmpdir, 'tasks.json')
+    with open(socket_path, 'w') as file:
+        file.write('[]')
+    server = TaskServer(os.path.join(tmpdir, 'other.json'), socket_path=socket_path)
+    with pytest.raises(FileExistsError):
+        asyncio.run(server.start())
+    with open(socket_path) as file:
+        assert file.read() == '[]'